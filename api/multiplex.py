@@ -0,0 +1,164 @@
+"""
+Viac API volaní jedným HTTP requestom (POST /api/batch/).
+
+Obrazovka appky potrebuje naraz profil, košík, produkty, kategórie
+a objednávky. Sub-requesty sa spustia priamo v procese cez resolver – bez
+ďalšieho HTTP spojenia a middleware; používateľ sa overí raz pre celý batch
+a sub-requesty ho dostanú cez vynútenú autentifikáciu DRF. Postupne idú
+v tom istom vlákne, teda aj cez to isté databázové spojenie. S "parallel": true
+sa čítania (GET) spustia vo vláknach – každé vlákno má vlastné spojenie,
+ktoré sa na konci zatvorí.
+
+Telo: {"requests": [{"id": "profile", "method": "GET", "path": "/api/profile/",
+"headers": {"If-None-Match": "..."}, "body": {...}}], "parallel": false}
+Odpoveď: {"responses": [{"id", "status", "headers", "body"}]} v poradí požiadaviek;
+JSON telo sub-odpovede sa vloží bez opätovného parsovania.
+"""
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from rest_framework.views import APIView
+
+from catalog.fast_json import FastJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+BATCH_URL_NAME = "api_batch"
+MAX_REQUESTS = 10
+MAX_WORKERS = 4
+METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+# Hlavičky sub-odpovede, ktoré appka potrebuje (podmienený GET, nové objekty)
+FORWARDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Location")
+# Z pôvodného requestu sa nepreberajú – patria k telu a ceste batchu
+REQUEST_ONLY_META = {"CONTENT_TYPE", "CONTENT_LENGTH", "HTTP_ACCEPT", "HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE"}
+
+
+class BatchError(ValueError):
+    pass
+
+
+def parse_batch(data):
+    """Zoznam sub-requestov z tela batchu; chybný vstup -> BatchError s hláškou pre klienta."""
+    specs = data.get("requests") if isinstance(data, dict) else None
+    if not isinstance(specs, list) or not specs:
+        raise BatchError("requests musí byť neprázdny zoznam.")
+    if len(specs) > MAX_REQUESTS:
+        raise BatchError(f"Najviac {MAX_REQUESTS} požiadaviek naraz.")
+    parsed = []
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict) or not isinstance(spec.get("path"), str) or not spec["path"].startswith("/"):
+            raise BatchError(f"Požiadavka {index}: path musí byť cesta začínajúca '/'.")
+        method = str(spec.get("method", "GET")).upper()
+        if method not in METHODS:
+            raise BatchError(f"Požiadavka {index}: nepodporovaná metóda {method}.")
+        headers = spec.get("headers") or {}
+        if not isinstance(headers, dict):
+            raise BatchError(f"Požiadavka {index}: headers musí byť objekt.")
+        parsed.append({
+            "id": spec.get("id", index),
+            "method": method,
+            "path": spec["path"],
+            "headers": headers,
+            "body": spec.get("body"),
+        })
+    return parsed
+
+
+def build_request(request, spec):
+    """WSGIRequest pre sub-request – hlavičky (cookies, jazyk) z batchu, cesta a telo vlastné."""
+    path, _, query = spec["path"].partition("?")
+    body = b"" if spec["body"] is None else json.dumps(spec["body"]).encode()
+    environ = {key: value for key, value in request.META.items() if key not in REQUEST_ONLY_META}
+    environ.update({
+        "REQUEST_METHOD": spec["method"],
+        "PATH_INFO": path,
+        "SCRIPT_NAME": "",
+        "QUERY_STRING": query,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        # Sub-odpovede vždy JSON, nie prehliadateľné API
+        "HTTP_ACCEPT": "application/json",
+    })
+    if body:
+        environ["CONTENT_TYPE"] = "application/json"
+    for name, value in spec["headers"].items():
+        environ["HTTP_" + name.upper().replace("-", "_")] = str(value)
+
+    sub = WSGIRequest(environ)
+    # Middleware sa nespúšťa – to, čo nastavuje, prevezmeme z batchu
+    sub.session = getattr(request, "session", None)
+    sub.user = request.user
+    if request.user.is_authenticated:
+        # DRF sub-request neoveruje znova (žiadny ďalší dotaz na token)
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+    return sub
+
+
+def _detail(message):
+    return FastJSONRenderer().render({"detail": message})
+
+
+def run_one(request, spec):
+    try:
+        match = resolve(spec["path"].partition("?")[0])
+    except Resolver404:
+        return spec, 404, {}, _detail("Nenájdené.")
+    view_class = getattr(match.func, "cls", None)
+    # Len API (DRF) views – tie majú vlastné oprávnenia a CSRF cez autentifikáciu batchu;
+    # batch v batchi nie
+    if view_class is None or not issubclass(view_class, APIView) or match.url_name == BATCH_URL_NAME:
+        return spec, 400, {}, _detail("Cez batch sa dajú volať len API endpointy.")
+    try:
+        response = match.func(build_request(request, spec), *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+    except Exception:
+        logger.exception("Batch sub-request %s %s zlyhal", spec["method"], spec["path"])
+        return spec, 500, {}, _detail("Chyba servera.")
+    headers = {name: response[name] for name in FORWARDED_HEADERS if response.has_header(name)}
+    return spec, response.status_code, headers, content
+
+
+def _run_in_thread(request, spec):
+    try:
+        return run_one(request, spec)
+    finally:
+        # Spojenia sú per vlákno – bez zatvorenia by zostali visieť v poole
+        connections.close_all()
+
+
+def run_batch(request, specs, parallel=False):
+    # DRF overuje používateľa lenivo – vo vláknach by sa o to pokúšali súčasne
+    request.user
+    if parallel and len(specs) > 1 and all(spec["method"] == "GET" for spec in specs):
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(specs))) as pool:
+            return list(pool.map(lambda spec: _run_in_thread(request, spec), specs))
+    # Zápisy (a predvolene všetko) postupne, v poradí požiadaviek
+    return [run_one(request, spec) for spec in specs]
+
+
+def combined_response(results):
+    """Jedna JSON odpoveď; JSON telá sub-odpovedí sa vložia tak, ako sú."""
+    render = FastJSONRenderer().render
+    parts = []
+    for spec, status, headers, content in results:
+        content_type = headers.get("Content-Type", "application/json")
+        if not content:
+            body = b"null"
+        elif content_type.startswith("application/json"):
+            body = content
+        else:
+            body = render(content.decode("utf-8", errors="replace"))
+        parts.append(
+            b'{"id":' + render(spec["id"]) + b',"status":' + str(status).encode()
+            + b',"headers":' + render(headers) + b',"body":' + body + b"}"
+        )
+    return HttpResponse(b'{"responses":[' + b",".join(parts) + b"]}", content_type="application/json")
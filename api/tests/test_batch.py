@@ -0,0 +1,101 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from catalog.models import Category
+from catalog.tests.conftest import create_coffee_makers
+from orders.models import Order
+
+User = get_user_model()
+
+
+def screen_requests():
+    return [
+        {"id": "profile", "path": "/api/profile/"},
+        {"id": "products", "path": "/api/products/?page_size=2"},
+        {"id": "categories", "path": "/catalog/api/categories-api/?fields=id,name"},
+        {"id": "orders", "path": "/catalog/api/orders-api/?fields=id,status"},
+    ]
+
+
+class BatchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.token = Token.objects.create(user=self.user)
+        self.category = Category.objects.create(name="Kávovary", slug="kavovary")
+        create_coffee_makers(self.category, price=Decimal("10.00"))
+        self.order = Order.objects.create(user=self.user, billing_name="Test")
+
+    def batch(self, requests, **extra):
+        return self.client.post("/api/batch/", {"requests": requests, **extra}, format="json")
+
+    # -------------------------
+    # Jedna obrazovka appky
+    # -------------------------
+    def test_screen_in_one_request_authenticates_once(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.batch(screen_requests())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = {item["id"]: item for item in response.json()["responses"]}
+        self.assertEqual(list(results), ["profile", "products", "categories", "orders"])
+        self.assertTrue(all(item["status"] == 200 for item in results.values()))
+        self.assertEqual(results["profile"]["body"]["username"], "testuser")
+        self.assertEqual(len(results["products"]["body"]["results"]), 2)
+        self.assertEqual(results["categories"]["body"], [{"id": self.category.pk, "name": "Kávovary"}])
+        self.assertEqual(results["orders"]["body"], [{"id": self.order.pk, "status": self.order.status}])
+        self.assertIn("ETag", results["products"]["headers"])
+
+        token_queries = [q for q in ctx.captured_queries if '"authtoken_token"' in q["sql"]]
+        self.assertEqual(len(token_queries), 1)
+
+    def test_anonymous_sub_requests_keep_their_permissions(self):
+        response = self.batch(screen_requests())
+        statuses = [item["status"] for item in response.json()["responses"]]
+        self.assertEqual(statuses, [401, 200, 200, 401])
+
+    def test_conditional_and_write_sub_requests(self):
+        first = self.batch([{"path": "/api/products/"}]).json()["responses"][0]
+        response = self.batch([
+            {"id": "list", "path": "/api/products/", "headers": {"If-None-Match": first["headers"]["ETag"]}},
+            {"id": "register", "method": "POST", "path": "/api/register/", "body": {"username": "novy", "password": "x"}},
+        ])
+        listed, registered = response.json()["responses"]
+        self.assertEqual((listed["status"], listed["body"]), (304, None))
+        self.assertEqual(registered["status"], 201)
+        self.assertTrue(User.objects.filter(username="novy").exists())
+
+    def test_only_api_routes(self):
+        response = self.batch([
+            {"path": "/neexistuje/"},
+            {"path": "/catalog/"},
+            {"path": "/api/batch/", "method": "POST", "body": {"requests": []}},
+        ])
+        self.assertEqual([item["status"] for item in response.json()["responses"]], [404, 400, 400])
+
+    def test_invalid_batch(self):
+        self.assertEqual(self.batch([]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch([{"path": "api/profile/"}]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch([{"path": "/api/profile/"}] * 11).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ParallelBatchTests(APITransactionTestCase):
+
+    def test_parallel_reads_match_sequential(self):
+        user = User.objects.create_user(username="testuser", password="testpassword")
+        token = Token.objects.create(user=user)
+        category = Category.objects.create(name="Kávovary", slug="kavovary")
+        create_coffee_makers(category, price=Decimal("10.00"))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        sequential = self.client.post("/api/batch/", {"requests": screen_requests()}, format="json").json()
+        parallel = self.client.post(
+            "/api/batch/", {"requests": screen_requests(), "parallel": True}, format="json",
+        ).json()
+        self.assertEqual(parallel, sequential)
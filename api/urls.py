@@ -7,6 +7,12 @@ router.register(r'products', views.ProductViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('autocomplete/', views.product_autocomplete, name='autocomplete'),
+    path('sync/', views.catalog_sync, name='catalog_sync'),
+    path('catalog-bundle/', views.catalog_bundle, name='catalog_bundle'),
+    path('catalog-bundle/<str:version>/', views.catalog_bundle_file, name='catalog_bundle_file'),
+    path('batch/', views.batch, name='api_batch'),
+    path('cache-stats/', views.cache_stats, name='cache_stats'),
     path('register/', views.register_user, name='register'),
     path('login/', CustomAuthToken.as_view(), name='api_login'),
     path('profile/', views.UserProfileUpdateView.as_view(), name='profile_update'),
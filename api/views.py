@@ -1,14 +1,36 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import status, viewsets, filters
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.authentication import TokenAuthentication
-from django_filters.rest_framework import DjangoFilterBackend, FilterSet, NumberFilter, BooleanFilter
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet, CharFilter, NumberFilter, BooleanFilter
+from api.multiplex import BatchError, combined_response, parse_batch, run_batch
+from catalog.autocomplete import autocomplete
+from catalog.bundle import bundle_name, load_manifest
+from catalog.conditional import ConditionalGetMixin
+from catalog.facets import product_facets
+from catalog.filters import AttributeFilterMixin
+from catalog.fast_serializers import ValuesListMixin
 from catalog.models import Product
+from catalog.pagination import KeysetPaginationMixin
+from catalog.response_cache import CachedResponseMixin, response_cache_stats
+from catalog.search import search_products
+from catalog.sparse import SparseFieldsetViewMixin
+from catalog.streaming import StreamingListMixin
+from catalog.suggest import suggest
+from catalog.sync import changes_since
+from catalog.tree import get_category_tree
 from catalog.serializers import ProductSerializer
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
@@ -38,54 +60,175 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 
 # --- Filters ---
-class ProductFilter(FilterSet):
-    min_price = NumberFilter(field_name="price", lookup_expr='gte')
-    max_price = NumberFilter(field_name="price", lookup_expr='lte')
-    category = NumberFilter(field_name="category_id")
+class ProductFilter(AttributeFilterMixin, FilterSet):
+    name = CharFilter(method='filter_by_name')
+    min_price = NumberFilter(field_name="max_variant_price", lookup_expr='gte')
+    max_price = NumberFilter(field_name="min_variant_price", lookup_expr='lte')
+    # Cenové pásmo z fazety (catalog.facets) – <price_from, price_below) na cene "od"
+    price_from = NumberFilter(field_name="min_variant_price", lookup_expr='gte')
+    price_below = NumberFilter(field_name="min_variant_price", lookup_expr='lt')
+    category = NumberFilter(method='filter_by_category')
     in_stock = BooleanFilter(method='filter_in_stock')
 
     class Meta:
         model = Product
         fields = ['category', 'min_price', 'max_price']
 
+    def filter_by_name(self, queryset, name, value):
+        return queryset.search_name(value)
+
+    def filter_by_category(self, queryset, name, value):
+        # Kategória aj s viditeľnými podkategóriami – id zo stromu v cache, ako počty vo fazetách
+        ids = get_category_tree().subtree_ids(int(value))
+        if not ids:
+            return queryset.filter(category_id=value)
+        return queryset.filter(category_id__in=ids)
+
     def filter_in_stock(self, queryset, name, value):
         if value:
-            return queryset.filter(variants__stock__quantity__gt=0).distinct()
+            return queryset.filter(in_stock=True)
         return queryset
 
 
+class ProductSearchFilter(filters.BaseFilterBackend):
+    """?search= cez fulltextový index, výsledky zoradené podľa relevancie."""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        return search_products(queryset, query) if query.strip() else queryset
+
+
 # --- Product ViewSet ---
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductViewSet(CachedResponseMixin, ConditionalGetMixin, StreamingListMixin, ValuesListMixin, SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Stránkovanie ?page=N, alebo keyset cez ?cursor= (mobilná appka – nekonečný scroll).
+    Zoznamy v appke: ?fields=id,name,price,thumbnail – bez variantov a obrázkov aj v DB.
+    Export celého (filtrovaného) zoznamu: ?stream=json alebo ?stream=ndjson.
+    ?facets=1 pridá k výsledkom počty pre filtre (catalog.facets).
+    """
     queryset = Product.objects.all().order_by('-id')
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
     pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ProductSearchFilter, filters.OrderingFilter]
     filterset_class = ProductFilter
-    search_fields = ['name', 'description']
     ordering_fields = ['price', 'id']
 
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        # ETag / 304 a stránkovanie rieši ConditionalGetMixin a ListModelMixin
+        response = super().list(request, *args, **kwargs)
         search_query = request.query_params.get('search', None)
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response({'results': serializer.data})
-
-        # "Did you mean" suggestions ak nenájde výsledky
-        if search_query and not response.data['results']:
-            suggestions = Product.objects.filter(
-                Q(name__icontains=search_query[:3]), is_active=True
-            ).distinct()[:3]
-            response.data['suggestions'] = [p.name for p in suggestions]
+
+        # "Did you mean" – opravy preklepov zo slovníka v pamäti, bez ďalšieho dotazu na produkty
+        if search_query and response.status_code == 200 and not response.streaming and not response.data['results']:
+            response.data['suggestions'] = suggest(search_query)
             response.data['message'] = f"Pre výraz '{search_query}' sme nič nenašli."
+        if request.query_params.get('facets') in ('1', 'true') and response.status_code == 200 and not response.streaming:
+            response.data['facets'] = product_facets(self.filter_queryset(self.get_queryset()))
         return response
 
 
+# --- Autocomplete ---
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def product_autocomplete(request):
+    """?q=<prefix>&limit=<n> – produkty, kategórie a SKU z indexu v pamäti, bez dotazu do DB."""
+    query = request.query_params.get('q', '')
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        return Response({"error": "limit musí byť číslo"}, status=400)
+    results = autocomplete(query, limit)
+    return Response({
+        'query': query,
+        'results': [
+            {'type': s.type, 'id': s.id, 'label': s.label, 'slug': s.slug}
+            for s in results
+        ],
+    })
+
+
+# --- Delta sync ---
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def catalog_sync(request):
+    """?since=<watermark> – zmeny a mazania v katalógu od poslednej synchronizácie; bez since celý katalóg."""
+    raw = request.query_params.get('since')
+    since = None
+    if raw:
+        try:
+            since = parse_datetime(raw)
+        except ValueError:
+            since = None
+        if since is None or timezone.is_naive(since):
+            return Response({"error": "since musí byť watermark z predchádzajúcej synchronizácie"}, status=400)
+    return Response(changes_since(since))
+
+
+# --- Offline catalog bundle ---
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def catalog_bundle(request):
+    """Manifest aktuálneho offline balíka (verzia, URL, veľkosť) – appka stiahne balík, len keď má inú verziu."""
+    manifest = load_manifest()
+    if manifest is None:
+        return Response({"error": "Balík ešte nebol zostavený (manage.py build_catalog_bundle)."}, status=404)
+    etag = f'"{manifest["version"]}"'
+    response = get_conditional_response(request, etag=etag) or Response({
+        'version': manifest['version'],
+        'url': request.build_absolute_uri(reverse('catalog_bundle_file', args=[manifest['version']])),
+        'count': manifest['count'],
+        'size': manifest['size'],
+        'generated_at': manifest['generated_at'],
+        'watermark': manifest['watermark'],
+    })
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+@require_GET
+def catalog_bundle_file(request, version):
+    """Balík danej verzie – obsah sa pod verziou nemení, preto cache na rok."""
+    name = bundle_name(version)
+    if not version.isalnum() or not default_storage.exists(name):
+        raise Http404("Neznáma verzia balíka.")
+    etag = f'"{version}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = FileResponse(default_storage.open(name), content_type="application/x-ndjson")
+        # Klient (URLSession, OkHttp) gzip rozbalí sám
+        response['Content-Encoding'] = 'gzip'
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+    return response
+
+
+# --- Request multiplexing ---
+@api_view(['POST'])
+@authentication_classes([JWTAuthentication, SessionAuthentication, TokenAuthentication])
+@permission_classes([AllowAny])
+def batch(request):
+    """
+    Viac API volaní jedným requestom (api.multiplex) – používateľ sa overí raz,
+    oprávnenia si kontroluje každý endpoint sám. "parallel": true spustí čítania súbežne.
+    """
+    try:
+        specs = parse_batch(request.data)
+    except BatchError as exc:
+        return Response({"error": str(exc)}, status=400)
+    return combined_response(run_batch(request, specs, parallel=request.data.get('parallel') is True))
+
+
+# --- Response cache stats ---
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Zásahy a výpadky cache katalógových odpovedí + aktuálna generácia katalógu."""
+    return Response(response_cache_stats())
+
+
 # --- User Profile ---
 class UserProfileUpdateView(APIView):
     authentication_classes = [TokenAuthentication]
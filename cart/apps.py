@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class CartConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cart"
+
+    def ready(self):
+        # import signalov až po načítaní aplikácií
+        import cart.signals
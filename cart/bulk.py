@@ -0,0 +1,117 @@
+"""
+Hromadné zmeny košíka z API – pridať, nastaviť alebo odstrániť položky podľa
+id variantu alebo SKU jedným requestom.
+
+Operácie sa najprv zložia na jednu zmenu na variant (add ostáva prírastkom,
+takže súbežné pridanie sa nestratí) a zapíšu sa v jednej transakcii pevným
+počtom príkazov (CartItemQuerySet.apply_lines) bez ohľadu na počet riadkov.
+S replace=True je to synchronizácia celého košíka appky: čo v operáciách nie
+je, z košíka zmizne.
+"""
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
+from rest_framework.exceptions import ValidationError
+
+from catalog.models import ProductVariant
+from .models import Cart, CartItem
+from .serializers import CartSerializer
+
+
+def resolve_variants(operations):
+    """
+    [(operácia, variant)] jedným dotazom; neznáme id/SKU → ValidationError so
+    zoznamom. Varianty neaktívnych produktov sa nájdu tiež – z košíka musí ísť
+    odstrániť aj to, čo sa už nepredáva (zvýšenie zastaví apply_operations).
+    """
+    ids = {op["variant"] for op in operations if "variant" in op}
+    skus = {op["sku"] for op in operations if "sku" in op}
+    variants = ProductVariant.objects.select_related("product", "stock").filter(Q(pk__in=ids) | Q(sku__in=skus))
+    by_id = {}
+    by_sku = {}
+    for variant in variants:
+        by_id[variant.pk] = variant
+        by_sku[variant.sku] = variant
+
+    resolved = []
+    missing = []
+    for op in operations:
+        variant = by_id.get(op["variant"]) if "variant" in op else by_sku.get(op["sku"])
+        if variant is None:
+            missing.append(op.get("sku", op.get("variant")))
+        else:
+            resolved.append((op, variant))
+    if missing:
+        raise ValidationError({"missing": missing})
+    return resolved
+
+
+def fold(resolved):
+    """{variant_id: ("add" | "set", množstvo)} – operácie v poradí požiadavky."""
+    changes = {}
+    for op, variant in resolved:
+        kind, value = changes.get(variant.pk, ("add", 0))
+        if op["op"] == "add":
+            changes[variant.pk] = (kind, value + op["quantity"])
+        elif op["op"] == "set":
+            changes[variant.pk] = ("set", op["quantity"])
+        else:
+            changes[variant.pk] = ("set", 0)
+    return changes
+
+
+def apply_operations(store, operations, replace=False):
+    """Zmení košík (DatabaseCartStore) podľa operácií a vráti ho; prekročený sklad → ValidationError."""
+    resolved = resolve_variants(operations)
+    variants = {variant.pk: variant for _, variant in resolved}
+    requested = {variant.pk: op.get("sku", op.get("variant")) for op, variant in resolved}
+    changes = fold(resolved)
+
+    with transaction.atomic():
+        cart = store.get_or_create_cart()
+        current = dict(
+            CartItem.objects.select_for_update().filter(cart=cart).values_list("variant_id", "quantity")
+        )
+
+        inactive = []
+        over = {}
+        for pk, (kind, value) in changes.items():
+            quantity = value if kind == "set" else current.get(pk, 0) + value
+            if quantity <= current.get(pk, 0):
+                continue
+            if not variants[pk].product.is_active:
+                inactive.append(requested[pk])
+            elif quantity > variants[pk].available_stock:
+                over[variants[pk].sku] = [f"Nedostatok tovaru. Max dostupné: {variants[pk].available_stock}."]
+        if inactive:
+            # Neaktívny produkt sa do košíka pridať nedá – pre klienta ako neexistujúci
+            raise ValidationError({"missing": inactive})
+        if over:
+            raise ValidationError({"stock": over})
+
+        removed = [pk for pk, (kind, value) in changes.items() if kind == "set" and not value and pk in current]
+        if replace:
+            removed += [pk for pk in current if pk not in changes]
+        CartItem.objects.apply_lines(
+            cart.pk,
+            quantities={
+                pk: F("quantity") + value if kind == "add" else value
+                for pk, (kind, value) in changes.items() if pk in current and pk not in removed
+            },
+            new_items=[
+                CartItem(cart=cart, variant=variants[pk], quantity=value, price=variants[pk].get_price())
+                for pk, (kind, value) in changes.items() if pk not in current and value
+            ],
+            removed=removed,
+            increments={pk for pk, (kind, value) in changes.items() if kind == "add"},
+        )
+    return cart
+
+
+def cart_data(cart, user):
+    """Košík pre API – košík a položky dvomi dotazmi; bez košíka prázdny tvar."""
+    if cart is None:
+        return {"id": None, "user": user.pk, "items": [], "item_count": 0, "subtotal": "0.00"}
+    cart = Cart.objects.prefetch_related(
+        Prefetch("items", queryset=CartItem.objects.select_related("variant").order_by("pk"))
+    ).get(pk=cart.pk)
+    return CartSerializer(cart).data
@@ -0,0 +1,7 @@
+from django.utils.functional import SimpleLazyObject
+from .store import get_cart_store
+
+
+def cart_summary(request):
+    """Mini-košík v hlavičke – súčty z Cart alebo z cache, položky sa nenačítajú."""
+    return {"cart_summary": SimpleLazyObject(lambda: get_cart_store(request).summary())}
@@ -0,0 +1,90 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+
+from cart.models import Cart, CartItem
+from cart.store import DatabaseCartStore
+from catalog.models import Product, ProductVariant, Stock
+
+
+def legacy_add(cart, variant, quantity):
+    # Pôvodný AddToCartView: načítať, pripočítať v Pythone, uložiť
+    item, created = CartItem.objects.get_or_create(
+        cart=cart, variant=variant, defaults={"quantity": quantity, "price": variant.get_price()},
+    )
+    if not created:
+        item.quantity += quantity
+        item.save()
+
+
+def store_add(cart, variant, quantity):
+    DatabaseCartStore(cart.user).add(variant, quantity)
+
+
+class Command(BaseCommand):
+    help = (
+        "Súbežné pridávanie do košíka: pôvodné get_or_create + save oproti "
+        "UPDATE quantity = quantity + n (cart.store). Vypíše stratené pripočítania, "
+        "chyby a priepustnosť. Dáta potrebujú commit (vlákna majú vlastné spojenia), "
+        "na konci sa zmažú."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+        parser.add_argument("--adds", type=int, default=100, help="pridaní na vlákno")
+
+    def run(self, add, cart, variant, threads, adds):
+        CartItem.objects.filter(cart=cart).delete()
+        barrier = threading.Barrier(threads)
+        errors = []
+
+        def worker():
+            barrier.wait()
+            try:
+                for _ in range(adds):
+                    try:
+                        add(cart, variant, 1)
+                    except DatabaseError as exc:
+                        errors.append(exc)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        total = sum(CartItem.objects.filter(cart=cart).values_list("quantity", flat=True))
+        rows = CartItem.objects.filter(cart=cart).count()
+        return threads * adds, total, rows, len(errors), elapsed
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create_user(username=f"bench-cart-{time.time_ns()}")
+        product = Product.objects.create(name="Bench košík", slug=f"bench-kosik-{user.pk}", price=Decimal("9.90"))
+        variant = ProductVariant.objects.create(product=product, sku=f"BENCH-CART-{user.pk}")
+        Stock.objects.create(variant=variant, quantity=10_000)
+        cart = Cart.objects.create(user=user)
+        variant = ProductVariant.objects.select_related("product").get(pk=variant.pk)
+
+        try:
+            for threads in options["threads"]:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {threads} vlákien × {options['adds']} pridaní =="))
+                for label, add in (("get_or_create + save", legacy_add), ("UPDATE quantity + n", store_add)):
+                    expected, total, rows, errors, elapsed = self.run(add, cart, variant, threads, options["adds"])
+                    self.stdout.write(
+                        f"{label:<22} {expected / elapsed:9,.0f} pridaní/s   "
+                        f"stratené {expected - total - errors:5}   chyby {errors:5}   riadkov {rows}"
+                    )
+        finally:
+            cart.delete()
+            product.delete()
+            user.delete()
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli zmazané."))
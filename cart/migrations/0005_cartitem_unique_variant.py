@@ -0,0 +1,33 @@
+# Generated by Django 6.0.3 on 2026-10-18 17:25
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_items(apps, schema_editor):
+    # Pred obmedzením zlúčime duplicitné riadky (cart, variant) do najstaršieho
+    CartItem = apps.get_model("cart", "CartItem")
+    duplicates = (
+        CartItem.objects.values("cart", "variant")
+        .annotate(rows=Count("pk"), total=Sum("quantity"), keep=Min("pk"))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates:
+        CartItem.objects.filter(pk=row["keep"]).update(quantity=row["total"])
+        CartItem.objects.filter(cart=row["cart"], variant=row["variant"]).exclude(pk=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0004_cart_totals'),
+        ('catalog', '0014_variant_attributes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('cart', 'variant'), name='cart_cartitem_cart_variant'),
+        ),
+    ]
@@ -1,9 +1,37 @@
 # cart/models.py
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
 from decimal import Decimal
 
 
+def line_total_expression():
+    return F("price") * F("quantity")
+
+
+class CartQuerySet(models.QuerySet):
+
+    def refresh_totals(self):
+        """
+        Prepočíta item_count a subtotal z položiek jedným UPDATE s korelovanými
+        poddotazmi – súbežné zápisy položiek sa tak neprepíšu. Vracia počet riadkov.
+        """
+        totals = CartItem.objects.filter(cart=OuterRef("pk")).order_by().values("cart")
+        return self.update(
+            item_count=Coalesce(Subquery(totals.annotate(count=Sum("quantity")).values("count")), 0),
+            subtotal=Coalesce(
+                Subquery(totals.annotate(total=Sum(line_total_expression())).values("total")),
+                Decimal("0"),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            ),
+            updated_at=timezone.now(),
+        )
+
+    refresh_totals.alters_data = True
+
+
 class Cart(models.Model):
     # NAJLEPŠÍ A JEDINÝ SPRÁVNY SPÔSOB V DJANGO
     user = models.ForeignKey(
@@ -15,24 +43,150 @@ class Cart(models.Model):
     )
     session_key = models.CharField(max_length=40, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Index pre mazanie opustených košíkov (core.purge)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Udržiavané súčty položiek (CartQuerySet.refresh_totals) – mini-košík
+    # a pokladňa ich čítajú bez CartItem
+    item_count = models.PositiveIntegerField(default=0, editable=False)
+    subtotal = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+
+    objects = CartQuerySet.as_manager()
 
     @property
     def total_price(self):
-        return sum(item.line_total() for item in self.items.all())
+        # Presný súčet priamo z položiek (napr. pri vytváraní objednávky)
+        return self.items.aggregate(
+            total=Coalesce(Sum(line_total_expression()), Decimal("0"), output_field=models.DecimalField())
+        )["total"]
+
+    def refresh_totals(self):
+        Cart.objects.filter(pk=self.pk).refresh_totals()
+        self.refresh_from_db(fields=["item_count", "subtotal", "updated_at"])
 
     def __str__(self):
         return f"Cart #{self.pk} for {self.user or 'guest'}"
 
 
+class CartItemQuerySet(models.QuerySet):
+    """
+    Hromadné zápisy (update, delete, bulk_create, bulk_update) neposielajú signály,
+    preto po nich prepočítame súčty dotknutých košíkov tu.
+    """
+
+    def _cart_ids(self):
+        return set(self.values_list("cart_id", flat=True))
+
+    def _refresh(self, cart_ids):
+        if cart_ids:
+            Cart.objects.filter(pk__in=cart_ids).refresh_totals()
+
+    def update(self, **kwargs):
+        cart_ids = self._cart_ids()
+        rows = super().update(**kwargs)
+        self._refresh(cart_ids)
+        return rows
+
+    def add_quantity(self, quantity, cart_id):
+        """
+        UPDATE ... SET quantity = quantity + n v košíku cart_id. Na rozdiel od
+        update() nezačína SELECT-om dotknutých košíkov, takže prvý príkaz
+        transakcie je zápis (SQLite potom na zámok čaká, namiesto chyby).
+        """
+        rows = super().update(quantity=F("quantity") + quantity)
+        if rows:
+            self._refresh({cart_id})
+        return rows
+
+    def apply_lines(self, cart_id, quantities=None, new_items=(), removed=(), increments=()):
+        """
+        Hromadná zmena položiek košíka cart_id pevným počtom príkazov: quantities =
+        {variant_id: číslo alebo výraz} pre existujúce riadky (jeden UPDATE s CASE),
+        new_items nové riadky (jeden INSERT), removed = variant_id na odstránenie
+        (jeden DELETE). Súčty košíka sa prepočítajú raz na konci.
+
+        Ak riadok z new_items medzitým vložila súbežná požiadavka, INSERT zlyhá
+        a riadky sa zapíšu po jednom: pri variantoch v increments sa množstvo
+        k súbežnému pripočíta (ako add_quantity), ostatným sa nastaví.
+        """
+        items = self.filter(cart_id=cart_id)
+        if quantities:
+            super(CartItemQuerySet, items.filter(variant_id__in=quantities)).update(
+                quantity=Case(
+                    *[When(variant_id=pk, then=value) for pk, value in quantities.items()],
+                    output_field=models.PositiveIntegerField(),
+                ),
+            )
+        if removed:
+            super(CartItemQuerySet, items.filter(variant_id__in=removed)).delete()
+        if new_items:
+            try:
+                with transaction.atomic():
+                    super().bulk_create(new_items)
+            except IntegrityError:
+                for item in new_items:
+                    quantity = F("quantity") + item.quantity if item.variant_id in increments else item.quantity
+                    if not super(CartItemQuerySet, items.filter(variant_id=item.variant_id)).update(quantity=quantity):
+                        item.pk = None
+                        super().bulk_create([item])
+        self._refresh({cart_id})
+
+    def delete(self):
+        cart_ids = self._cart_ids()
+        result = super().delete()
+        self._refresh(cart_ids)
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self._refresh({obj.cart_id for obj in objs})
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self._refresh({obj.cart_id for obj in objs})
+        return rows
+
+    update.alters_data = True
+    add_quantity.alters_data = True
+    apply_lines.alters_data = True
+    delete.alters_data = True
+    delete.queryset_only = True
+    bulk_create.alters_data = True
+    bulk_update.alters_data = True
+
+
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, related_name='items', on_delete=models.CASCADE)
     variant = models.ForeignKey("catalog.ProductVariant", on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
     price = models.DecimalField(max_digits=12, decimal_places=2)
 
+    objects = CartItemQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # Jeden riadok na variant – súbežné pridanie skončí na UPDATE, nie na duplicite
+            models.UniqueConstraint(fields=["cart", "variant"], name="cart_cartitem_cart_variant"),
+        ]
+
+    @property
+    def line_id(self):
+        # Anonymný košík (cart.store) nemá riadky v DB – položku určuje variant
+        return self.pk or self.variant_id
+
+    # Súčty košíka udržiavajú metódy modelu a CartItemQuerySet, nie signály –
+    # hromadné DELETE tak ide jedným príkazom (bez načítania riadkov kvôli signálom)
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Cart.objects.filter(pk=self.cart_id).refresh_totals()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        Cart.objects.filter(pk=self.cart_id).refresh_totals()
+        return result
+
     def line_total(self):
         return Decimal(self.price) * self.quantity
 
     def __str__(self):
-        return f"{self.variant} × {self.quantity}"
\ No newline at end of file
+        return f"{self.variant} × {self.quantity}"
@@ -3,7 +3,12 @@ from .models import Cart, CartItem
 # Order nepatrí do cart.models! Ak ho tu potrebuješ, importuj ho z orders:
 from orders.models import Order 
 
+MAX_OPERATIONS = 100
+
+
 class CartItemSerializer(serializers.ModelSerializer):
+    sku = serializers.CharField(source="variant.sku", read_only=True)
+
     class Meta:
         model = CartItem
         fields = '__all__'
@@ -12,4 +17,27 @@ class CartSerializer(serializers.ModelSerializer):
     items = CartItemSerializer(many=True, read_only=True)
     class Meta:
         model = Cart
-        fields = ['id', 'user', 'items']
\ No newline at end of file
+        fields = ['id', 'user', 'items', 'item_count', 'subtotal']
+
+
+class CartOperationSerializer(serializers.Serializer):
+    """Jedna zmena: add (pripočíta), set (nastaví, 0 = odstráni) alebo remove – podľa variant alebo sku."""
+    op = serializers.ChoiceField(choices=["add", "set", "remove"])
+    variant = serializers.IntegerField(required=False, min_value=1)
+    sku = serializers.CharField(required=False, max_length=64)
+    quantity = serializers.IntegerField(required=False, min_value=0, max_value=10_000)
+
+    def validate(self, attrs):
+        if ("variant" in attrs) == ("sku" in attrs):
+            raise serializers.ValidationError("Zadajte práve jedno z polí variant, sku.")
+        if attrs["op"] == "add" and attrs.get("quantity", 0) < 1:
+            raise serializers.ValidationError({"quantity": ["Pri add je množstvo aspoň 1."]})
+        if attrs["op"] == "set" and "quantity" not in attrs:
+            raise serializers.ValidationError({"quantity": ["Pri set je množstvo povinné."]})
+        return attrs
+
+
+class CartOperationsSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=True, max_length=MAX_OPERATIONS)
+    # Synchronizácia celého košíka appky – položky, ktoré v operáciách nie sú, sa odstránia
+    replace = serializers.BooleanField(default=False)
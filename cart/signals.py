@@ -0,0 +1,25 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from catalog.models import ProductVariant
+from .models import Cart, CartItem
+from .store import CacheCartStore
+
+@receiver(user_logged_in)
+def persist_anonymous_cart(sender, request, user, **kwargs):
+    # login() ponechá dáta session, token anonymného košíka je stále v nej
+    if request is not None and hasattr(request, "session"):
+        CacheCartStore(request.session).persist(user)
+
+
+# Zmazaný variant kaskádou odstráni aj položky košíkov – ich súčty treba prepočítať
+@receiver(pre_delete, sender=ProductVariant)
+def remember_variant_carts(sender, instance, **kwargs):
+    instance._cart_ids = list(CartItem.objects.filter(variant=instance).values_list("cart_id", flat=True))
+
+
+@receiver(post_delete, sender=ProductVariant)
+def refresh_variant_carts(sender, instance, **kwargs):
+    cart_ids = getattr(instance, "_cart_ids", None)
+    if cart_ids:
+        Cart.objects.filter(pk__in=cart_ids).refresh_totals()
@@ -0,0 +1,224 @@
+"""
+Úložiská košíka.
+
+Anonymný návštevník má košík v cache (CacheCartStore) pod náhodným tokenom
+v session – zobrazenie košíka nič nezapisuje ani nezakladá session, token
+vznikne až pri prvom pridaní. Do Cart/CartItem sa položky prenesú až pri
+prihlásení (signál user_logged_in) alebo v pokladni. Prihlásený používateľ má
+košík v DB (DatabaseCartStore); riadok Cart vznikne až pri prvej zmene.
+
+Obe úložiská vracajú položky ako CartItem (anonymné neuložené), takže šablóny
+a výpočty súm sú spoločné.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from catalog.models import ProductVariant
+from .models import Cart, CartItem
+
+CART_TOKEN_SESSION_KEY = "cart_token"
+CACHE_TIMEOUT = 60 * 60 * 24 * 14
+# Zámok zmeny anonymného košíka – po vypršaní ho prevezme ďalší request
+LOCK_TIMEOUT = 5
+LOCK_POLL = 0.01
+
+
+@contextmanager
+def cache_lock(key):
+    """Zámok v zdieľanej cache – súbežné karty prehliadača menia košík po jednej."""
+    lock_key = f"{key}:lock"
+    owner = uuid.uuid4().hex
+    while not cache.add(lock_key, owner, LOCK_TIMEOUT):
+        time.sleep(LOCK_POLL)
+    try:
+        yield
+    finally:
+        if cache.get(lock_key) == owner:
+            cache.delete(lock_key)
+
+
+class DatabaseCartStore:
+    """Košík prihláseného používateľa – jeho posledný Cart."""
+
+    def __init__(self, user=None):
+        self.user = user
+        self.cart = None
+        if user is not None:
+            self.cart = Cart.objects.filter(user=user).order_by("-updated_at", "-pk").first()
+
+    def get_or_create_cart(self):
+        if self.cart is None:
+            self.cart = Cart.objects.create(user=self.user)
+        return self.cart
+
+    def items(self):
+        if self.cart is None:
+            return []
+        return list(self.cart.items.select_related("variant__product").order_by("pk"))
+
+    def summary(self):
+        # Udržiavané súčty na Cart – bez dotazu na CartItem
+        if self.cart is None:
+            return {"item_count": 0, "subtotal": Decimal("0")}
+        return {"item_count": self.cart.item_count, "subtotal": self.cart.subtotal}
+
+    def add(self, variant, quantity, price=None, limit=None):
+        """
+        Pripočíta množstvo jedným UPDATE ... SET quantity = quantity + n. Ak položka
+        ešte nie je, vloží ju; súbežný INSERT zastaví obmedzenie (cart, variant)
+        a množstvo sa pripočíta UPDATE-om. S limitom (dostupný sklad) je UPDATE
+        podmienený, pri prekročení sa nič nezmení a vráti sa False.
+        """
+        if limit is not None and quantity > limit:
+            return False
+        cart = self.get_or_create_cart()
+        items = CartItem.objects.filter(cart=cart, variant=variant)
+        if limit is not None:
+            items = items.filter(quantity__lte=limit - quantity)
+        # Položka aj prepočet súčtov košíka (signál / CartItemQuerySet) spolu
+        with transaction.atomic():
+            if items.add_quantity(quantity, cart.pk):
+                return True
+            try:
+                with transaction.atomic():
+                    CartItem.objects.create(
+                        cart=cart,
+                        variant=variant,
+                        quantity=quantity,
+                        price=variant.get_price() if price is None else price,
+                    )
+            except IntegrityError:
+                return items.add_quantity(quantity, cart.pk) > 0
+            return True
+
+    def update(self, line_id, quantity):
+        """Nastaví množstvo položky, 0 a menej ju odstráni. False, ak položka v košíku nie je."""
+        if self.cart is None:
+            return False
+        items = self.cart.items.filter(pk=line_id)
+        if quantity <= 0:
+            return items.delete()[0] > 0
+        return items.update(quantity=quantity) > 0
+
+    def remove(self, line_id):
+        return self.update(line_id, 0)
+
+    def clear(self):
+        if self.cart is not None:
+            self.cart.items.all().delete()
+
+
+class CacheCartStore:
+    """Košík anonymného návštevníka: {variant_id: {"quantity": n, "price": "9.90"}} v cache."""
+
+    def __init__(self, session):
+        self.session = session
+
+    @property
+    def key(self):
+        token = self.session.get(CART_TOKEN_SESSION_KEY)
+        return f"cart:anonymous:{token}" if token else None
+
+    def lines(self):
+        key = self.key
+        return cache.get(key, {}) if key else {}
+
+    def quantity(self, variant):
+        line = self.lines().get(str(variant.pk))
+        return line["quantity"] if line else 0
+
+    def items(self):
+        lines = self.lines()
+        variants = ProductVariant.objects.select_related("product").in_bulk([int(pk) for pk in lines])
+        return [
+            CartItem(variant=variants[int(pk)], quantity=line["quantity"], price=Decimal(line["price"]))
+            for pk, line in lines.items() if int(pk) in variants
+        ]
+
+    def summary(self):
+        lines = self.lines().values()
+        return {
+            "item_count": sum(line["quantity"] for line in lines),
+            "subtotal": sum((Decimal(line["price"]) * line["quantity"] for line in lines), Decimal("0")),
+        }
+
+    @contextmanager
+    def change(self):
+        if self.key is None:
+            self.session[CART_TOKEN_SESSION_KEY] = uuid.uuid4().hex
+        key = self.key
+        with cache_lock(key):
+            lines = cache.get(key, {})
+            original = {pk: dict(line) for pk, line in lines.items()}
+            yield lines
+            # Nezmenený košík (odmietnutá zmena) sa znova nezapisuje
+            if lines != original:
+                cache.set(key, lines, CACHE_TIMEOUT)
+
+    def add(self, variant, quantity, price=None, limit=None):
+        # Odmietnuté pridanie nezaloží token ani session a nič nezapíše do cache
+        if limit is not None and self.quantity(variant) + quantity > limit:
+            return False
+        with self.change() as lines:
+            line = lines.get(str(variant.pk)) or {
+                "quantity": 0,
+                "price": str(variant.get_price() if price is None else price),
+            }
+            # Znova pod zámkom – súbežná karta mohla medzitým pridať
+            if limit is not None and line["quantity"] + quantity > limit:
+                return False
+            line["quantity"] += quantity
+            lines[str(variant.pk)] = line
+        return True
+
+    def update(self, line_id, quantity):
+        if str(line_id) not in self.lines():
+            return False
+        with self.change() as lines:
+            if quantity <= 0:
+                lines.pop(str(line_id), None)
+            elif str(line_id) in lines:
+                lines[str(line_id)]["quantity"] = quantity
+        return True
+
+    def remove(self, line_id):
+        return self.update(line_id, 0)
+
+    def clear(self):
+        if self.key is not None:
+            cache.delete(self.key)
+            self.session.pop(CART_TOKEN_SESSION_KEY, None)
+
+    def persist(self, user=None):
+        """
+        Prenesie košík do Cart/CartItem (k existujúcemu košíku používateľa sa
+        množstvá pripočítajú) a cache po commite vyprázdni. Prázdny košík → None.
+        """
+        key = self.key
+        if key is None:
+            return None
+        with cache_lock(key), transaction.atomic():
+            lines = cache.get(key, {})
+            if not lines:
+                return None
+            store = DatabaseCartStore(user)
+            variants = ProductVariant.objects.in_bulk([int(pk) for pk in lines])
+            for pk, line in lines.items():
+                if int(pk) in variants:
+                    store.add(variants[int(pk)], line["quantity"], price=Decimal(line["price"]))
+            if store.cart is not None:
+                store.cart.refresh_from_db(fields=["item_count", "subtotal", "updated_at"])
+            transaction.on_commit(lambda: cache.delete(key))
+        self.session.pop(CART_TOKEN_SESSION_KEY, None)
+        return store.cart
+
+
+def get_cart_store(request):
+    if request.user.is_authenticated:
+        return DatabaseCartStore(request.user)
+    return CacheCartStore(request.session)
@@ -78,9 +78,10 @@ def cart_with_session(auth_client, cart, variant):
 
 @pytest.fixture
 def cart_item(cart_with_session, variant):
-    return CartItem.objects.create(
+    # Variant je v košíku najviac raz (obmedzenie cart + variant) – riadok už vytvoril cart_with_session
+    item, _ = CartItem.objects.get_or_create(
         cart=cart_with_session,
         variant=variant,
-        quantity=2,
-        price=999,
-    )
\ No newline at end of file
+        defaults={"quantity": 2, "price": 999},
+    )
+    return item
\ No newline at end of file
@@ -0,0 +1,134 @@
+# cart/tests/test_api.py
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from cart.models import Cart, CartItem
+from catalog.models import Product, ProductVariant, Stock
+
+URL = "/catalog/api/cart-api/"
+
+
+@pytest.fixture
+def api(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def variants(product):
+    result = []
+    for i in range(30):
+        v = ProductVariant.objects.create(product=product, sku=f"V-{i:02}", price=Decimal("10.00") + i)
+        Stock.objects.create(variant=v, quantity=50)
+        result.append(v)
+    return result
+
+
+def lines(api, operations, **extra):
+    return api.post(f"{URL}lines/", {"operations": operations, **extra}, format="json")
+
+
+def test_requires_login(db):
+    assert APIClient().get(URL).status_code in (401, 403)
+
+
+def test_empty_cart_is_not_created(api):
+    data = api.get(URL).json()
+    assert (data["id"], data["items"], data["item_count"]) == (None, [], 0)
+    assert Cart.objects.count() == 0
+
+
+def test_operations_apply_in_order(api, cart, variants):
+    CartItem.objects.create(cart=cart, variant=variants[0], quantity=2, price=10)
+    response = lines(api, [
+        {"op": "add", "sku": "V-00", "quantity": 3},
+        {"op": "add", "variant": variants[1].pk, "quantity": 1},
+        {"op": "add", "sku": "V-01", "quantity": 1},
+        {"op": "set", "sku": "V-02", "quantity": 4},
+        {"op": "add", "sku": "V-03", "quantity": 1},
+        {"op": "remove", "sku": "V-03"},
+    ])
+    assert response.status_code == 200
+    data = response.json()
+    assert [(i["sku"], i["quantity"]) for i in data["items"]] == [("V-00", 5), ("V-01", 2), ("V-02", 4)]
+    assert data["item_count"] == 11 and Decimal(data["subtotal"]) == Decimal("5") * 10 + 2 * 11 + 4 * 12
+    assert data["id"] == cart.pk
+
+    lines(api, [{"op": "set", "sku": "V-00", "quantity": 0}])
+    assert not CartItem.objects.filter(variant=variants[0]).exists()
+
+
+def test_query_count_does_not_grow_with_lines(api, cart, variants):
+    CartItem.objects.create(cart=cart, variant=variants[0], quantity=1, price=10)
+    CartItem.objects.create(cart=cart, variant=variants[1], quantity=1, price=10)
+
+    def count(operations):
+        with CaptureQueriesContext(connection) as ctx:
+            assert lines(api, operations).status_code == 200
+        return len(ctx)
+
+    small = count([{"op": "add", "sku": "V-00", "quantity": 1}, {"op": "add", "sku": "V-02", "quantity": 1},
+                   {"op": "remove", "sku": "V-01"}])
+    CartItem.objects.create(cart=cart, variant=variants[1], quantity=1, price=10)
+    large = count(
+        [{"op": "add", "sku": v.sku, "quantity": 1} for v in variants[3:]]
+        + [{"op": "add", "sku": "V-00", "quantity": 1}, {"op": "remove", "sku": "V-01"}]
+    )
+    assert small == large
+    assert Cart.objects.get().item_count == 3 + 1 + 27
+
+
+def test_replace_syncs_whole_cart(api, cart, variants):
+    CartItem.objects.create(cart=cart, variant=variants[0], quantity=1, price=10)
+    CartItem.objects.create(cart=cart, variant=variants[1], quantity=1, price=10)
+    data = lines(api, [{"op": "set", "sku": "V-01", "quantity": 3}, {"op": "set", "sku": "V-05", "quantity": 1}],
+                 replace=True).json()
+    assert [(i["sku"], i["quantity"]) for i in data["items"]] == [("V-01", 3), ("V-05", 1)]
+    assert lines(api, [], replace=True).json()["items"] == []
+
+
+def test_errors_change_nothing(api, cart, variants):
+    CartItem.objects.create(cart=cart, variant=variants[0], quantity=1, price=10)
+    response = lines(api, [{"op": "add", "sku": "V-00", "quantity": 1}, {"op": "add", "sku": "NEEXISTUJE", "quantity": 1}])
+    assert response.status_code == 400 and response.json() == {"missing": ["NEEXISTUJE"]}
+
+    response = lines(api, [{"op": "add", "sku": "V-00", "quantity": 1}, {"op": "set", "sku": "V-01", "quantity": 51}])
+    assert response.status_code == 400
+    assert response.json() == {"stock": {"V-01": ["Nedostatok tovaru. Max dostupné: 50."]}}
+
+    assert lines(api, [{"op": "add", "sku": "V-00"}]).status_code == 400
+    assert lines(api, [{"op": "set", "sku": "V-00", "variant": 1, "quantity": 1}]).status_code == 400
+    assert lines(api, [{"op": "add", "sku": "V-00", "quantity": 1}] * 101).status_code == 400
+    assert list(CartItem.objects.values_list("variant_id", "quantity")) == [(variants[0].pk, 1)]
+
+
+def test_inactive_product_can_be_removed_not_added(api, cart, variants):
+    CartItem.objects.create(cart=cart, variant=variants[0], quantity=3, price=10)
+    CartItem.objects.create(cart=cart, variant=variants[1], quantity=1, price=10)
+    Product.objects.filter(pk=variants[0].product_id).update(is_active=False)
+
+    response = lines(api, [{"op": "add", "sku": "V-00", "quantity": 1}])
+    assert response.status_code == 400 and response.json() == {"missing": ["V-00"]}
+
+    data = lines(api, [{"op": "set", "sku": "V-00", "quantity": 1}]).json()
+    assert data["items"][0]["quantity"] == 1
+    data = lines(api, [{"op": "remove", "variant": variants[0].pk}]).json()
+    assert [i["sku"] for i in data["items"]] == ["V-01"]
+
+
+def test_insert_conflict_keeps_concurrent_quantity(cart, variants):
+    # Riadky, ktoré súbežná požiadavka vložila medzi čítaním a INSERT-om
+    CartItem.objects.create(cart=cart, variant=variants[0], quantity=2, price=10)
+    CartItem.objects.create(cart=cart, variant=variants[2], quantity=7, price=12)
+
+    CartItem.objects.apply_lines(
+        cart.pk,
+        new_items=[CartItem(cart=cart, variant=v, quantity=q, price=v.price) for v, q in zip(variants, (3, 4, 1))],
+        increments={variants[0].pk, variants[1].pk},
+    )
+    assert dict(CartItem.objects.values_list("variant__sku", "quantity")) == {"V-00": 5, "V-01": 4, "V-02": 1}
+    assert Cart.objects.get().item_count == 10
@@ -0,0 +1,72 @@
+# cart/tests/test_concurrency.py
+import threading
+
+import pytest
+from django.db import IntegrityError, OperationalError, connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from cart.models import Cart, CartItem
+from cart.store import DatabaseCartStore
+from catalog.models import ProductVariant
+
+THREADS = 8
+ADDS = 25
+
+
+def hammer(worker):
+    """Spustí worker v THREADS vláknach naraz, každé vlastné DB spojenie."""
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def run():
+        try:
+            barrier.wait()
+            for _ in range(ADDS):
+                while True:
+                    try:
+                        worker()
+                        break
+                    except OperationalError as exc:
+                        # SQLite v pamäti (testy) pri súbežnom zápise nečaká, hneď vráti
+                        # "table is locked" – transakcia sa vrátila, zopakujeme ju
+                        if "locked" not in str(exc):
+                            raise
+        except Exception as exc:  # pragma: no cover – zlyhanie vlákna ukáže assert nižšie
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=run) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+@pytest.mark.django_db
+def test_add_is_one_update_and_respects_limit(cart, variant):
+    store = DatabaseCartStore(cart.user)
+    assert store.add(variant, 2, limit=5)
+    with CaptureQueriesContext(connection) as ctx:
+        assert store.add(variant, 3, limit=5)
+    quantity_updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "cart_cartitem"')]
+    assert len(quantity_updates) == 1 and '"quantity" = ("cart_cartitem"."quantity" + 3)' in quantity_updates[0]
+
+    assert not store.add(variant, 1, limit=5)
+    assert CartItem.objects.get().quantity == 5
+    with pytest.raises(IntegrityError):
+        CartItem.objects.create(cart=cart, variant=variant, quantity=1, price=1)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_adds_lose_nothing(user, variant):
+    variant = ProductVariant.objects.select_related("product").get(pk=variant.pk)
+    Cart.objects.create(user=user)
+
+    errors = hammer(lambda: DatabaseCartStore(user).add(variant, 1))
+
+    assert errors == []
+    item = CartItem.objects.get()
+    assert item.quantity == THREADS * ADDS
+    assert Cart.objects.get().item_count == THREADS * ADDS
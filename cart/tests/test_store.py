@@ -0,0 +1,102 @@
+# cart/tests/test_store.py
+import threading
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cart.models import Cart, CartItem
+from cart.store import CART_TOKEN_SESSION_KEY, CacheCartStore
+from orders.models import Order
+
+
+def writes(ctx):
+    return [q["sql"] for q in ctx.captured_queries if q["sql"].split()[0] in ("INSERT", "UPDATE", "DELETE")]
+
+
+def add(client, variant, quantity):
+    return client.post(
+        reverse("cart:add_to_cart", kwargs={"product_id": variant.product_id}),
+        {"variant_id": variant.id, "quantity": quantity},
+    )
+
+
+@pytest.mark.django_db
+def test_anonymous_browse_writes_nothing(client, variant):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("cart:cart_detail"))
+    assert response.status_code == 200
+    assert writes(ctx) == [] and "sessionid" not in response.cookies
+    assert Cart.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_anonymous_cart_lives_in_cache(client, variant):
+    add(client, variant, 2)
+    add(client, variant, 1)
+    assert Cart.objects.count() == 0 and CartItem.objects.count() == 0
+
+    response = client.get(reverse("cart:cart_detail"))
+    [item] = response.context["items"]
+    assert (item.variant, item.quantity, response.context["total"]) == (variant, 3, 2997)
+
+    client.post(reverse("cart:cart_item_update", kwargs={"item_id": variant.id}), {"quantity": "5"})
+    assert client.get(reverse("cart:cart_detail")).context["items"][0].quantity == 5
+    client.post(reverse("cart:cart_item_remove", kwargs={"item_id": variant.id}))
+    assert client.get(reverse("cart:cart_detail")).context["items"] == []
+    assert client.post(reverse("cart:cart_item_remove", kwargs={"item_id": variant.id})).status_code == 404
+
+
+@pytest.mark.django_db
+def test_rejected_anonymous_add_writes_nothing(client, variant, monkeypatch):
+    response = add(client, variant, 101)
+    assert "sessionid" not in response.cookies
+    assert CART_TOKEN_SESSION_KEY not in client.session
+
+    add(client, variant, 60)
+    stored = []
+    monkeypatch.setattr("cart.store.cache.set", lambda *args, **kwargs: stored.append(args))
+    add(client, variant, 50)
+    assert stored == []
+    assert client.get(reverse("cart:cart_detail")).context["items"][0].quantity == 60
+
+
+@pytest.mark.django_db
+def test_login_persists_and_merges(client, user, variant):
+    Cart.objects.create(user=user).items.create(variant=variant, quantity=1, price=999)
+    add(client, variant, 2)
+    client.post(reverse("accounts:login"), {"username": "testuser", "password": "pass123"})
+
+    assert Cart.objects.count() == 1
+    assert CartItem.objects.get().quantity == 3
+    assert CART_TOKEN_SESSION_KEY not in client.session
+    assert client.get(reverse("cart:cart_detail")).context["items"][0].quantity == 3
+
+
+@pytest.mark.django_db
+def test_anonymous_checkout_persists_cart(client, variant):
+    add(client, variant, 2)
+    response = client.post(reverse("cart:checkout"), {"billing_name": "Hosť"})
+    assert response.status_code == 302
+    order = Order.objects.get()
+    assert order.user is None and order.total == 1998
+    assert client.get(reverse("cart:cart_detail")).context["items"] == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_tabs_do_not_lose_updates(variant):
+    token = {CART_TOKEN_SESSION_KEY: "tab"}
+    variant = type(variant).objects.select_related("product").get(pk=variant.pk)
+
+    def tab():
+        store = CacheCartStore(dict(token))
+        for _ in range(10):
+            store.add(variant, 1)
+
+    threads = [threading.Thread(target=tab) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert CacheCartStore(dict(token)).lines()[str(variant.pk)]["quantity"] == 80
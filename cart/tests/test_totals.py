@@ -0,0 +1,70 @@
+# cart/tests/test_totals.py
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cart.models import Cart, CartItem
+from catalog.models import ProductVariant
+
+
+def totals(cart):
+    cart.refresh_from_db()
+    return cart.item_count, cart.subtotal
+
+
+@pytest.mark.django_db
+def test_item_writes_keep_totals(cart, variant):
+    item = CartItem.objects.create(cart=cart, variant=variant, quantity=2, price=Decimal("10.50"))
+    assert totals(cart) == (2, Decimal("21.00"))
+
+    item.quantity = 3
+    item.save()
+    assert totals(cart) == (3, Decimal("31.50"))
+
+    other = ProductVariant.objects.create(product=variant.product, sku="NOTE-002", price=5)
+    CartItem.objects.bulk_create([CartItem(cart=cart, variant=other, quantity=4, price=5)])
+    assert totals(cart) == (7, Decimal("51.50"))
+
+    cart.items.filter(variant=other).update(quantity=1)
+    assert totals(cart) == (4, Decimal("36.50"))
+    assert cart.total_price == Decimal("36.50")
+
+    cart.items.all().delete()
+    assert totals(cart) == (0, Decimal("0"))
+
+
+@pytest.mark.django_db
+def test_refresh_is_one_update(cart, variant):
+    CartItem.objects.create(cart=cart, variant=variant, quantity=2, price=999)
+    with CaptureQueriesContext(connection) as ctx:
+        Cart.objects.filter(pk=cart.pk).refresh_totals()
+    assert len(ctx) == 1 and ctx.captured_queries[0]["sql"].startswith("UPDATE")
+    assert 'U0."price" * U0."quantity"' in ctx.captured_queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_mini_cart_and_totals_skip_items(auth_client, cart, variant):
+    CartItem.objects.create(cart=cart, variant=variant, quantity=2, price=999)
+    with CaptureQueriesContext(connection) as ctx:
+        response = auth_client.get(reverse("catalog:product_list"))
+    assert '<span class="badge bg-primary">2</span>' in response.content.decode()
+    assert not any('"cart_cartitem"' in q["sql"] for q in ctx.captured_queries)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = auth_client.get(reverse("cart:cart_detail"))
+    assert response.context["total"] == Decimal("1998.00")
+    # Položky sa načítajú raz na zobrazenie, súčet ide z Cart.subtotal
+    assert sum('"cart_cartitem"' in q["sql"] for q in ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_anonymous_mini_cart_from_cache(client, variant):
+    client.post(
+        reverse("cart:add_to_cart", kwargs={"product_id": variant.product_id}),
+        {"variant_id": variant.id, "quantity": 3},
+    )
+    response = client.get(reverse("catalog:product_list"))
+    assert '<span class="badge bg-primary">3</span>' in response.content.decode()
+    assert response.context["cart_summary"]["subtotal"] == Decimal("2997")
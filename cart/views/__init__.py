@@ -1,4 +1,5 @@
-from .cart_core import get_or_create_cart
+from cart.store import get_cart_store
+from .cart_core import persist_cart
 from .cart_detail import CartDetailView
 from .cart_items import AddToCartView, CartItemUpdateView, CartItemRemoveView
 from .checkout import CheckoutView
@@ -1,17 +1,11 @@
-from cart.models import Cart
+from cart.store import CacheCartStore, DatabaseCartStore
 
-def get_or_create_cart(request):
+
+def persist_cart(request):
     """
-    Pomocná funkcia na získanie alebo vytvorenie košíka zo session.
+    DB košík pre pokladňu – anonymný košík sa pri tom prenesie z cache do
+    Cart/CartItem. Prázdny košík → None.
     """
-    cart_id = request.session.get("cart_id")
-    if cart_id:
-        try:
-            cart = Cart.objects.get(id=cart_id)
-        except Cart.DoesNotExist:
-            cart = Cart.objects.create()
-            request.session["cart_id"] = cart.id
-    else:
-        cart = Cart.objects.create()
-        request.session["cart_id"] = cart.id
-    return cart
\ No newline at end of file
+    if request.user.is_authenticated:
+        return DatabaseCartStore(request.user).cart
+    return CacheCartStore(request.session).persist()
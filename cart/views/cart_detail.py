@@ -1,13 +1,11 @@
 from django.views import View
 from django.shortcuts import render
-from .cart_core import get_or_create_cart
+from cart.store import get_cart_store
 
 class CartDetailView(View):
     """Zobrazenie košíka."""
     def get(self, request):
-        cart = get_or_create_cart(request)
-        total = sum(item.line_total() for item in cart.items.all())
-        return render(request, "cart/cart_detail.html", {"cart": cart, "total": total})
-class CartDetailView(View):
-    def get(self, request):
-        cart = get_or_create_cart(request)
\ No newline at end of file
+        store = get_cart_store(request)
+        items = store.items()
+        total = store.summary()["subtotal"]
+        return render(request, "cart/cart_detail.html", {"items": items, "total": total})
@@ -2,31 +2,32 @@
 from django.views.generic import View
 from django.shortcuts import redirect, get_object_or_404
 from django.contrib import messages
+from django.http import Http404
 from catalog.models import ProductVariant
-from cart.models import CartItem
-from .cart_core import get_or_create_cart
+from cart.store import get_cart_store
+
+
+def posted_quantity(request, default="1"):
+    qty = request.POST.get("quantity", default).strip()
+    return int(qty) if qty.isdigit() else 0
 
 
-# TOTO JE CHÝBAJÚCA TRIEDA – BEZ TOHTO VŠETKO PADÁ!
 class AddToCartView(View):
     def post(self, request, product_id):
-        cart = get_or_create_cart(request)
         variant_id = request.POST.get("variant_id")
         if not variant_id:
             messages.error(request, "Chýba variant produktu.")
-            return redirect("catalog:product_detail", product_id=product_id)
-
-        variant = get_object_or_404(ProductVariant, id=variant_id)
-        quantity = int(request.POST.get("quantity", 1))
-
-        cart_item, created = CartItem.objects.get_or_create(
-            cart=cart,
-            variant=variant,
-            defaults={"quantity": quantity, "price": variant.price}
-        )
-        if not created:
-            cart_item.quantity += quantity
-            cart_item.save()
+            return redirect("catalog:product_list")
+
+        variant = get_object_or_404(ProductVariant.objects.select_related("product"), id=variant_id)
+        quantity = posted_quantity(request)
+        if quantity <= 0:
+            messages.error(request, "Neplatné množstvo.")
+            return redirect("catalog:product_detail", slug=variant.product.slug)
+        # Limit kontroluje aj množstvo, ktoré už v košíku je – podmienený UPDATE v úložisku
+        if not get_cart_store(request).add(variant, quantity, limit=variant.available_stock):
+            messages.error(request, f"Nedostatok tovaru. Max dostupné: {variant.available_stock}.")
+            return redirect("catalog:product_detail", slug=variant.product.slug)
 
         messages.success(request, "Produkt bol pridaný do košíka.")
         return redirect("cart:cart_detail")
@@ -34,25 +35,20 @@ class AddToCartView(View):
 
 class CartItemUpdateView(View):
     def post(self, request, item_id):
-        cart = get_or_create_cart(request)
-        item = get_object_or_404(CartItem, id=item_id, cart=cart)
-        qty = request.POST.get("quantity", "0").strip()
+        qty = posted_quantity(request, default="0")
+        if not get_cart_store(request).update(item_id, qty):
+            raise Http404("Položka nie je v košíku.")
 
-        if not qty.isdigit() or int(qty) <= 0:
-            item.delete()
+        if qty <= 0:
             messages.success(request, "Položka bola odstránená.")
         else:
-            item.quantity = int(qty)
-            item.save()
             messages.success(request, "Množstvo bolo aktualizované.")
-
         return redirect("cart:cart_detail")
 
 
 class CartItemRemoveView(View):
     def post(self, request, item_id):
-        cart = get_or_create_cart(request)
-        item = get_object_or_404(CartItem, id=item_id, cart=cart)
-        item.delete()
+        if not get_cart_store(request).remove(item_id):
+            raise Http404("Položka nie je v košíku.")
         messages.success(request, "Položka bola odstránená z košíka.")
-        return redirect("cart:cart_detail")
\ No newline at end of file
+        return redirect("cart:cart_detail")
@@ -5,20 +5,24 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.db import transaction
 
-from .cart_core import get_or_create_cart
+from cart.store import get_cart_store
+from .cart_core import persist_cart
 from orders.models import Order, OrderItem
 
 
 class CheckoutView(View):
     def get(self, request):
-        cart = get_or_create_cart(request)
-        return render(request, "cart/checkout.html", {"cart": cart})
+        store = get_cart_store(request)
+        items = store.items()
+        total = store.summary()["subtotal"]
+        return render(request, "cart/checkout.html", {"items": items, "total": total})
 
     @transaction.atomic
     def post(self, request, *args, **kwargs):
-        cart = get_or_create_cart(request)
+        # Anonymný košík sa do DB zapíše až teraz
+        cart = persist_cart(request)
 
-        if not cart.items.exists():
+        if cart is None or not cart.item_count:
             messages.error(request, "Košík je prázdny.")
             return redirect("cart:cart_detail")
 
@@ -33,7 +37,7 @@ class CheckoutView(View):
             billing_address=request.POST.get("billing_address", ""),
             shipping_address=request.POST.get("shipping_address", ""),
 
-            total=cart.total_price,      #  <-- tvoje pole = total (nie total_price)
+            total=cart.subtotal,         #  <-- udržiavaný súčet košíka (Cart.subtotal)
            status="pending_payment",    #  <-- alebo 'draft', podľa toho čo chceš
         )
 
@@ -43,7 +47,7 @@ class CheckoutView(View):
                 order=order,
                 product=item.variant.product,       # ← tvoje CartItem má product alebo variant? (v teste máš variant)
                 quantity=item.quantity,
-                price=item.variant.price,   # alebo item.variant.price ak používaš varianty
+                price=item.price,            # cena v čase pridania do košíka
             )
 
         # vymazanie košíka
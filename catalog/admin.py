@@ -1,10 +1,14 @@
 from django.contrib import admin
-from .models import Category, Product, ProductVariant, ProductImage, Stock
+from .models import Category, Product, ProductVariant, ProductImage, Stock, VariantAttribute
 
 class ProductImageInline(admin.TabularInline):
     model = ProductImage
     extra = 1
 
+class VariantAttributeInline(admin.TabularInline):
+    model = VariantAttribute
+    extra = 1
+
 class StockInline(admin.StackedInline):
     model = Stock
     can_delete = False
@@ -16,8 +20,9 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ['name', 'price', 'category', 'is_active']
-    list_filter = ['is_active', 'category']
+    list_display = ['name', 'price', 'category', 'is_active', 'in_stock', 'available_units']
+    list_filter = ['is_active', 'in_stock', 'category']
+    readonly_fields = ['available_units', 'in_stock', 'min_variant_price', 'max_variant_price']
     prepopulated_fields = {'slug': ('name',)}
     inlines = [ProductImageInline]
 
@@ -25,7 +30,7 @@ class ProductAdmin(admin.ModelAdmin):
 class ProductVariantAdmin(admin.ModelAdmin):
     # OPRAVA: stock_quantity nahradené metódou get_stock
     list_display = ['product', 'sku', 'price', 'get_stock']
-    inlines = [StockInline]
+    inlines = [StockInline, VariantAttributeInline]
 
     @admin.display(description='Skladom')
     def get_stock(self, obj):
@@ -1,26 +1,100 @@
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from .models import Product, Category
 # Importujeme modely a serializers z aplikácie orders
 from orders.models import Order
 from orders.serializers import OrderSerializer
+from cart.bulk import apply_operations, cart_data
+from cart.serializers import CartOperationsSerializer
+from cart.store import DatabaseCartStore
+from .batch import AVAILABILITY_KEYS, PRODUCT_KEYS, batch_keys, batch_products, variant_availability
+from .conditional import ConditionalGetMixin
+from .fast_serializers import ValuesListMixin
+from .pagination import KeysetPaginationMixin
+from .response_cache import CachedResponseMixin
+from .sparse import SparseFieldsetViewMixin
+from .streaming import StreamingListMixin
 from .serializers import ProductSerializer, CategorySerializer
+from .tree import get_category_tree
 
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
-    """API pre produkty"""
+class ProductViewSet(CachedResponseMixin, ConditionalGetMixin, StreamingListMixin, ValuesListMixin, SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
+    """API pre produkty (?cursor= zapne keyset stránkovanie, ?fields= / ?expand= riedky výstup, ?stream= export)"""
     queryset = Product.objects.filter(is_active=True)
     serializer_class = ProductSerializer
     lookup_field = 'slug'
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        """?ids= / ?slugs= / ?skus= (alebo JSON telo POST) – produkty jedným requestom, v poradí požiadavky."""
+        kind, values = batch_keys(request, PRODUCT_KEYS)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(batch_products(self.get_serializer, queryset, PRODUCT_KEYS[kind], values))
+
+    @action(detail=False, methods=['get', 'post'])
+    def availability(self, request):
+        """?skus= / ?variants= / ?products= / ?slugs= – dostupnosť variantov (sklad - rezervované) z cache."""
+        kind, values = batch_keys(request, AVAILABILITY_KEYS)
+        found = variant_availability(kind, values)
+        return Response({
+            'results': [record for records in found.values() for record in records],
+            'missing': [value for value, records in found.items() if not records],
+        })
+
+class CategoryViewSet(CachedResponseMixin, ConditionalGetMixin, StreamingListMixin, ValuesListMixin, SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     """API pre kategórie"""
     queryset = Category.objects.filter(is_active=True)
     serializer_class = CategorySerializer
     lookup_field = 'slug'
 
-class OrderViewSet(viewsets.ModelViewSet):
-    """API pre objednávky (iba pre prihlásených)"""
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        name = self.request.query_params.get('name')
+        # ?name= hľadá v normalizovanom názve (bez diakritiky)
+        return queryset.search_name(name) if name else queryset
+
+    @action(detail=False)
+    def tree(self, request):
+        """Celý strom aktívnych kategórií s počtom produktov v podstrome."""
+        def serialize(nodes):
+            return [
+                {
+                    'id': node.id,
+                    'name': node.name,
+                    'slug': node.slug,
+                    'product_count': node.product_count,
+                    'children': serialize(node.children),
+                }
+                for node in nodes
+            ]
+        return Response(serialize(get_category_tree().roots))
+
+class CartViewSet(viewsets.ViewSet):
+    """
+    Košík prihláseného používateľa pre appku. GET vráti košík so súčtami, POST lines/
+    hromadne zmení položky: {"operations": [{"op": "add", "sku": "X", "quantity": 2},
+    {"op": "remove", "variant": 5}], "replace": false}. S "replace": true je to
+    synchronizácia celého lokálneho košíka jedným requestom.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        return Response(cart_data(DatabaseCartStore(request.user).cart, request.user))
+
+    @action(detail=False, methods=['post'])
+    def lines(self, request):
+        serializer = CartOperationsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cart = apply_operations(DatabaseCartStore(request.user), **serializer.validated_data)
+        return Response(cart_data(cart, request.user))
+
+class OrderViewSet(StreamingListMixin, ValuesListMixin, SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
+    """API pre objednávky (iba pre prihlásených, ?cursor= zapne keyset stránkovanie, ?stream= export)"""
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
\ No newline at end of file
+        return Order.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
\ No newline at end of file
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class CatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "catalog"
+
+    def ready(self):
+        # import signalov až po načítaní aplikácií (udržiavanie súhrnu skladu a cien)
+        import catalog.signals
@@ -0,0 +1,124 @@
+"""
+Autocomplete pre vyhľadávacie pole – bez dotazu do databázy na každý stlačený kláves.
+
+Index je zoradené pole normalizovaných kľúčov v pamäti procesu; prefix sa nájde
+cez bisect. Každý názov je v poli raz za každé slovo ("kávovar espressopro"
+aj "espressopro"), takže sa dá písať od ľubovoľného slova. Položky sú očíslované
+podľa popularity, najlepšie výsledky prefixu sú teda najmenšie čísla v rozsahu.
+Index sa zostaví znova pri zmene verzie katalógu alebo popularity (catalog.versions);
+popularitu zverejňuje periodická úloha, nie každá objednávka.
+"""
+import heapq
+from bisect import bisect_left
+from typing import NamedTuple
+
+from django.db.models import Count, Q, Sum
+
+from .models import Category, Product, ProductVariant
+from .text import normalize_text
+from .versions import ProcessIndex, catalog_version, popularity_version
+
+MAX_RESULTS = 20
+# Pri širokých prefixoch ("k") sa najlepšie výsledky zapamätajú, aby sa rozsah neprechádzal znova
+MEMO_THRESHOLD = 512
+# Objednávky v týchto stavoch sa do popularity nerátajú
+IGNORED_ORDER_STATUSES = ("draft", "cancelled")
+# Pri rovnakej popularite má produkt prednosť pred kategóriou a tá pred SKU
+TYPE_ORDER = {"product": 0, "category": 1, "sku": 2}
+
+
+class Suggestion(NamedTuple):
+    type: str
+    id: int
+    label: str
+    slug: str
+
+
+class AutocompleteIndex:
+    def __init__(self, entries):
+        """entries: iterovateľné (popularita, Suggestion, kľúče)."""
+        ranked = sorted(entries, key=lambda entry: (-entry[0], TYPE_ORDER[entry[1].type], entry[1].label))
+        self.items = [suggestion for _, suggestion, _ in ranked]
+        pairs = sorted((key, rank) for rank, (_, _, keys) in enumerate(ranked) for key in keys)
+        self.keys = [key for key, _ in pairs]
+        self.ranks = [rank for _, rank in pairs]
+        self.memo = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def complete(self, prefix, limit=10):
+        prefix = normalize_text(prefix)
+        limit = min(limit, MAX_RESULTS)
+        if not prefix or limit < 1:
+            return []
+        top = self.memo.get(prefix)
+        if top is None:
+            lo = bisect_left(self.keys, prefix)
+            # Všetky kľúče s daným prefixom sú < prefix + najvyšší znak
+            hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+            top = heapq.nsmallest(MAX_RESULTS, set(self.ranks[lo:hi]))
+            if hi - lo > MEMO_THRESHOLD:
+                self.memo[prefix] = top
+        return [self.items[rank] for rank in top[:limit]]
+
+
+def word_keys(normalized):
+    """Kľúč od každého slova po koniec: "kavovar espressopro" -> "kavovar espressopro", "espressopro"."""
+    words = normalized.split(" ")
+    return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+def product_popularity():
+    from orders.models import OrderItem
+
+    sold = (
+        OrderItem.objects.exclude(order__status__in=IGNORED_ORDER_STATUSES)
+        .filter(product__isnull=False)
+        .values_list("product_id")
+        .annotate(quantity=Sum("quantity"))
+    )
+    return dict(sold)
+
+
+def load_entries():
+    """Produkty, kategórie a SKU aktívneho katalógu – spolu štyri dotazy."""
+    popularity = product_popularity()
+    products = Product.objects.filter(is_active=True).values_list(
+        "id", "name", "name_normalized", "slug", "category_id"
+    )
+
+    category_popularity = {}
+    for product_id, name, normalized, slug, category_id in products.iterator(chunk_size=5000):
+        score = popularity.get(product_id, 0)
+        category_popularity[category_id] = category_popularity.get(category_id, 0) + score
+        yield score, Suggestion("product", product_id, name, slug), word_keys(normalized)
+
+    categories = Category.objects.filter(is_active=True).annotate(
+        product_count=Count("products", filter=Q(products__is_active=True))
+    ).values_list("id", "name", "name_normalized", "slug", "product_count")
+    for category_id, name, normalized, slug, product_count in categories:
+        # Kategória: predané kusy jej produktov plus počet produktov
+        score = category_popularity.get(category_id, 0) + product_count
+        yield score, Suggestion("category", category_id, name, slug), word_keys(normalized)
+
+    variants = ProductVariant.objects.filter(product__is_active=True).values_list(
+        "id", "sku", "product__slug", "product_id"
+    )
+    for variant_id, sku, product_slug, product_id in variants.iterator(chunk_size=5000):
+        yield popularity.get(product_id, 0), Suggestion("sku", variant_id, sku, product_slug), {sku.casefold()}
+
+
+def build_index(previous=None):
+    return AutocompleteIndex(load_entries())
+
+
+def index_version():
+    return catalog_version(), popularity_version()
+
+
+autocomplete_index = ProcessIndex(build_index, version=index_version)
+
+
+def autocomplete(prefix, limit=10):
+    return autocomplete_index.get().complete(prefix, limit)
@@ -0,0 +1,113 @@
+"""
+Hromadné vyhľadanie v katalógu – až MAX_BATCH kľúčov (id, slug alebo SKU)
+jedným requestom a s pevným počtom dotazov namiesto N requestov po produkte.
+
+Dostupnosť variantov je kompaktný záznam (id, sku, produkt, sklad mínus
+rezervované) z jedného .values() dotazu. Záznamy sú aj v zdieľanej cache pod
+verziou katalógu a generáciou skladu (catalog.versions), takže opakované
+kontroly skladu z appky a od partnerov do databázy nejdú vôbec.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import F
+from rest_framework.exceptions import ValidationError
+
+from .fast_serializers import ValuesSerializer
+from .models import ProductVariant
+from .sparse import parse_list
+from .versions import catalog_version, stock_generation
+
+MAX_BATCH = 100
+AVAILABILITY_TIMEOUT = 60 * 60
+
+# Parameter -> lookup; produkty podľa SKU cez ich varianty
+PRODUCT_KEYS = {"ids": "pk", "slugs": "slug", "skus": "variants__sku"}
+AVAILABILITY_KEYS = {"variants": "pk", "skus": "sku", "products": "product_id", "slugs": "product__slug"}
+INTEGER_LOOKUPS = {"pk", "product_id"}
+
+
+def batch_keys(request, kinds):
+    """
+    (parameter, hodnoty) z ?ids=1,2,3 alebo z JSON tela POST {"ids": [1, 2, 3]}
+    pre dlhé zoznamy. Práve jeden parameter z kinds, najviac MAX_BATCH hodnôt.
+    """
+    source = request.data if request.method == "POST" else request.query_params
+    given = [kind for kind in kinds if kind in source]
+    if len(given) != 1:
+        raise ValidationError({"detail": [f"Zadajte práve jeden z parametrov: {', '.join(kinds)}."]})
+    kind = given[0]
+    raw = source[kind]
+    if isinstance(raw, str):
+        raw = parse_list(raw)
+    elif not isinstance(raw, list):
+        raise ValidationError({kind: ["Očakáva sa zoznam hodnôt."]})
+    values = list(dict.fromkeys(str(value).strip() for value in raw if str(value).strip()))
+    if not values:
+        raise ValidationError({kind: ["Zoznam je prázdny."]})
+    if len(values) > MAX_BATCH:
+        raise ValidationError({kind: [f"Najviac {MAX_BATCH} hodnôt naraz."]})
+    if kinds[kind] in INTEGER_LOOKUPS:
+        try:
+            values = list(dict.fromkeys(int(value) for value in values))
+        except ValueError:
+            raise ValidationError({kind: ["Id musia byť celé čísla."]})
+    return kind, values
+
+
+def batch_products(get_serializer, queryset, lookup, values):
+    """
+    Produkty pre hodnoty kľúča v poradí požiadavky (každý raz) a chýbajúce hodnoty.
+    Jeden dotaz na produkty + jeden na každý rozbalený vzťah (catalog.fast_serializers).
+    """
+    queryset = queryset.filter(**{f"{lookup}__in": values})
+    fast = ValuesSerializer(get_serializer())
+    if fast.supported:
+        rows = list(fast.values(queryset, extra=[lookup]))
+        # Viac SKU toho istého produktu dá viac riadkov
+        unique = list({row["pk"]: row for row in rows}.values())
+        items = dict(zip((row["pk"] for row in unique), fast.serialize(unique)))
+        matched = {row[lookup]: row["pk"] for row in rows}
+    else:
+        objects = list(queryset.annotate(batch_key=F(lookup)))
+        unique = list({obj.pk: obj for obj in objects}.values())
+        items = dict(zip((obj.pk for obj in unique), get_serializer(unique, many=True).data))
+        matched = {obj.batch_key: obj.pk for obj in objects}
+
+    pks = dict.fromkeys(matched[value] for value in values if value in matched)
+    return {"results": [items[pk] for pk in pks], "missing": [value for value in values if value not in matched]}
+
+
+def _availability_key(kind, value, prefix):
+    digest = hashlib.md5(str(value).encode(), usedforsecurity=False).hexdigest()
+    return f"{prefix}:{kind}:{digest}"
+
+
+def variant_availability(kind, values):
+    """
+    {hodnota: [záznamy dostupnosti]} – z cache, chýbajúce jedným dotazom do DB.
+    V cache sú aj prázdne výsledky (neznáme SKU), aby opakovaný dotaz nešiel do DB.
+    """
+    lookup = AVAILABILITY_KEYS[kind]
+    prefix = f"catalog:availability:{catalog_version()}:{stock_generation()}"
+    keys = {value: _availability_key(kind, value, prefix) for value in values}
+    cached = cache.get_many(keys.values())
+    found = {value: cached[key] for value, key in keys.items() if key in cached}
+
+    missing = [value for value in values if value not in found]
+    if missing:
+        fresh = {value: [] for value in missing}
+        column = "id" if lookup == "pk" else lookup
+        rows = ProductVariant.objects.filter(
+            product__is_active=True, **{f"{lookup}__in": missing}
+        ).order_by("id").values(*dict.fromkeys(["id", "sku", "product_id", "stock__quantity", "stock__reserved", column]))
+        for row in rows:
+            fresh[row[column]].append({
+                "id": row["id"],
+                "sku": row["sku"],
+                "product_id": row["product_id"],
+                "available": max((row["stock__quantity"] or 0) - (row["stock__reserved"] or 0), 0),
+            })
+        cache.set_many({keys[value]: records for value, records in fresh.items()}, AVAILABILITY_TIMEOUT)
+        found.update(fresh)
+    return {value: found[value] for value in values}
@@ -0,0 +1,150 @@
+"""
+Offline balík katalógu pre prvé spustenie mobilnej appky.
+
+Jeden gzipovaný NDJSON súbor – riadok na aktívny produkt s variantmi, cenami,
+dostupnosťou a URL obrázkov, zoradený podľa id. Verzia je hash obsahu, takže
+rovnaký katalóg dá rovnaký súbor aj ETag a klient ho môže cachovať navždy.
+
+Nová verzia vzniká z predchádzajúcej: prepočítajú sa len produkty s updated_at
+po watermarku manifestu (posúva ho aj zmena variantov, skladu a obrázkov)
+a vyhodia sa zmazané (Tombstone). Manifest (verzia, súbor, watermark) je JSON
+v tom istom úložisku ako balík.
+"""
+import gzip
+import hashlib
+import json
+from decimal import Decimal
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Product, ProductImage, ProductVariant, Tombstone
+from .sync import TOMBSTONE_RETENTION, WATERMARK_OVERLAP
+
+# Zmena štruktúry riadku = nový formát, starý balík sa neprepočítava, ale zostaví znova
+FORMAT_VERSION = 1
+BUNDLE_DIR = "bundles"
+MANIFEST_NAME = f"{BUNDLE_DIR}/catalog.json"
+CHUNK_SIZE = 2000
+
+
+def _price(value):
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def product_records(products):
+    """{id: riadok NDJSON (bytes)} pre aktívne produkty z querysetu – tri dotazy na dávku."""
+    products = products.filter(is_active=True)
+    storage = ProductImage._meta.get_field("image").storage
+
+    variants = {}
+    for row in ProductVariant.objects.filter(product__in=products).order_by("id").values(
+        "id", "product_id", "sku", "price", "stock__quantity", "stock__reserved"
+    ).iterator(chunk_size=CHUNK_SIZE):
+        available = max((row["stock__quantity"] or 0) - (row["stock__reserved"] or 0), 0)
+        variants.setdefault(row["product_id"], []).append(
+            {"id": row["id"], "sku": row["sku"], "price": _price(row["price"]), "available": available}
+        )
+
+    images = {}
+    for product_id, name in ProductImage.objects.filter(product__in=products).order_by(
+        "-is_main", "id"
+    ).values_list("product_id", "image").iterator(chunk_size=CHUNK_SIZE):
+        images.setdefault(product_id, []).append(storage.url(name))
+
+    records = {}
+    for row in products.order_by("id").values(
+        "id", "name", "slug", "description", "price", "category_id", "category__name",
+        "in_stock", "available_units", "min_variant_price", "max_variant_price",
+    ).iterator(chunk_size=CHUNK_SIZE):
+        record = {
+            "id": row["id"],
+            "name": row["name"],
+            "slug": row["slug"],
+            "description": row["description"],
+            "price": _price(row["price"]),
+            "min_price": _price(row["min_variant_price"]),
+            "max_price": _price(row["max_variant_price"]),
+            "category_id": row["category_id"],
+            "category": row["category__name"],
+            "in_stock": row["in_stock"],
+            "available": row["available_units"],
+            "images": images.get(row["id"], []),
+            "variants": variants.get(row["id"], []),
+        }
+        records[row["id"]] = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode()
+    return records
+
+
+def load_manifest():
+    if not default_storage.exists(MANIFEST_NAME):
+        return None
+    with default_storage.open(MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("format") == FORMAT_VERSION else None
+
+
+def bundle_name(version):
+    return f"{BUNDLE_DIR}/catalog-{version}.ndjson.gz"
+
+
+def read_records(manifest):
+    with default_storage.open(manifest["file"]) as f:
+        lines = gzip.decompress(f.read()).splitlines()
+    return {json.loads(line)["id"]: line for line in lines}
+
+
+def _write(name, content):
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    default_storage.save(name, ContentFile(content))
+
+
+def build_bundle(full=False):
+    """
+    Zostaví novú verziu balíka (z predchádzajúcej, ak sa dá) a vráti
+    (manifest, počet prepočítaných produktov).
+    """
+    started = timezone.now()
+    previous = None if full else load_manifest()
+    since = parse_datetime(previous["watermark"]) if previous else None
+
+    if since is None or since < started - TOMBSTONE_RETENTION or not default_storage.exists(previous["file"]):
+        records = product_records(Product.objects.all())
+        rebuilt = len(records)
+    else:
+        records = read_records(previous)
+        changed = Product.objects.filter(updated_at__gt=since)
+        deleted = Tombstone.objects.filter(model="product", deleted_at__gt=since).values_list("object_id", flat=True)
+        # Aj deaktivované produkty – product_records ich už nevráti
+        for pk in [*changed.values_list("pk", flat=True), *deleted]:
+            records.pop(pk, None)
+        fresh = product_records(changed)
+        records.update(fresh)
+        rebuilt = len(fresh)
+
+    content = b"".join(records[pk] + b"\n" for pk in sorted(records))
+    version = hashlib.sha256(content).hexdigest()[:16]
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "file": bundle_name(version),
+        "count": len(records),
+        "watermark": (started - WATERMARK_OVERLAP).isoformat(),
+        "generated_at": started.isoformat(),
+    }
+    if previous is None or previous["version"] != version or not default_storage.exists(manifest["file"]):
+        # mtime=0 – rovnaký obsah dá bajtovo rovnaký súbor
+        _write(manifest["file"], gzip.compress(content, compresslevel=9, mtime=0))
+    manifest["size"] = default_storage.size(manifest["file"])
+    _write(MANIFEST_NAME, json.dumps(manifest).encode())
+
+    # Predchádzajúcu verziu necháme – klient ju môže práve sťahovať
+    keep = {manifest["file"], previous["file"] if previous else None, MANIFEST_NAME}
+    _, files = default_storage.listdir(BUNDLE_DIR)
+    for name in files:
+        if f"{BUNDLE_DIR}/{name}" not in keep and name.startswith("catalog-"):
+            default_storage.delete(f"{BUNDLE_DIR}/{name}")
+    return manifest, rebuilt
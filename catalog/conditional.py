@@ -0,0 +1,118 @@
+"""
+Podmienený GET (ETag / Last-Modified) pre katalóg – HTML stránky aj API.
+
+Validátory sa počítajú bez serializácie a renderovania:
+  * detail – jeden riadok (pk, updated_at) podľa slugu
+  * zoznam – MAX(updated_at) celej tabuľky (z indexu, bez COUNT nad filtrom)
+    a generácia katalógu, ktorú posunie aj zmazanie riadku
+Zhoda s If-None-Match / If-Modified-Since vráti 304 bez tela. updated_at produktu
+sa posúva aj pri zmene variantov, skladu, obrázkov a názvu kategórie (catalog.models).
+"""
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from cart.store import CART_TOKEN_SESSION_KEY
+from .response_cache import normalized_params
+from .versions import catalog_generation
+
+
+def make_etag(*parts):
+    """Silný ETag z ľubovoľných hodnôt (v úvodzovkách, ako ho chce hlavička)."""
+    raw = "|".join(str(part) for part in parts)
+    return '"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def last_modified(model):
+    """Posledná zmena v tabuľke – MAX nad indexom updated_at."""
+    return model._default_manager.aggregate(last_modified=Max("updated_at"))["last_modified"]
+
+
+def not_modified(request, etag, modified):
+    """HttpResponseNotModified, ak klient má aktuálnu verziu, inak None."""
+    timestamp = int(modified.timestamp()) if modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, modified):
+    response["ETag"] = etag
+    if modified:
+        response["Last-Modified"] = http_date(modified.timestamp())
+    # Bez heuristického cachovania – prehliadač aj appka sa vždy spýtajú (a dostanú 304)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional(request, etag, modified, render):
+    response = not_modified(request, etag, modified)
+    if response is None:
+        response = render()
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        set_validators(response, etag, modified)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Pre read-only viewsety katalógu: list a retrieve s ETag / Last-Modified.
+    ETag zohľadňuje aj Accept (JSON vs. prehliadateľné API) a query parametre.
+    """
+
+    def get_etag_parts(self, request):
+        return (request.path, normalized_params(request), request.META.get("HTTP_ACCEPT", ""))
+
+    def list(self, request, *args, **kwargs):
+        changed = last_modified(self.get_queryset().model)
+        etag = make_etag("list", *self.get_etag_parts(request), catalog_generation(), changed)
+        response = conditional(request, etag, changed, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = (
+            self.filter_queryset(self.get_queryset())
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .prefetch_related(None)
+            .values_list("pk", "updated_at")
+            .first()
+        )
+        if row is None:
+            # 404 vyrieši štandardná cesta
+            return super().retrieve(request, *args, **kwargs)
+        etag = make_etag("detail", *self.get_etag_parts(request), *row)
+        response = conditional(request, etag, row[1], lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs))
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+
+class ConditionalPageMixin:
+    """
+    Pre HTML ListView/DetailView katalógu. Len pre anonymných návštevníkov –
+    prihlásenému sa v menu menia údaje mimo katalógu (vernostné body).
+    So správami (messages) sa odpovedá vždy celou stránkou, inak by ich klient nevidel.
+    Rovnako s košíkom v session (cart_token) – hlavička ukazuje počet položiek,
+    ktorý sa mení bez zmeny katalógu.
+    """
+
+    def get_validators(self):
+        """(časti ETagu, Last-Modified) alebo None – vtedy bez podmieneného GET."""
+        changed = last_modified(self.model)
+        return (catalog_generation(), changed), changed
+
+    def get(self, request, *args, **kwargs):
+        if (
+            request.user.is_authenticated
+            or CART_TOKEN_SESSION_KEY in request.session
+            or len(get_messages(request))
+        ):
+            return super().get(request, *args, **kwargs)
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        parts, modified = validators
+        etag = make_etag(request.path, normalized_params(request), *parts)
+        return conditional(request, etag, modified, lambda: super(ConditionalPageMixin, self).get(request, *args, **kwargs))
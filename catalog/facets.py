@@ -0,0 +1,108 @@
+"""
+Počty pre filtre zoznamu produktov (fazety) pre aktuálnu množinu filtrov.
+
+Kategórie, cenové pásma a sklad sú jeden GROUP BY dotaz nad vyfiltrovanými
+produktmi (kategória × pásmo × skladom), atribúty variantov druhý (názov ×
+hodnota, počet rôznych produktov) – zvyšok sa dopočíta v Pythone:
+počty kategórií sa cez strom v cache (catalog.tree) pripočítajú všetkým
+predkom, takže rodič ukazuje produkty celého podstromu. Výsledok je v cache
+pod generáciou katalógu a podpisom filtra (SQL dotazu bez zoradenia).
+"""
+import hashlib
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from .models import VariantAttribute
+from .tree import get_category_tree
+from .versions import catalog_generation
+
+CACHE_TIMEOUT = 60 * 60
+# Hranice cenových pásiem (cena "od" – min_variant_price); posledné pásmo je otvorené.
+# Pásmo sa filtruje cez ?price_from=min&price_below=max – tá istá podmienka ako v price_bucket
+PRICE_BOUNDARIES = [Decimal(value) for value in ("10", "25", "50", "100", "250", "500", "1000")]
+
+
+def price_bucket():
+    """Index pásma ako SQL výraz – pásmo i je <hranica i-1, hranica i)."""
+    return Case(
+        *[When(min_variant_price__lt=bound, then=Value(i)) for i, bound in enumerate(PRICE_BOUNDARIES)],
+        default=Value(len(PRICE_BOUNDARIES)),
+        output_field=IntegerField(),
+    )
+
+
+def facet_signature(queryset):
+    sql = str(queryset.order_by().values("pk").query)
+    return hashlib.md5(sql.encode(), usedforsecurity=False).hexdigest()
+
+
+def product_facets(queryset):
+    """Fazety pre vyfiltrovaný queryset produktov – z cache, inak jedným agregačným dotazom."""
+    key = f"catalog:facets:{catalog_generation()}:{facet_signature(queryset)}"
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, CACHE_TIMEOUT)
+    return facets
+
+
+def compute_facets(queryset):
+    rows = (
+        queryset.order_by()
+        .values("category_id", "in_stock", bucket=price_bucket())
+        .annotate(count=Count("pk"))
+    )
+    total = 0
+    direct = {}
+    buckets = [0] * (len(PRICE_BOUNDARIES) + 1)
+    in_stock = 0
+    for row in rows:
+        total += row["count"]
+        buckets[row["bucket"]] += row["count"]
+        if row["in_stock"]:
+            in_stock += row["count"]
+        if row["category_id"] is not None:
+            direct[row["category_id"]] = direct.get(row["category_id"], 0) + row["count"]
+
+    tree = get_category_tree()
+    subtree = {}
+    for category_id, count in direct.items():
+        node = tree.get(category_id)
+        if node is None:
+            # Neaktívna kategória alebo podstrom pod ňou – v navigácii ani vo výpise nie je
+            continue
+        for ancestor_id in (int(pk) for pk in node.path.split("/") if pk):
+            subtree[ancestor_id] = subtree.get(ancestor_id, 0) + count
+
+    attributes = {}
+    for row in (
+        VariantAttribute.objects.filter(variant__product__in=queryset.order_by().values("pk"))
+        .values("name", "value")
+        .annotate(count=Count("variant__product", distinct=True))
+        .order_by("name", "value")
+    ):
+        attributes.setdefault(row["name"], []).append({"value": row["value"], "count": row["count"]})
+
+    bounds = [None, *PRICE_BOUNDARIES, None]
+    return {
+        "total": total,
+        "categories": [
+            {
+                "id": node.id, "name": node.name, "slug": node.slug, "parent_id": node.parent_id,
+                "depth": node.depth, "count": subtree[node.id],
+            }
+            for node in tree.walk() if subtree.get(node.id)
+        ],
+        "price": [
+            {
+                "min": None if low is None else str(low),
+                "max": None if high is None else str(high),
+                "count": count,
+            }
+            for low, high, count in zip(bounds, bounds[1:], buckets) if count
+        ],
+        "in_stock": {"in_stock": in_stock, "out_of_stock": total - in_stock},
+        "attributes": attributes,
+    }
@@ -0,0 +1,74 @@
+"""
+Rýchly JSON pre REST API cez orjson (ak je nainštalovaný).
+
+FastJSONRenderer a FastJSONParser nahrádzajú JSONRenderer a JSONParser z DRF
+s rovnakým výstupom: ceny z DecimalField sú reťazce ako doteraz, holé Decimal,
+dátumy a lazy preklady prejdú cez JSONEncoder z DRF. Bez orjson, pri odsadení
+(Accept: application/json; indent=4), pri UNICODE_JSON/COMPACT_JSON = False
+alebo pri hodnote, ktorú orjson nezapíše rovnako, sa použije pôvodná
+implementácia. Bajtovú zhodu drží catalog/tests/test_fast_json.py.
+"""
+import io
+
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# DRF escapuje oddeľovače riadkov – v JavaScripte nie sú platné v reťazci
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+# orjson číta celé čísla nad 64 bitov ako float – také telo nechá na pôvodný parser.
+# Číslice -> "0", ostatné -> medzera a hľadanie podreťazca je rýchlejšie než regex.
+DIGITS = bytes(ord("0") if ord("0") <= c <= ord("9") else ord(" ") for c in range(256))
+LONG_NUMBER = b"0" * 20
+
+_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    value = _encoder.default(obj)
+    # DRF zapíše Decimal ako float cez repr(); exponent by orjson zapísal inak (1e16 vs 1e+16)
+    if isinstance(value, float) and "e" in repr(value):
+        raise TypeError("float s exponentom")
+    return value
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            # Napr. celé čísla nad 64 bitov alebo Decimal s exponentom
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if LONG_NUMBER in body.translate(DIGITS):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Rovnaké chybové hlásenie ako pôvodný parser
+            return super().parse(io.BytesIO(body), media_type, parser_context)
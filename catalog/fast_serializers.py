@@ -0,0 +1,175 @@
+"""
+Rýchla cesta pre zoznamy v API – bez vytvárania modelových inštancií.
+
+ModelSerializer pre každý riadok vytvorí inštanciu modelu a prejde všetky polia;
+pri veľkých stranách to je väčšina CPU času. ValuesSerializer číta riadky
+z .values() a vnorené zoznamy jedným .values() dotazom na vzťah, zoskupené
+podľa id rodiča. Formát polí (ceny, dátumy, URL) a ich výber (?fields=,
+?expand=) berie z inštancie pôvodného serializera, takže JSON je bajtovo
+rovnaký ako z pomalej cesty (catalog/tests/test_fast_serializers.py).
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .pagination import ordering_columns
+
+# Polia, ktorých to_representation hodnotu z databázy nemení
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.ReadOnlyField,
+)
+
+SIMPLE, DOTTED, NESTED, GROUPED = "simple", "dotted", "nested", "grouped"
+
+
+class ValuesSerializer:
+    """
+    Obal nad inštanciou ModelSerializer (template) – z jej polí odvodí stĺpce
+    pre .values() a formátovanie. Vnorené zoznamy načíta cez Prefetch querysety
+    zo sparse_prefetch serializera (rovnaké poradie ako pomalá cesta). Na
+    serializeri môžu byť:
+      * fast_columns = {pole: (stĺpec, formátovač)} – pole odvodené z iného stĺpca
+      * fast_<pole>(ids) -> {id: hodnota} – pole, ktoré zo stĺpcov odvodiť nejde
+    Pole bez takej náhrady, ktoré nie je stĺpcom modelu, nastaví supported = False.
+    """
+
+    def __init__(self, template, prefix=""):
+        self.template = template
+        self.model = template.Meta.model
+        self.request = template.context.get("request")
+        self.supported = True
+        # (meno, druh, a, b): SIMPLE stĺpec + formátovač, DOTTED to isté cez vzťah
+        # (+ stĺpce cudzích kľúčov), NESTED potomok + cudzí kľúč, GROUPED (vnorený
+        # zoznam / hook) – hodnoty pripraví serialize()
+        self.layout = []
+        self.many = []      # (meno, ValuesSerializer, queryset, cudzí kľúč v potomkovi)
+        self.computed = []  # (meno, hook)
+        fast_columns = getattr(template, "fast_columns", {})
+        for name, field in template.fields.items():
+            if field.write_only:
+                continue
+            hook = getattr(template, f"fast_{name}", None)
+            if name in fast_columns:
+                column, formatter = fast_columns[name]
+                self.layout.append((name, SIMPLE, prefix + column, formatter))
+            elif hook is not None:
+                self.computed.append((name, hook))
+                self.layout.append((name, GROUPED, None, None))
+            elif isinstance(field, serializers.ListSerializer):
+                child, queryset, fk = self._relation(name, field)
+                self.many.append((name, child, queryset, fk))
+                self.layout.append((name, GROUPED, [], None))
+                self.supported &= child.supported and not (child.many or child.computed)
+            elif isinstance(field, serializers.Serializer):
+                child = ValuesSerializer(field, prefix=f"{prefix}{field.source}__")
+                self.layout.append((name, NESTED, child, f"{prefix}{field.source}"))
+                self.supported &= child.supported and not (child.many or child.computed)
+            elif self._is_column(field.source) and "." in field.source:
+                # DRF pole vynechá, ak je niektorý vzťah na ceste None (category.name bez kategórie)
+                parts = field.source.split(".")
+                guards = [prefix + "__".join(parts[:i]) for i in range(1, len(parts))]
+                column = prefix + "__".join(parts)
+                self.layout.append((name, DOTTED, (column, guards), self._formatter(field)))
+            elif self._is_column(field.source):
+                self.layout.append((name, SIMPLE, prefix + field.source, self._formatter(field)))
+            else:
+                self.supported = False
+
+    def _is_column(self, source):
+        model = self.model
+        for part in source.split("."):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return False
+            model = field.related_model
+        return True
+
+    def _formatter(self, field):
+        if isinstance(field, serializers.FileField):
+            storage = self.model._meta.get_field(field.source).storage
+
+            def file_url(name):
+                url = storage.url(name)
+                return self.request.build_absolute_uri(url) if self.request else url
+            return file_url
+        if isinstance(field, serializers.RelatedField):
+            # PrimaryKeyRelatedField – v .values() je už id
+            return None
+        if isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, serializers.DecimalField):
+            return None
+        return field.to_representation
+
+    def _relation(self, name, field):
+        prefetch = getattr(self.template, "sparse_prefetch", {}).get(name, field.source)
+        if not isinstance(prefetch, Prefetch):
+            prefetch = Prefetch(prefetch)
+        remote = self.model._meta.get_field(field.source)
+        queryset = prefetch.queryset if prefetch.queryset is not None else remote.related_model._default_manager.all()
+        return ValuesSerializer(field.child), queryset, remote.field.attname
+
+    def columns(self):
+        columns = []
+        for _, kind, a, b in self.layout:
+            if kind == SIMPLE:
+                columns.append(a)
+            elif kind == DOTTED:
+                columns.extend([*a[1], a[0]])
+            elif kind == NESTED:
+                columns.append(b)
+                columns.extend(a.columns())
+        return columns
+
+    def values(self, queryset, extra=()):
+        """Queryset riadkov pre stránkovanie a serialize() – len potrebné stĺpce, bez prefetch."""
+        columns = dict.fromkeys(["pk", *self.columns(), *extra])
+        return queryset.prefetch_related(None).values(*columns)
+
+    def format(self, row, grouped=None):
+        item = {}
+        for name, kind, a, b in self.layout:
+            if kind == SIMPLE:
+                value = row[a]
+                item[name] = value if value is None or b is None else b(value)
+            elif kind == DOTTED:
+                column, guards = a
+                if any(row[guard] is None for guard in guards):
+                    continue
+                value = row[column]
+                item[name] = value if value is None or b is None else b(value)
+            elif kind == NESTED:
+                item[name] = None if row[b] is None else a.format(row)
+            else:
+                item[name] = grouped[name].get(row["pk"], a)
+        return item
+
+    def serialize(self, rows):
+        rows = list(rows)
+        ids = [row["pk"] for row in rows]
+        grouped = {}
+        for name, child, queryset, fk in self.many:
+            groups = grouped[name] = {}
+            for child_row in child.values(queryset.filter(**{f"{fk}__in": ids}), extra=[fk]):
+                groups.setdefault(child_row[fk], []).append(child.format(child_row))
+        for name, hook in self.computed:
+            grouped[name] = hook(ids)
+        return [self.format(row, grouped) for row in rows]
+
+
+class ValuesListMixin:
+    """
+    Pre viewsety: list() cez ValuesSerializer. Ak serializer obsahuje pole,
+    ktoré rýchla cesta nevie odvodiť, zostane pôvodný list().
+    """
+
+    def list(self, request, *args, **kwargs):
+        fast = ValuesSerializer(self.get_serializer())
+        if not fast.supported:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = fast.values(queryset, extra=ordering_columns(queryset))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
@@ -1,12 +1,48 @@
 import django_filters
 from django import forms
+from django.core.validators import validate_slug
+from django.core.exceptions import ValidationError
 from .models import Product, Category
+from .search import search_products
+from .tree import get_category_tree
 
+# ?attr.color=black&attr.size=M,L – atribúty variantov (VariantAttribute)
+ATTRIBUTE_PREFIX = "attr."
+MAX_ATTRIBUTE_FILTERS = 10
 
-class ProductFilter(django_filters.FilterSet):
+
+def attribute_params(data):
+    """{názov: [hodnoty]} z parametrov attr.<názov>; viac hodnôt čiarkou alebo opakovaním parametra."""
+    attributes = {}
+    for key in data:
+        if not key.startswith(ATTRIBUTE_PREFIX):
+            continue
+        name = key[len(ATTRIBUTE_PREFIX):]
+        try:
+            validate_slug(name)
+        except ValidationError:
+            continue
+        raw = data.getlist(key) if hasattr(data, "getlist") else [data[key]]
+        values = [value.strip() for item in raw for value in item.split(",") if value.strip()]
+        if values:
+            attributes[name] = values
+        if len(attributes) == MAX_ATTRIBUTE_FILTERS:
+            break
+    return attributes
+
+
+class AttributeFilterMixin:
+    """Pre FilterSet produktov – attr.* parametre cez ProductQuerySet.with_attributes (indexy, nie Python)."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        attributes = attribute_params(self.data)
+        return queryset.with_attributes(attributes) if attributes else queryset
+
+
+class ProductFilter(AttributeFilterMixin, django_filters.FilterSet):
     name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains',
+        method='filter_by_name',
         label='Názov obsahuje',
         widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Hľadať podľa názvu...'})
     )
@@ -18,20 +54,30 @@ class ProductFilter(django_filters.FilterSet):
         widget=forms.Select(attrs={'class': 'form-select'})
     )
 
+    # Rozsah cien variantov je denormalizovaný na produkte – bez JOIN-u na varianty
     min_price = django_filters.NumberFilter(
-        field_name='price',
+        field_name='max_variant_price',
         lookup_expr='gte',
         label='Cena od',
         widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': '0.00'})
     )
 
     max_price = django_filters.NumberFilter(
-        field_name='price',
+        field_name='min_variant_price',
         lookup_expr='lte',
         label='Cena do',
         widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': '9999.99'})
     )
 
+    # Cenové pásmo fazety (catalog.facets) – rovnaká polootvorená podmienka
+    # na cene "od" ako pri počítaní, takže odkaz ukáže presne toľko produktov
+    price_from = django_filters.NumberFilter(
+        field_name='min_variant_price', lookup_expr='gte', widget=forms.HiddenInput()
+    )
+    price_below = django_filters.NumberFilter(
+        field_name='min_variant_price', lookup_expr='lt', widget=forms.HiddenInput()
+    )
+
     in_stock = django_filters.BooleanFilter(
         method='filter_in_stock',
         label='Len skladom',
@@ -48,15 +94,20 @@ class ProductFilter(django_filters.FilterSet):
         model = Product
         fields = []
 
+    def filter_by_name(self, queryset, name, value):
+        # Fulltextový index zoradený podľa relevancie; keď nič nenájde (časť slova,
+        # napr. "presso"), podreťazec v normalizovanom názve – oboje bez diakritiky
+        found = search_products(queryset, value)
+        return found if found.exists() else queryset.search_name(value)
+
     def filter_in_stock(self, queryset, name, value):
         if value:
-            return queryset.filter(variants__stock_quantity__gt=0).distinct()
+            return queryset.filter(in_stock=True)
         return queryset
 
     def filter_by_category(self, queryset, name, value):
         if value:
-            # Hľadaj všetky podkategórie cez parent_id
-            sub_ids = Category.objects.filter(parent=value, is_active=True).values_list('id', flat=True)
-            return queryset.filter(category__in=[value.id] + list(sub_ids))
+            # Viditeľný podstrom zo stromu v cache – rovnaké pravidlo ako počty vo fazetách
+            return queryset.filter(category_id__in=get_category_tree().subtree_ids(value.pk))
         return queryset
 
@@ -0,0 +1,95 @@
+"""
+Spoločné pomôcky pre benchmark príkazy (bench_*).
+
+Všetky benchmarky bežia v transakcii, ktorá sa na konci vráti späť,
+takže vygenerované dáta v databáze nezostanú.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+
+from catalog.models import Category, Product, ProductVariant, Stock
+
+WORDS = [
+    "kávovar", "espresso", "mlynček", "smartfón", "slúchadlá", "tričko", "šaty", "notebook",
+    "tablet", "hodinky", "bluetooth", "bezdrôtový", "pánske", "dámske", "čierny", "biely",
+    "červený", "modrý", "prémiový", "lacný", "herný", "kancelársky", "športový", "detský",
+    "kožený", "bavlnený", "nerezový", "digitálny", "prenosný", "kompaktný", "výkonný", "tichý",
+]
+
+# Umelé slová, aby mal benchmark realistickú selektivitu (nie 30 slov na milión produktov)
+SYLLABLES = ["ka", "vo", "mly", "nek", "ro", "šta", "pre", "du", "li", "sve", "tra", "zo", "bel", "čer", "ný", "pan"]
+VOCABULARY = WORDS + [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rollback_after():
+    """Všetko vnútri sa po skončení vráti späť (aj pri úspechu)."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def random_name(rng, words=3):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize()
+
+
+def seed_products(count, batch_size=5000, variants=1, seed=42, start=0):
+    """Rýchlo vloží `count` produktov (bulk_create) s variantmi a skladom."""
+    rng = random.Random(seed + start)
+    categories = list(Category.objects.all()[:10]) or [
+        Category.objects.create(name=f"Bench kategória {start}", slug=f"bench-kategoria-{start}")
+    ]
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        products = Product.objects.bulk_create([
+            Product(
+                name=random_name(rng),
+                slug=f"bench-{start + created + i}",
+                description=" ".join(rng.choice(VOCABULARY) for _ in range(12)),
+                price=Decimal(rng.randint(100, 100000)) / 100,
+                category=rng.choice(categories),
+            )
+            for i in range(size)
+        ])
+        if variants:
+            new_variants = ProductVariant.objects.bulk_create([
+                ProductVariant(product=p, sku=f"BENCH-{p.pk}-{v}", price=p.price + v)
+                for p in products for v in range(variants)
+            ])
+            Stock.objects.bulk_create([
+                Stock(variant=v, quantity=rng.randint(0, 20)) for v in new_variants
+            ])
+        created += size
+    return created
+
+
+def measure(fn, repeat=20):
+    """Spustí fn `repeat`-krát a vráti štatistiky v milisekundách."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "avg": statistics.mean(timings),
+        "p50": timings[len(timings) // 2],
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def format_stats(label, stats):
+    return f"{label:<28} avg {stats['avg']:9.2f} ms   p50 {stats['p50']:9.2f} ms   p95 {stats['p95']:9.2f} ms"
@@ -0,0 +1,52 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.autocomplete import autocomplete, autocomplete_index, build_index
+from catalog.models import Product
+from ._bench import VOCABULARY, format_stats, measure, rollback_after, seed_products
+
+
+class Command(BaseCommand):
+    help = "Latencia autocomplete na stlačený kláves: icontains vs index v pamäti (dáta sa na konci vrátia späť)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=100_000)
+        parser.add_argument("--words", type=int, default=50, help="Počet napísaných slov (každý kláves je dotaz)")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--limit", type=int, default=10)
+
+    def handle(self, *args, **options):
+        rng = random.Random(5)
+        # Postupné písanie slova: "k", "ka", "kav", …
+        keystrokes = [word[:i] for word in rng.sample(VOCABULARY, options["words"]) for i in range(1, len(word) + 1)]
+        limit = options["limit"]
+
+        def icontains():
+            for prefix in keystrokes:
+                list(Product.objects.filter(name__icontains=prefix, is_active=True)[:limit])
+
+        def in_memory():
+            for prefix in keystrokes:
+                autocomplete(prefix, limit)
+
+        with rollback_after():
+            self.stdout.write(f"Generujem {options['size']:,} produktov …")
+            seed_products(options["size"])
+
+            started = time.perf_counter()
+            index = build_index()
+            self.stdout.write(
+                f"Zostavenie indexu: {len(index):,} položiek, {len(index.keys):,} kľúčov "
+                f"za {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            autocomplete_index.get()
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {len(keystrokes)} klávesov, na kláves =="))
+            for label, fn in (("icontains", icontains), ("index v pamäti", in_memory)):
+                stats = measure(fn, repeat=options["repeat"])
+                stats = {k: v / len(keystrokes) for k, v in stats.items()}
+                self.stdout.write(format_stats(label, stats))
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli vrátené späť."))
@@ -0,0 +1,77 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from catalog.fast_json import FastJSONParser, FastJSONRenderer, orjson
+from catalog.models import Product, ProductImage
+from catalog.serializers import ProductSerializer
+from orders.models import Order, OrderItem
+from orders.serializers import OrderSerializer
+from ._bench import format_stats, measure, rollback_after, seed_products
+
+
+class Command(BaseCommand):
+    help = (
+        "Porovná JSONRenderer/JSONParser z DRF s FastJSONRenderer/FastJSONParser (orjson) "
+        "na zozname produktov a histórii objednávok (dáta sa vrátia späť)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def seed(self, rows):
+        seed_products(rows, variants=3)
+        ProductImage.objects.bulk_create([
+            ProductImage(product_id=pk, image=f"products/bench/{pk}-{i}.jpg", is_main=not i)
+            for pk in Product.objects.values_list("pk", flat=True) for i in range(2)
+        ])
+        user = get_user_model().objects.create_user(username="bench-json")
+        orders = Order.objects.bulk_create([Order(user=user, billing_name="Bench Šťastný") for _ in range(rows)])
+        products = list(Product.objects.values_list("pk", "price")[:50])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product_id=products[i][0], price=products[i][1], quantity=i + 1)
+            for order in orders for i in range(3)
+        ])
+        return user
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson nie je nainštalovaný – FastJSON* použije pôvodnú implementáciu."))
+        request = Request(APIRequestFactory().get("/api/products/"))
+
+        with rollback_after():
+            largest = max(options["rows"])
+            self.stdout.write(f"Generujem {largest:,} produktov a objednávok …")
+            user = self.seed(largest)
+
+            for rows in options["rows"]:
+                payloads = {
+                    "produkty": ProductSerializer(
+                        Product.objects.order_by("id")[:rows], many=True, context={"request": request},
+                    ).data,
+                    "objednávky": OrderSerializer(
+                        Order.objects.filter(user=user).order_by("-created_at")[:rows], many=True,
+                        context={"request": request},
+                    ).data,
+                }
+                for label, data in payloads.items():
+                    body = JSONRenderer().render(data)
+                    assert FastJSONRenderer().render(data) == body
+                    self.stdout.write(self.style.MIGRATE_HEADING(
+                        f"\n== {label}: {rows} riadkov, {len(body) / 1024:,.0f} KiB =="
+                    ))
+                    for name, renderer in (("render DRF", JSONRenderer()), ("render FastJSON", FastJSONRenderer())):
+                        stats = measure(lambda: renderer.render(data), repeat=options["repeat"])
+                        self.stdout.write(f"{format_stats(name, stats)}   {rows / stats['avg'] * 1000:11,.0f} riadkov/s")
+                    for name, parser in (("parse DRF", JSONParser()), ("parse FastJSON", FastJSONParser())):
+                        stats = measure(lambda: parser.parse(io.BytesIO(body)), repeat=options["repeat"])
+                        self.stdout.write(f"{format_stats(name, stats)}   {rows / stats['avg'] * 1000:11,.0f} riadkov/s")
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli vrátené späť."))
+
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.views import ProductViewSet
+from catalog.models import Product
+from catalog.pagination import KeysetPagination
+from ._bench import format_stats, measure, rollback_after, seed_products
+
+
+class Command(BaseCommand):
+    help = "Porovná OFFSET a keyset stránkovanie API produktov na prvej a hlbokej strane (dáta sa vrátia späť)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=120_000)
+        parser.add_argument("--page", type=int, default=5000, help="Hlboká strana na porovnanie")
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        page, page_size = options["page"], options["page_size"]
+        factory = APIRequestFactory()
+        # Bez cache odpovedí – meriame stránkovanie, nie zásah do cache
+        view = ProductViewSet.as_view({"get": "list"}, response_cache_enabled=False)
+
+        def call(params):
+            response = view(factory.get("/api/products/", {"page_size": page_size, **params}))
+            assert response.status_code == 200, response.data
+            return response
+
+        def paginate(params):
+            # Len stránkovanie (COUNT + výber strany), bez serializácie
+            request = Request(factory.get("/api/products/", {"page_size": page_size, **params}))
+            paginator = KeysetPagination() if "cursor" in params else ProductViewSet.pagination_class()
+            return paginator.paginate_queryset(Product.objects.order_by(params["ordering"]), request)
+
+        with rollback_after():
+            self.stdout.write(f"Generujem {options['size']:,} produktov …")
+            seed_products(options["size"], variants=0)
+
+            for ordering in ("-id", "price"):
+                # Kurzor hlbokej strany = hodnoty kľúča posledného riadku predošlej strany
+                queryset = Product.objects.order_by(ordering)
+                paginator = KeysetPagination()
+                keys = paginator.get_keys(queryset)
+                last = queryset.order_by(*keys)[(page - 1) * page_size - 1]
+                deep_cursor = paginator.encode_cursor(keys, [getattr(last, k.lstrip("-")) for k in keys])
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n== ordering={ordering}, strana 1 vs {page} =="))
+                cases = (
+                    ("OFFSET strana 1", {"ordering": ordering, "page": 1}),
+                    (f"OFFSET strana {page}", {"ordering": ordering, "page": page}),
+                    ("keyset strana 1", {"ordering": ordering, "cursor": ""}),
+                    (f"keyset strana {page}", {"ordering": ordering, "cursor": deep_cursor}),
+                )
+                for label, params in cases:
+                    self.stdout.write(format_stats(label, measure(lambda: call(params), repeat=options["repeat"])))
+                self.stdout.write("  – len stránkovanie, bez serializácie:")
+                for label, params in cases:
+                    self.stdout.write(format_stats(label, measure(lambda: paginate(params), repeat=options["repeat"])))
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli vrátené späť."))
@@ -0,0 +1,67 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from catalog.models import Product
+from catalog.search import search_products
+from ._bench import VOCABULARY, format_stats, measure, rollback_after, seed_products
+
+
+class Command(BaseCommand):
+    help = "Porovná icontains s fulltextovým a názvovým indexom pri rôznych veľkostiach katalógu (dáta sa na konci vrátia späť)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+        parser.add_argument("--repeat", type=int, default=10, help="Počet opakovaní každého dotazu")
+        parser.add_argument("--page-size", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        # Jednoslovné, dvojslovné s prefixom a jeden dotaz bez výsledkov (najhorší prípad pre LIKE)
+        queries = [rng.choice(VOCABULARY) for _ in range(5)] + [
+            f"{rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)[:4]}" for _ in range(4)
+        ] + ["neexistujúcislovo"]
+        page = options["page_size"]
+
+        def icontains(query):
+            condition = Q()
+            for token in query.split():
+                condition &= Q(name__icontains=token) | Q(description__icontains=token)
+            qs = Product.objects.filter(condition, is_active=True).order_by("id")
+            return qs.count(), list(qs[:page])
+
+        def fulltext(query):
+            qs = search_products(Product.objects.filter(is_active=True), query)
+            return qs.count(), list(qs[:page])
+
+        def name_icontains(query):
+            condition = Q()
+            for token in query.split():
+                condition &= Q(name__icontains=token)
+            qs = Product.objects.filter(condition, is_active=True).order_by("id")
+            return qs.count(), list(qs[:page])
+
+        def name_index(query):
+            qs = Product.objects.filter(is_active=True).search_name(query).order_by("id")
+            return qs.count(), list(qs[:page])
+
+        benchmarks = (
+            ("icontains (LIKE '%q%')", icontains),
+            ("fulltext index", fulltext),
+            ("názov icontains", name_icontains),
+            ("názov name_normalized index", name_index),
+        )
+
+        with rollback_after():
+            seeded = 0
+            for size in sorted(options["sizes"]):
+                self.stdout.write(f"Generujem produkty do veľkosti {size:,} …")
+                seeded += seed_products(size - seeded, variants=0, start=seeded)
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {size:,} produktov, {len(queries)} dotazov =="))
+                for label, fn in benchmarks:
+                    stats = measure(lambda: [fn(q) for q in queries], repeat=options["repeat"])
+                    stats = {k: v / len(queries) for k, v in stats.items()}
+                    self.stdout.write(format_stats(label, stats))
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli vrátené späť."))
@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.views import ProductViewSet, StandardResultsSetPagination
+from catalog.api_views import CategoryViewSet, OrderViewSet
+from catalog.models import Category, Product, ProductImage
+from orders.models import Order, OrderItem
+from ._bench import format_stats, measure, rollback_after, seed_products
+
+
+class BenchPagination(StandardResultsSetPagination):
+    # Veľké strany len pre meranie – API samotné strop 100 riadkov drží
+    max_page_size = 10_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Porovná ModelSerializer a rýchlu cestu z .values() (catalog.fast_serializers) "
+        "na zoznamoch produktov, kategórií a objednávok – riadky za sekundu (dáta sa vrátia späť)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=5000)
+        parser.add_argument("--page-size", type=int, nargs="+", default=[100, 1000])
+        parser.add_argument("--categories", type=int, default=1000)
+        parser.add_argument("--orders", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def seed(self, options):
+        Category.objects.bulk_create([
+            Category(name=f"Bench kategória {i}", slug=f"bench-kategoria-x{i}", description="Popis " * 10)
+            for i in range(options["categories"])
+        ])
+        seed_products(options["size"], variants=3)
+        # Dva obrázky na produkt
+        ProductImage.objects.bulk_create([
+            ProductImage(product_id=pk, image=f"products/bench/{pk}-{i}.jpg", is_main=not i)
+            for pk in Product.objects.values_list("pk", flat=True) for i in range(2)
+        ])
+        user = get_user_model().objects.create_user(username="bench-serializers")
+        orders = Order.objects.bulk_create([Order(user=user, billing_name="Bench") for _ in range(options["orders"])])
+        products = list(Product.objects.values_list("pk", "price")[:50])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product_id=products[i][0], price=products[i][1], quantity=i + 1)
+            for order in orders for i in range(3)
+        ])
+        return user
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+
+        with rollback_after():
+            self.stdout.write(f"Generujem {options['size']:,} produktov, kategórie a objednávky …")
+            user = self.seed(options)
+
+            max_size = max(options["page_size"])
+            cases = [(f"produkty, strana {size}", ProductViewSet, "/api/products/", {"page_size": size}, None)
+                     for size in options["page_size"]]
+            cases += [
+                ("kategórie", CategoryViewSet, "/catalog/api/categories-api/", {"page_size": max_size}, None),
+                ("objednávky", OrderViewSet, "/catalog/api/orders-api/", {"page_size": max_size}, user),
+            ]
+            for label, viewset, path, params, auth in cases:
+                # Bez cache odpovedí – meriame serializáciu, nie zásah do cache
+                fast = type("Fast", (viewset,), {"pagination_class": BenchPagination, "response_cache_enabled": False})
+                slow = type("Slow", (fast,), {"list": ListModelMixin.list})
+
+                def call(cls):
+                    request = factory.get(path, params)
+                    if auth:
+                        force_authenticate(request, auth)
+                    response = cls.as_view({"get": "list"})(request)
+                    assert response.status_code == 200, response.data
+                    return response.render()
+
+                data = call(fast).data
+                rows = len(data["results"] if isinstance(data, dict) else data)
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label}: {rows} riadkov =="))
+                for name, cls in (("ModelSerializer", slow), ("rýchla cesta (.values)", fast)):
+                    stats = measure(lambda: call(cls), repeat=options["repeat"])
+                    self.stdout.write(f"{format_stats(name, stats)}   {rows / stats['avg'] * 1000:9,.0f} riadkov/s")
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli vrátené späť."))
@@ -0,0 +1,65 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from api.views import ProductViewSet, StandardResultsSetPagination
+from catalog.models import Product
+from ._bench import rollback_after, seed_products
+
+
+class BenchPagination(StandardResultsSetPagination):
+    # Celý zoznam jednou stranou – tak by vyzeral export bez streamovania
+    max_page_size = 1_000_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Porovná špičku pamäte a čas zoznamu produktov v jednej odpovedi "
+        "a cez ?stream=ndjson / ?stream=json pri rôznom počte riadkov (dáta sa vrátia späť)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000])
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        view = type(
+            "Bench", (ProductViewSet,), {"pagination_class": BenchPagination, "response_cache_enabled": False},
+        ).as_view({"get": "list"})
+
+        def run(params):
+            tracemalloc.start()
+            started = time.perf_counter()
+            response = view(factory.get("/api/products/", params))
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.render().content)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return size, elapsed, peak
+
+        with rollback_after():
+            seeded = 0
+            for rows in sorted(options["rows"]):
+                self.stdout.write(f"Generujem produkty do {rows:,} …")
+                seed_products(rows - seeded, variants=2, start=seeded)
+                seeded = rows
+                assert Product.objects.count() == rows
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {rows:,} produktov =="))
+                cases = [
+                    ("jedna odpoveď", {"page_size": rows}),
+                    ("?stream=ndjson", {"stream": "ndjson"}),
+                    ("?stream=json", {"stream": "json"}),
+                ]
+                for label, params in cases:
+                    size, elapsed, peak = run(params)
+                    self.stdout.write(
+                        f"{label:<16} {size / 2 ** 20:8.1f} MiB výstup   {elapsed * 1000:9.0f} ms   "
+                        f"špička pamäte {peak / 2 ** 20:8.1f} MiB"
+                    )
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli vrátené späť."))
@@ -0,0 +1,66 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.models import Product
+from catalog.suggest import SuggestionIndex, load_vocabulary, suggest, suggestions
+from ._bench import VOCABULARY, format_stats, measure, random_name, rollback_after, seed_products
+
+
+def typo(rng, word):
+    """Jeden náhodný preklep: vynechané, zdvojené alebo prehodené písmeno."""
+    i = rng.randrange(len(word) - 1)
+    return rng.choice([
+        word[:i] + word[i + 1:],
+        word[:i] + word[i] + word[i:],
+        word[:i] + word[i + 1] + word[i] + word[i + 2:],
+    ])
+
+
+class Command(BaseCommand):
+    help = "Porovná pôvodné icontains návrhy so SymSpell indexom (dáta sa na konci vrátia späť)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=100_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rng = random.Random(11)
+        queries = [typo(rng, rng.choice(VOCABULARY)) for _ in range(options["queries"])]
+
+        def icontains():
+            for query in queries:
+                list(Product.objects.filter(name__icontains=query[:3], is_active=True).distinct()[:3])
+
+        def symspell():
+            for query in queries:
+                suggest(query)
+
+        with rollback_after():
+            self.stdout.write(f"Generujem {options['size']:,} produktov …")
+            seed_products(options["size"], variants=0)
+
+            started = time.perf_counter()
+            vocabulary = load_vocabulary()
+            SuggestionIndex().update(vocabulary)
+            self.stdout.write(
+                f"Plné zostavenie indexu: {len(vocabulary):,} slov za {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            suggestions.get_index()
+
+            for product in Product.objects.order_by("?")[:10]:
+                product.name = random_name(rng)
+                product.save(update_fields=["name"])
+            started = time.perf_counter()
+            suggestions.get_index()
+            self.stdout.write(f"Obnova po premenovaní 10 produktov: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {len(queries)} dotazov s preklepom, na dotaz =="))
+            for label, fn in (("icontains(query[:3])", icontains), ("SymSpell index", symspell)):
+                stats = measure(fn, repeat=options["repeat"])
+                stats = {k: v / len(queries) for k, v in stats.items()}
+                self.stdout.write(format_stats(label, stats))
+
+        self.stdout.write(self.style.SUCCESS("\nHotovo – benchmark dáta boli vrátené späť."))
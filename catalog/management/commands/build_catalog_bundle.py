@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from catalog.bundle import build_bundle
+
+
+class Command(BaseCommand):
+    help = "Zostaví offline balík katalógu (gzip NDJSON) – inkrementálne z predchádzajúcej verzie."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Zostaviť celý balík od nuly")
+
+    def handle(self, *args, **options):
+        manifest, rebuilt = build_bundle(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Balík {manifest['version']}: {manifest['count']} produktov "
+            f"({rebuilt} prepočítaných), {manifest['size'] / 1024:.1f} kB."
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from catalog.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = "Vytvorí (ak chýba) a od nuly preindexuje fulltextový index produktov."
+
+    def handle(self, *args, **options):
+        install_search_index(rebuild=True)
+        self.stdout.write(self.style.SUCCESS("✅ Fulltextový index produktov bol prebudovaný."))
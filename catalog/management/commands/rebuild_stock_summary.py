@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from catalog.models import Product
+
+
+class Command(BaseCommand):
+    help = "Prepočíta od nuly denormalizovaný súhrn skladu a cien (available_units, in_stock, min/max cena) na produktoch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Počet produktov v jednom UPDATE")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        ids = list(Product.objects.order_by("pk").values_list("pk", flat=True))
+        updated = 0
+
+        # Po dávkach podľa rozsahu ID, aby sa tabuľka nezamkla na dlho
+        for i in range(0, len(ids), batch_size):
+            batch = ids[i:i + batch_size]
+            updated += Product.objects.filter(pk__gte=batch[0], pk__lte=batch[-1]).refresh_stock_summary()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Súhrn skladu prepočítaný pre {updated} produktov."))
@@ -45,7 +45,6 @@ class Command(BaseCommand):
                 name=name,
                 slug=slugify(name),
                 description=f"Skvelý {name}. Tento produkt bol automaticky vygenerovaný pre testovacie účely.",
-                short_description=f"Krátky popis pre {name}",
                 price=base_price,
                 category=cat,
                 is_active=True
@@ -63,8 +62,9 @@ class Command(BaseCommand):
                     product=product,
                     sku=sku_code,
                     price=base_price + Decimal(i * 10), # Druhý variant je o 10 EUR drahší
-                    attributes={"label": var_name}
                 )
+                # Atribúty ako riadky VariantAttribute – filter ?attr.edition=...
+                variant.set_attributes({"edition": var_name, "color": random.choice(["čierna", "biela", "modrá"])})
                 
                 # --- VYTVORENIE SKLADU PRE KAŽDÝ VARIANT ---
                 # Toto zabezpečí, že stock_quantity v API nebude 0
@@ -82,7 +82,6 @@ class Command(BaseCommand):
                         product=product,
                         image=django_file,
                         is_main=True,
-                        alt_text=f"Hlavný obrázok pre {product.name}"
                     )
                 self.stdout.write(self.style.SUCCESS(f"✅ Vytvorený: {name} (Varianty: 2, Obrázok: ÁNO)"))
             else:
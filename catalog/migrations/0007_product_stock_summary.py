@@ -0,0 +1,49 @@
+# Generated by Django 6.0.3 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+def fill_stock_summary(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+    Stock = apps.get_model("catalog", "Stock")
+    for product in Product.objects.all().iterator():
+        prices = [v.price if v.price is not None else product.price for v in product.variants.all()]
+        units = sum(
+            max(s.quantity - s.reserved, 0) for s in Stock.objects.filter(variant__product=product)
+        )
+        product.available_units = units
+        product.in_stock = units > 0
+        product.min_variant_price = min(prices, default=product.price)
+        product.max_variant_price = max(prices, default=product.price)
+        product.save(update_fields=["available_units", "in_stock", "min_variant_price", "max_variant_price"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_alter_productimage_options_remove_product_currency_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='available_units',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='in_stock',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='max_variant_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='min_variant_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(fill_stock_summary, migrations.RunPython.noop),
+    ]
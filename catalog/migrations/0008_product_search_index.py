@@ -0,0 +1,66 @@
+# Generated by Django 6.0.3 on 2026-10-18 15:02
+
+import catalog.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# SQL je tu zmrazené – aktuálnu podobu indexov dotvára catalog.search po každom migrate
+FTS_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS catalog_product_fts USING fts5(name, description, "
+    "content='catalog_product', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS catalog_product_fts_ai AFTER INSERT ON catalog_product BEGIN "
+    "INSERT INTO catalog_product_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS catalog_product_fts_ad AFTER DELETE ON catalog_product BEGIN "
+    "INSERT INTO catalog_product_fts(catalog_product_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS catalog_product_fts_au AFTER UPDATE OF name, description ON catalog_product BEGIN "
+    "INSERT INTO catalog_product_fts(catalog_product_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO catalog_product_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "INSERT INTO catalog_product_fts(catalog_product_fts) VALUES ('rebuild')",
+    "INSERT INTO catalog_product_fts(catalog_product_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+]
+PG_SQL = [
+    "CREATE INDEX IF NOT EXISTS catalog_product_search_gin ON catalog_product USING GIN "
+    "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')))",
+]
+
+
+def install(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"sqlite": FTS_SQL, "postgresql": PG_SQL}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def uninstall(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for name in ("catalog_product_fts_ai", "catalog_product_fts_ad", "catalog_product_fts_au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        schema_editor.execute("DROP TABLE IF EXISTS catalog_product_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS catalog_product_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_product_stock_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSearchEntry',
+            fields=[
+                ('product', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='catalog.product')),
+                ('document', catalog.models.FullTextDocumentField(db_column='catalog_product_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'catalog_product_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
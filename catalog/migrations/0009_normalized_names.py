@@ -0,0 +1,51 @@
+# Generated by Django 6.0.3 on 2026-10-18 14:20
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize(value):
+    # Zmrazená kópia catalog.text.normalize_text
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", stripped.casefold()).strip()[:255]
+
+
+def fill_normalized_names(apps, schema_editor):
+    for model_name in ("Category", "Product"):
+        model = apps.get_model("catalog", model_name)
+        objs = list(model.objects.only("id", "name"))
+        for obj in objs:
+            obj.name_normalized = normalize(obj.name)
+        model.objects.bulk_update(objs, ["name_normalized"], batch_size=1000)
+
+
+def drop_old_pg_index(apps, schema_editor):
+    # GIN index nad pôvodným výrazom s "name"; nový s name_normalized vytvorí
+    # catalog.search.install_search_index po migrate
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS catalog_product_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0008_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+        migrations.RunPython(drop_old_pg_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.3 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+def fill_paths(apps, schema_editor):
+    Category = apps.get_model("catalog", "Category")
+    parents = dict(Category.objects.values_list("pk", "parent_id"))
+    paths = {}
+
+    def path_of(pk, seen=()):
+        if pk not in paths:
+            parent_id = parents.get(pk)
+            # Prípadný cyklus z minulosti rozbijeme – kategória sa stane koreňom
+            prefix = path_of(parent_id, seen + (pk,)) if parent_id and parent_id not in seen else ""
+            paths[pk] = f"{prefix}{pk}/"
+        return paths[pk]
+
+    objs = [Category(pk=pk, path=path_of(pk)) for pk in parents]
+    Category.objects.bulk_update(objs, ["path"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0009_normalized_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.3 on 2026-10-18 18:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0013_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VariantAttribute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.SlugField(db_index=False)),
+                ('value', models.CharField(max_length=100)),
+                ('variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attributes', to='catalog.productvariant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['name', 'value', 'variant'], name='catalog_variantattr_lookup')],
+                'constraints': [models.UniqueConstraint(fields=('variant', 'name'), name='catalog_variantattribute_variant_name')],
+            },
+        ),
+    ]
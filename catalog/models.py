@@ -1,66 +1,651 @@
 import os
 from django.db import models
+from django.db.models import Exists, F, Lookup, OuterRef, Prefetch, Subquery, Sum, Value
+from django.core.exceptions import ValidationError
+from django.db.models.functions import Coalesce, Concat, Substr
+from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
+from .text import normalize_text
+from .versions import catalog_changed, catalog_touched, stock_changed
 
 User = get_user_model()
 
-class Category(models.Model):
+NORMALIZED_NAME_LENGTH = 255
+
+# Zmena týchto polí mení názvy, SKU alebo strom kategórií – zvyšuje verziu katalógu
+CATALOG_FIELDS = {"name", "is_active", "category", "category_id", "parent", "parent_id"}
+
+
+def normalized_name(name):
+    return normalize_text(name)[:NORMALIZED_NAME_LENGTH]
+
+
+class CatalogQuerySet(models.QuerySet):
+    """
+    Hromadné zápisy obchádzajú signály – generáciu katalógu (kľúč cache API
+    odpovedí) zvýšime po nich tu. Obchádzajú aj auto_now, preto updated_at
+    (ETag / Last-Modified, catalog.conditional) nastavíme tiež tu.
+    """
+
+    def _has_updated_at(self):
+        return any(field.name == "updated_at" for field in self.model._meta.concrete_fields)
+
+    def update(self, **kwargs):
+        if "updated_at" not in kwargs and self._has_updated_at():
+            kwargs["updated_at"] = timezone.now()
+        rows = super().update(**kwargs)
+        catalog_touched()
+        return rows
+
+    def delete(self):
+        result = super().delete()
+        catalog_touched()
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        catalog_touched()
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if "updated_at" not in fields and self._has_updated_at():
+            objs = list(objs)
+            now = timezone.now()
+            for obj in objs:
+                obj.updated_at = now
+            fields = [*fields, "updated_at"]
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        catalog_touched()
+        return rows
+
+    def touch(self):
+        """Posunie updated_at (zmenila sa súvisiaca časť reprezentácie, napr. obrázky)."""
+        return self.update(updated_at=timezone.now())
+
+    update.alters_data = True
+    delete.alters_data = True
+    delete.queryset_only = True
+    bulk_create.alters_data = True
+    bulk_update.alters_data = True
+    touch.alters_data = True
+
+
+class UpdatedAtMixin:
+    def save(self, *args, **kwargs):
+        # auto_now sa pri save(update_fields=...) zapíše, len ak je v zozname
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
+
+class NormalizedNameQuerySet(CatalogQuerySet):
+    """
+    Udržiava name_normalized aj pri hromadných zápisoch (bulk_create, bulk_update,
+    update), ktoré obchádzajú save().
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.name_normalized = normalized_name(obj.name)
+        created = super().bulk_create(objs, *args, **kwargs)
+        catalog_changed()
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if "name" in fields:
+            for obj in objs:
+                obj.name_normalized = normalized_name(obj.name)
+            fields = [*fields, "name_normalized"]
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if CATALOG_FIELDS & set(fields):
+            catalog_changed()
+        return rows
+
+    def update(self, **kwargs):
+        name = kwargs.get("name")
+        if name is None or isinstance(name, str):
+            if name is not None:
+                kwargs["name_normalized"] = normalized_name(name)
+            rows = super().update(**kwargs)
+        else:
+            # Výraz (F, Concat...) sa dá normalizovať až po zápise
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            self.model.objects.filter(pk__in=pks).renormalize_names()
+        if CATALOG_FIELDS & kwargs.keys():
+            catalog_changed()
+        return rows
+
+    def renormalize_names(self, batch_size=1000):
+        objs = list(self.only("pk", "name"))
+        for obj in objs:
+            obj.name_normalized = normalized_name(obj.name)
+        self.bulk_update(objs, ["name_normalized"], batch_size=batch_size)
+        return len(objs)
+
+    def search_name(self, query):
+        """Názov obsahuje (bez diakritiky) – cez index, viď catalog.search.filter_by_name."""
+        from .search import filter_by_name
+        return filter_by_name(self, query)
+
+    bulk_create.alters_data = True
+    bulk_update.alters_data = True
+    update.alters_data = True
+    renormalize_names.alters_data = True
+
+
+class NormalizedNameMixin:
+    def save(self, *args, **kwargs):
+        self.name_normalized = normalized_name(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "name_normalized"}
+        super().save(*args, **kwargs)
+
+
+def subtree_q(path, prefix=""):
+    """
+    Podstrom ako rozsah: "1/5/" <= path < "1/50" ('0' nasleduje hneď za '/'),
+    na rozdiel od LIKE vie použiť index na každej databáze.
+    """
+    return models.Q(**{f"{prefix}path__gte": path, f"{prefix}path__lt": path[:-1] + "0"})
+
+
+class CategoryQuerySet(NormalizedNameQuerySet):
+    """Strom kategórií ako materializovaná cesta (path = "1/5/12/") – podstrom je jeden prefixový dotaz."""
+
+    def subtree(self, category, include_self=True):
+        queryset = self.filter(subtree_q(category.path))
+        return queryset if include_self else queryset.exclude(pk=category.pk)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        paths = self.model.objects.rebuild_paths()
+        for obj in objs:
+            obj.path = paths.get(obj.pk, obj.path)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if {"parent", "parent_id"} & set(fields):
+            self.model.objects.rebuild_paths()
+        if "name" in fields:
+            Product.objects.filter(category__in=[obj.pk for obj in objs]).touch()
+        return rows
+
+    def update(self, **kwargs):
+        # Názov kategórie je súčasťou reprezentácie produktov (category_name)
+        pks = list(self.values_list("pk", flat=True)) if "name" in kwargs else None
+        rows = super().update(**kwargs)
+        if {"parent", "parent_id"} & kwargs.keys():
+            self.model.objects.rebuild_paths()
+        if pks:
+            Product.objects.filter(category__in=pks).touch()
+        return rows
+
+    def rebuild_paths(self, batch_size=1000):
+        """Prepočíta path všetkých kategórií z parent_id (po hromadných zmenách). Vráti {pk: path}."""
+        rows = {pk: (parent_id, path) for pk, parent_id, path in self.model.objects.values_list("pk", "parent_id", "path")}
+        paths = {}
+        for pk in rows:
+            chain, node = [], pk
+            while node is not None and node not in paths:
+                if node in chain:
+                    raise ValueError(f"Cyklus v strome kategórií (id {node}).")
+                chain.append(node)
+                node = rows[node][0] if node in rows else None
+            prefix = paths.get(node, "")
+            for node in reversed(chain):
+                prefix += f"{node}/"
+                paths[node] = prefix
+        changed = [self.model(pk=pk, path=path) for pk, path in paths.items() if rows[pk][1] != path]
+        models.QuerySet.bulk_update(self.model.objects.all(), changed, ["path"], batch_size=batch_size)
+        return paths
+
+    bulk_create.alters_data = True
+    bulk_update.alters_data = True
+    update.alters_data = True
+    rebuild_paths.alters_data = True
+
+
+class Category(UpdatedAtMixin, NormalizedNameMixin, models.Model):
     name = models.CharField(max_length=200)
+    # Názov bez diakritiky a veľkých písmen – na vyhľadávanie (udržiava save() aj hromadné querysety)
+    name_normalized = models.CharField(max_length=NORMALIZED_NAME_LENGTH, db_index=True, editable=False, default="")
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='subcategories')
+    # Id predkov vrátane seba, napr. "1/5/12/" – udržiava save(), hromadné querysety a mazanie
+    path = models.CharField(max_length=255, db_index=True, editable=False, default="")
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = CategoryQuerySet.as_manager()
 
     class Meta:
         verbose_name_plural = "Categories"
 
+    @property
+    def ancestor_ids(self):
+        """Id predkov od koreňa, bez seba."""
+        return [int(pk) for pk in self.path.split("/")[:-2]]
+
+    @property
+    def depth(self):
+        return self.path.count("/") - 1
+
+    def _stored_paths(self):
+        pks = [pk for pk in (self.pk, self.parent_id) if pk is not None]
+        return dict(Category.objects.filter(pk__in=pks).values_list("pk", "path")) if pks else {}
+
+    def clean(self):
+        super().clean()
+        stored = self._stored_paths()
+        own_path = stored.get(self.pk)
+        if self.parent_id and own_path and stored.get(self.parent_id, "").startswith(own_path):
+            raise ValidationError({"parent": "Kategória nemôže byť podkategóriou samej seba."})
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not {"parent", "parent_id"} & set(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        # Cesty z DB, nie z inštancie – predok sa mohol medzitým presunúť
+        stored = self._stored_paths()
+        old_path = stored.get(self.pk, "")
+        parent_path = stored.get(self.parent_id, "") if self.parent_id else ""
+        if old_path and parent_path.startswith(old_path):
+            raise ValueError("Kategória nemôže byť podkategóriou samej seba.")
         super().save(*args, **kwargs)
 
+        new_path = f"{parent_path}{self.pk}/"
+        if new_path != old_path:
+            if old_path:
+                # Presun celého podstromu jedným UPDATE-om
+                Category.objects.filter(subtree_q(old_path)).update(
+                    path=Concat(Value(new_path), Substr("path", len(old_path) + 1))
+                )
+            else:
+                Category.objects.filter(pk=self.pk).update(path=new_path)
+        self.path = new_path
+
     def __str__(self):
         return self.name
 
-class Product(models.Model):
+class ProductQuerySet(NormalizedNameQuerySet):
+    # Polia produktu, ktoré vstupujú do súhrnu skladu a cien
+    SUMMARY_SOURCE_FIELDS = {"price"}
+
+    def for_listing(self):
+        """
+        Všetko, čo potrebuje karta produktu v zozname, v konštantnom počte dotazov
+        (nezávisle od veľkosti stránky): kategória a hlavný obrázok. Cena "od"
+        a dostupnosť sú priamo stĺpce produktu (min_variant_price, in_stock) –
+        varianty ani sklad sa nenačítajú.
+        """
+        return self.select_related("category").prefetch_related(Product.main_image_prefetch())
+
+    def refresh_stock_summary(self):
+        """
+        Prepočíta available_units, in_stock a min/max cenu variantov
+        jedným UPDATE s korelovanými poddotazmi. Vracia počet riadkov.
+        """
+        variants = ProductVariant.objects.filter(product=OuterRef("pk")).annotate(
+            effective_price=Coalesce("price", OuterRef(OuterRef("price")))
+        )
+        available = Stock.objects.filter(
+            variant__product=OuterRef("pk"), quantity__gt=F("reserved")
+        ).values("variant__product").annotate(
+            total=Sum(F("quantity") - F("reserved"))
+        ).values("total")
+
+        # Bez variantov sa rozsah cien rovná cene produktu
+        rows = self.update(
+            available_units=Coalesce(Subquery(available), 0),
+            in_stock=Exists(available),
+            min_variant_price=Coalesce(
+                Subquery(variants.order_by("effective_price").values("effective_price")[:1]),
+                F("price"),
+            ),
+            max_variant_price=Coalesce(
+                Subquery(variants.order_by("-effective_price").values("effective_price")[:1]),
+                F("price"),
+            ),
+        )
+        # Dostupnosť variantov v cache (catalog.batch) je pod generáciou skladu. Zvýši sa
+        # až po zápise a znova po commite (bump) – súbežné čítanie by inak uložilo
+        # starý súhrn pod novú generáciu
+        stock_changed()
+        return rows
+
+    def with_attributes(self, attributes):
+        """
+        Produkty s variantom, ktorý má všetky atribúty naraz ({"color": ["black"], "size": ["M", "L"]});
+        hodnoty jedného atribútu sú OR. Každý atribút je poddotaz nad indexom (name, value, variant)
+        a databáza ich prienik spraví v jednom EXISTS.
+        """
+        variants = ProductVariant.objects.filter(product=OuterRef("pk"))
+        for name, values in attributes.items():
+            variants = variants.filter(
+                pk__in=VariantAttribute.objects.filter(name=name, value__in=values).values("variant_id")
+            )
+        return self.filter(Exists(variants))
+
+    def visibility_changed(self, active):
+        """
+        Varianty, sklad a obrázky skrytého produktu delta sync (catalog.sync)
+        neposiela, ich updated_at sa však pri zmene is_active nepohne. Pri skrytí
+        za ne zapíše tombstony, pri zverejnení ich posunie, aby ich klient dostal znova.
+        """
+        products = self.values("pk")
+        children = [
+            ProductVariant.objects.filter(product__in=products),
+            Stock.objects.filter(variant__product__in=products),
+            ProductImage.objects.filter(product__in=products),
+        ]
+        if active:
+            for queryset in children:
+                queryset.touch()
+        else:
+            Tombstone.objects.bulk_create([
+                Tombstone(model=queryset.model._meta.model_name, object_id=pk)
+                for queryset in children for pk in queryset.values_list("pk", flat=True)
+            ])
+
+    def update(self, **kwargs):
+        toggled = None
+        if "is_active" in kwargs:
+            toggled = list(self.exclude(is_active=kwargs["is_active"]).values_list("pk", flat=True))
+        if self.SUMMARY_SOURCE_FIELDS & kwargs.keys():
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            Product.objects.filter(pk__in=pks).refresh_stock_summary()
+        else:
+            rows = super().update(**kwargs)
+        if toggled:
+            Product.objects.filter(pk__in=toggled).visibility_changed(kwargs["is_active"])
+        return rows
+
+    update.alters_data = True
+    visibility_changed.alters_data = True
+
+
+class Product(UpdatedAtMixin, NormalizedNameMixin, models.Model):
     name = models.CharField(max_length=255)
+    name_normalized = models.CharField(max_length=NORMALIZED_NAME_LENGTH, db_index=True, editable=False, default="")
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     category = models.ForeignKey(Category, null=True, blank=True, on_delete=models.SET_NULL, related_name='products')
     is_active = models.BooleanField(default=True)
 
+    # Denormalizovaný súhrn variantov – udržiavaný signálmi a hromadnými querysetmi,
+    # prepočet od nuly: manage.py rebuild_stock_summary
+    available_units = models.PositiveIntegerField(default=0, editable=False)
+    in_stock = models.BooleanField(default=False, db_index=True, editable=False)
+    min_variant_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, db_index=True, editable=False)
+    max_variant_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, db_index=True, editable=False)
+
+    # Posúva sa aj pri zmene variantov, skladu, obrázkov a názvu kategórie
+    # (prepočet súhrnu / touch()) – z neho je ETag a Last-Modified produktu
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Kľúč pre keyset stránkovanie podľa ceny (catalog.pagination)
+            models.Index(fields=["price", "id"], name="catalog_product_price_id"),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        update_fields = kwargs.get("update_fields")
+        was_active = None
+        if not self._state.adding and (update_fields is None or "is_active" in update_fields):
+            was_active = Product.objects.filter(pk=self.pk).values_list("is_active", flat=True).first()
         super().save(*args, **kwargs)
+        if was_active is not None and was_active != self.is_active:
+            Product.objects.filter(pk=self.pk).visibility_changed(self.is_active)
+
+    @staticmethod
+    def main_image_prefetch():
+        """Jeden obrázok na produkt – prednostne hlavný, inak prvý nahraný (do main_images)."""
+        first_image = ProductImage.objects.filter(
+            product=OuterRef("product")
+        ).order_by("-is_main", "id").values("pk")[:1]
+        return Prefetch(
+            "images",
+            queryset=ProductImage.objects.filter(pk=Subquery(first_image)),
+            to_attr="main_images",
+        )
 
     @property
-    def in_stock(self):
-        return any(v.stock.quantity > 0 for v in self.variants.all() if hasattr(v, 'stock'))
+    def main_image(self):
+        # Pri for_listing() je obrázok už prednačítaný, inak jeden dotaz
+        if hasattr(self, "main_images"):
+            return self.main_images[0] if self.main_images else None
+        return self.images.order_by("-is_main", "id").first()
+
+    def refresh_stock_summary(self):
+        Product.objects.filter(pk=self.pk).refresh_stock_summary()
+        self.refresh_from_db(fields=["available_units", "in_stock", "min_variant_price", "max_variant_price", "updated_at"])
 
     def __str__(self):
         return self.name
 
-class ProductVariant(models.Model):
+
+class ProductSummaryQuerySet(CatalogQuerySet):
+    """
+    Hromadné zápisy (update, delete, bulk_create, bulk_update) neposielajú signály,
+    preto po nich prepočítame súhrn dotknutých produktov tu.
+    """
+    product_lookup = "product_id"
+
+    def _product_ids(self):
+        return set(self.values_list(self.product_lookup, flat=True))
+
+    def _product_ids_for(self, objs):
+        return {obj.product_id for obj in objs}
+
+    def _refresh(self, product_ids):
+        if product_ids:
+            Product.objects.filter(pk__in=product_ids).refresh_stock_summary()
+
+    def update(self, **kwargs):
+        product_ids = self._product_ids()
+        rows = super().update(**kwargs)
+        if "product" in kwargs or "product_id" in kwargs:
+            product_ids |= self._product_ids()
+        self._refresh(product_ids)
+        return rows
+
+    def delete(self):
+        product_ids = self._product_ids()
+        result = super().delete()
+        self._refresh(product_ids)
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self._refresh(self._product_ids_for(objs))
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self._refresh(self._product_ids_for(objs))
+        return rows
+
+    update.alters_data = True
+    delete.alters_data = True
+    delete.queryset_only = True
+    bulk_create.alters_data = True
+    bulk_update.alters_data = True
+
+
+class ProductVariantQuerySet(ProductSummaryQuerySet):
+    product_lookup = "product_id"
+
+    # SKU sú v indexe autocomplete – hromadné zápisy menia verziu katalógu
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if "sku" in kwargs:
+            catalog_changed()
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        catalog_changed()
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if "sku" in fields:
+            catalog_changed()
+        return rows
+
+    update.alters_data = True
+    bulk_create.alters_data = True
+    bulk_update.alters_data = True
+
+
+class ProductImageQuerySet(ProductSummaryQuerySet):
+    # Obrázky nemenia súhrn skladu, len reprezentáciu produktu
+    def _refresh(self, product_ids):
+        if product_ids:
+            Product.objects.filter(pk__in=product_ids).touch()
+
+
+class StockQuerySet(ProductSummaryQuerySet):
+    product_lookup = "variant__product_id"
+
+    def _product_ids_for(self, objs):
+        variant_ids = {obj.variant_id for obj in objs}
+        return set(ProductVariant.objects.filter(pk__in=variant_ids).values_list("product_id", flat=True))
+
+
+class ProductVariant(UpdatedAtMixin, models.Model):
     product = models.ForeignKey(Product, related_name='variants', on_delete=models.CASCADE)
     sku = models.CharField(max_length=64, unique=True)
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ProductVariantQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.product.name} ({self.sku})"
 
-class ProductImage(models.Model):
+    def get_price(self):
+        return self.price if self.price is not None else self.product.price
+
+    @property
+    def available_stock(self):
+        try:
+            return self.stock.available
+        except Stock.DoesNotExist:
+            return 0
+
+    def set_attributes(self, attributes):
+        """Nahradí atribúty variantu, napr. {"color": "black", "size": "M"}."""
+        self.attributes.exclude(name__in=attributes).delete()
+        for name, value in attributes.items():
+            VariantAttribute.objects.update_or_create(variant=self, name=name, defaults={"value": value})
+
+
+class VariantAttribute(models.Model):
+    """
+    Atribút variantu (farba, veľkosť, edícia) ako riadok – filtrovanie ide cez
+    index (name, value, variant), nie cez prehľadávanie JSON stĺpca.
+    """
+    variant = models.ForeignKey(ProductVariant, related_name='attributes', on_delete=models.CASCADE)
+    # Kľúč v URL (?attr.color=black) – malé písmená bez medzier
+    name = models.SlugField(max_length=50, db_index=False)
+    value = models.CharField(max_length=100)
+
+    objects = CatalogQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["variant", "name"], name="catalog_variantattribute_variant_name"),
+        ]
+        indexes = [
+            # Krytý index – variant_id sa pre filter vyčíta priamo z indexu
+            models.Index(fields=["name", "value", "variant"], name="catalog_variantattr_lookup"),
+        ]
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
+
+
+class ProductImage(UpdatedAtMixin, models.Model):
     product = models.ForeignKey(Product, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='products/%Y/%m/%d')
     is_main = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ProductImageQuerySet.as_manager()
 
-class Stock(models.Model):
+class Stock(UpdatedAtMixin, models.Model):
     variant = models.OneToOneField(ProductVariant, related_name='stock', on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=0)
     reserved = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = StockQuerySet.as_manager()
 
     @property
     def available(self):
-        return max(self.quantity - self.reserved, 0)
\ No newline at end of file
+        return max(self.quantity - self.reserved, 0)
+
+
+class Tombstone(models.Model):
+    """
+    Záznam o zmazanom riadku katalógu pre delta sync (catalog.sync) – zmazaný
+    riadok už nemá updated_at, podľa ktorého by ho klient našiel. Zapisujú ho signály.
+    """
+    model = models.CharField(max_length=32)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}"
+
+
+class FullTextDocumentField(models.TextField):
+    """Skrytý stĺpec FTS5 tabuľky s jej menom – dá sa naň len MATCH-ovať."""
+
+
+@FullTextDocumentField.register_lookup
+class FullTextMatch(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+class ProductSearchEntry(models.Model):
+    """
+    Riadok fulltextového indexu (FTS5, len SQLite). Tabuľku a triggery spravuje
+    catalog.search, preto managed = False. Umožňuje JOIN a zoradenie podľa rank.
+    """
+    product = models.OneToOneField(
+        Product, primary_key=True, db_column="rowid", db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name="search_entry",
+    )
+    document = FullTextDocumentField(db_column="catalog_product_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "catalog_product_fts"
@@ -0,0 +1,161 @@
+"""
+Keyset (kurzorové) stránkovanie pre API.
+
+Ďalšia strana je WHERE (price, id) > (cena a id posledného riadku) namiesto
+OFFSET, takže strana 5000 je rovnako rýchla ako prvá a nepotrebuje COUNT(*).
+Kurzor je nepriehľadný base64 reťazec s hodnotami kľúča posledného riadku.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def ordering_columns(queryset):
+    """
+    Stĺpce, podľa ktorých je queryset zoradený (polia modelu aj anotácie, napr.
+    search_rank) – keyset stránkovanie ich číta z posledného riadku, takže ich
+    rýchla cesta (.values()) ani only() nesmú vynechať.
+    """
+    concrete = {field.name for field in queryset.model._meta.concrete_fields}
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return [
+        key.lstrip("-") for key in ordering
+        if isinstance(key, str) and (key.lstrip("-") in concrete or key.lstrip("-") in queryset.query.annotations)
+    ]
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = "cursor"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Neplatný kurzor."
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_keys(self, queryset):
+        """
+        Kľúč zoradenia z order_by querysetu (napr. po OrderingFilter), vždy ukončený pk,
+        aby bol jednoznačný. Podporované sú len polia a anotácie, ktoré nie sú NULL.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or ["pk"])
+        keys = []
+        for field in ordering:
+            if not isinstance(field, str) or "__" in field.lstrip("-") or field == "?":
+                raise NotFound("Keyset stránkovanie nepodporuje toto zoradenie.")
+            keys.append(field)
+        if keys[-1].lstrip("-") not in ("pk", "id"):
+            keys.append("-pk" if keys[-1].startswith("-") else "pk")
+        return keys
+
+    def encode_cursor(self, keys, values):
+        payload = json.dumps({"k": keys, "v": [encode_value(v) for v in values]}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request, keys):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+            values = payload["v"]
+        except (ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # Kurzor z iného zoradenia by vynechal alebo zopakoval riadky
+        if payload.get("k") != keys or len(values) != len(keys):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    @staticmethod
+    def after(keys, values):
+        """(k1, k2, …) > (v1, v2, …) so smerom podľa každého kľúča – OR cez prefixy rovnosti."""
+        condition = Q()
+        equal = Q()
+        for key, value in zip(keys, values):
+            name = key.lstrip("-")
+            lookup = "lt" if key.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        # Nadbytočná podmienka na prvý kľúč – z OR by databáza rozsah v indexe neodvodila
+        first = keys[0]
+        bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+        return bound & condition if len(keys) > 1 else condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_keys(queryset)
+        values = self.decode_cursor(request, self.keys)
+
+        queryset = queryset.order_by(*self.keys)
+        if values is not None:
+            queryset = queryset.filter(self.after(self.keys, values))
+
+        # O riadok viac – tak vieme, či existuje ďalšia strana, bez COUNT(*)
+        page = list(queryset[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.last_values = [self.key_value(page[-1], key.lstrip("-")) for key in self.keys] if page else None
+        return page
+
+    @staticmethod
+    def key_value(row, name):
+        # Riadky z .values() (catalog.fast_serializers) sú slovníky
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.keys, self.last_values))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Pre viewsety: ?cursor= (aj prázdny pre prvú stranu) zapne keyset stránkovanie,
+    bez neho zostáva pôvodné stránkovanie viewsetu.
+    """
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            if request is not None and self.keyset_pagination_class.cursor_query_param in request.query_params:
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
@@ -0,0 +1,109 @@
+"""
+Cache GET odpovedí katalógového API.
+
+Kľúč = generácia katalógu + cesta + normalizované query parametre + Accept.
+Cachujú sa len anonymné požiadavky (bez session cookie a Authorization)
+a len JSON – Browsable API v HTML ukazuje meno prihláseného používateľa.
+Každý zápis do katalógu zvýši generáciu (catalog.versions.catalog_touched),
+takže staré odpovede sa nikdy nevrátia – len v cache dožijú. Funguje s
+ľubovoľným Django cache backendom (locmem v testoch, Redis v produkcii).
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+from .versions import catalog_generation, increment
+
+CACHE_TIMEOUT = 60 * 60
+# Validátory (catalog.conditional) sa ukladajú s odpoveďou – 304 aj bez dotazu do DB
+CACHED_HEADERS = ("ETag", "Last-Modified", "Cache-Control")
+HITS_KEY = "catalog:response-cache:hits"
+MISSES_KEY = "catalog:response-cache:misses"
+
+
+def normalized_params(request):
+    """Rovnaké parametre v inom poradí (?b=1&a=2 vs ?a=2&b=1) dajú rovnaký kľúč."""
+    return urlencode(sorted(
+        (key, value) for key in request.GET for value in request.GET.getlist(key)
+    ))
+
+
+def response_cache_key(request):
+    raw = "|".join([request.path, normalized_params(request), request.META.get("HTTP_ACCEPT", "")])
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"catalog:response:{catalog_generation()}:{digest}"
+
+
+def response_cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+        "generation": catalog_generation(),
+    }
+
+
+class CachedResponseMixin:
+    """
+    Pre verejné read-only viewsety: GET s odpoveďou 200 sa uloží vyrenderovaný.
+    Zásah do cache vráti odpoveď ešte pred autentifikáciou a serializáciou,
+    preto len pre endpointy, ktorých obsah nezávisí od používateľa.
+    """
+    response_cache_timeout = CACHE_TIMEOUT
+    # Benchmarky vypínajú cache cez as_view(response_cache_enabled=False)
+    response_cache_enabled = True
+
+    def use_response_cache(self, request):
+        # dispatch beží pred autentifikáciou – prihlásenie spoznáme len podľa hlavičiek
+        return (
+            self.response_cache_enabled
+            and request.method == "GET"
+            and "HTTP_AUTHORIZATION" not in request.META
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.use_response_cache(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        # Kľúč (a generácia) sa určí pred čítaním z DB – zápis počas výpočtu ho zneplatní
+        key = response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            increment(HITS_KEY)
+            status, content_type, content, headers = cached
+            response = HttpResponse(content, status=status, content_type=content_type)
+            for name, value in headers.items():
+                response[name] = value
+            response = get_conditional_response(
+                request,
+                etag=headers.get("ETag"),
+                last_modified=parse_http_date_safe(headers.get("Last-Modified", "")),
+                response=response,
+            )
+            patch_vary_headers(response, ["Accept"])
+            response["X-Cache"] = "HIT"
+            return response
+
+        increment(MISSES_KEY)
+        response = super().dispatch(request, *args, **kwargs)
+        # Streamované odpovede (catalog.streaming) sa necachujú – obsah sa nikdy celý nenačíta
+        renderer = getattr(response, "accepted_renderer", None)
+        if response.status_code == 200 and not response.streaming and getattr(renderer, "format", None) == "json":
+            response.render()
+            headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+            cache.set(
+                key,
+                (response.status_code, response["Content-Type"], response.content, headers),
+                self.response_cache_timeout,
+            )
+        response["X-Cache"] = "MISS"
+        return response
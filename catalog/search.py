@@ -0,0 +1,200 @@
+"""
+Fulltextové vyhľadávanie produktov.
+
+SQLite: FTS5 tabuľky s externým obsahom, udržiavané triggermi pri každom
+INSERT/UPDATE/DELETE – aj pri hromadných zápisoch mimo ORM signálov.
+  * catalog_product_fts – slová z názvu a popisu, zoradenie podľa bm25
+  * catalog_product_fts_terms – výskyty slov v indexe (fts5vocab 'instance')
+    s id produktu, pre slovník aktívnych produktov v catalog.suggest
+  * <tabuľka>_name_trgm – trigramy normalizovaného názvu pre hľadanie podreťazca
+PostgreSQL: GIN indexy (to_tsvector, pg_trgm), ktoré si databáza udržiava sama.
+Ostatné databázy padnú späť na icontains.
+"""
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .text import normalize_text
+
+FTS_TABLE = "catalog_product_fts"
+FTS_VOCAB_TABLE = f"{FTS_TABLE}_terms"
+# Pôvodný slovník bez id produktov (fts5vocab 'col') – install_search_index ho zahodí
+LEGACY_FTS_VOCAB_TABLE = f"{FTS_TABLE}_vocab"
+PG_INDEX = "catalog_product_search_gin"
+# Rovnaký výraz pre index aj dotaz, inak ho PostgreSQL nepoužije
+PG_DOCUMENT = "to_tsvector('simple', coalesce({table}name_normalized, '') || ' ' || coalesce({table}description, ''))"
+
+# Váha názvu voči popisu pri zoradení podľa relevancie
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Trigramový index vie hľadať len podreťazce aspoň tejto dĺžky
+TRIGRAM_MIN_LENGTH = 3
+
+
+@dataclass(frozen=True)
+class FtsIndex:
+    table: str
+    content_table: str
+    columns: tuple
+    tokenize: str
+
+    @property
+    def triggers(self):
+        columns = ", ".join(self.columns)
+        new = ", ".join(f"new.{c}" for c in self.columns)
+        old = ", ".join(f"old.{c}" for c in self.columns)
+        insert = f"INSERT INTO {self.table}(rowid, {columns}) VALUES (new.id, {new});"
+        delete = f"INSERT INTO {self.table}({self.table}, rowid, {columns}) VALUES ('delete', old.id, {old});"
+        return {
+            f"{self.table}_ai": f"CREATE TRIGGER IF NOT EXISTS {self.table}_ai AFTER INSERT ON {self.content_table} BEGIN {insert} END",
+            f"{self.table}_ad": f"CREATE TRIGGER IF NOT EXISTS {self.table}_ad AFTER DELETE ON {self.content_table} BEGIN {delete} END",
+            f"{self.table}_au": (
+                f"CREATE TRIGGER IF NOT EXISTS {self.table}_au AFTER UPDATE OF {columns} ON {self.content_table} "
+                f"BEGIN {delete} {insert} END"
+            ),
+        }
+
+
+FTS_INDEXES = [
+    FtsIndex(FTS_TABLE, "catalog_product", ("name", "description"), "unicode61 remove_diacritics 2"),
+    FtsIndex("catalog_product_name_trgm", "catalog_product", ("name_normalized",), "trigram"),
+    FtsIndex("catalog_category_name_trgm", "catalog_category", ("name_normalized",), "trigram"),
+]
+
+PG_INDEXES = {
+    PG_INDEX: f"catalog_product USING GIN ({PG_DOCUMENT.format(table='')})",
+    "catalog_product_name_trgm": "catalog_product USING GIN (name_normalized gin_trgm_ops)",
+    "catalog_category_name_trgm": "catalog_category USING GIN (name_normalized gin_trgm_ops)",
+}
+
+
+def tokenize(query):
+    """Rozdelí dotaz na normalizované slová – do MATCH/tsquery nikdy nejde surový vstup."""
+    return re.findall(r"\w+", normalize_text(query))
+
+
+def install_search_index(conn=None, rebuild=False):
+    """
+    Idempotentne vytvorí fulltextové indexy. Volá sa z migrácií aj po každom migrate
+    (SQLite pri prestavbe tabuľky zahodí jej triggery).
+    """
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            for index in FTS_INDEXES:
+                cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                    [f"{index.table}%"],
+                )
+                existing = {row[0] for row in cursor.fetchall()}
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.table} USING fts5("
+                    f"{', '.join(index.columns)}, content='{index.content_table}', content_rowid='id', "
+                    f"tokenize='{index.tokenize}')"
+                )
+                for sql in index.triggers.values():
+                    cursor.execute(sql)
+                # Chýbajúce triggery znamenajú, že index mohol zastarať
+                if rebuild or not existing.issuperset({index.table, *index.triggers}):
+                    cursor.execute(f"INSERT INTO {index.table}({index.table}) VALUES ('rebuild')")
+            cursor.execute(f"DROP TABLE IF EXISTS {LEGACY_FTS_VOCAB_TABLE}")
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_VOCAB_TABLE} USING fts5vocab({FTS_TABLE}, 'instance')"
+            )
+            # Stĺpec rank = bm25 s vyššou váhou názvu než popisu
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', %s)",
+                [f"bm25({NAME_WEIGHT}, {DESCRIPTION_WEIGHT})"],
+            )
+        elif conn.vendor == "postgresql":
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for name, definition in PG_INDEXES.items():
+                if rebuild:
+                    cursor.execute(f"DROP INDEX IF EXISTS {name}")
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+def uninstall_search_index(conn=None):
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            for name in (FTS_VOCAB_TABLE, LEGACY_FTS_VOCAB_TABLE):
+                cursor.execute(f"DROP TABLE IF EXISTS {name}")
+            for index in FTS_INDEXES:
+                for name in index.triggers:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(f"DROP TABLE IF EXISTS {index.table}")
+        elif conn.vendor == "postgresql":
+            for name in PG_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def search_products(queryset, query, rank=True):
+    """
+    Vyfiltruje queryset produktov podľa fulltextu. Každé slovo dotazu sa hľadá
+    ako prefix (AND), bez ohľadu na diakritiku. S rank=True pridá anotáciu
+    search_rank a zoradí podľa relevancie (menšia hodnota = relevantnejšie).
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset
+
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        match = " ".join(f'"{token}"*' for token in tokens)
+        # JOIN na FTS tabuľku – SQLite začne z indexu a produkty dohľadá podľa PK
+        queryset = queryset.filter(search_entry__document__match=match)
+        if rank:
+            queryset = queryset.annotate(search_rank=F("search_entry__rank")).order_by("search_rank", "pk")
+        return queryset
+
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{token}:*" for token in tokens)
+        document = PG_DOCUMENT.format(table="catalog_product.")
+        queryset = queryset.filter(RawSQL(
+            f"{document} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField()
+        ))
+        if rank:
+            # ts_rank je "čím vyššie, tým lepšie" – otočíme znamienko, aby sedelo s bm25
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f"-ts_rank({document}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField()
+            )).order_by("search_rank", "pk")
+        return queryset
+
+    condition = Q()
+    for token in tokens:
+        condition &= Q(name_normalized__contains=token) | Q(description__icontains=token)
+    return queryset.filter(condition)
+
+
+def filter_by_name(queryset, query):
+    """
+    Hľadanie v normalizovanom názve (name_normalized) bez diakritiky a veľkých písmen.
+    Slová s aspoň 3 znakmi ako podreťazec cez trigramový index, kratšie ako prefix
+    názvu cez obyčajný B-strom (rozsahový dotaz). Funguje pre Product aj Category.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset
+
+    table = queryset.model._meta.db_table
+    substrings = [t for t in tokens if len(t) >= TRIGRAM_MIN_LENGTH]
+    for prefix in (t for t in tokens if len(t) < TRIGRAM_MIN_LENGTH):
+        # 'ab' <= x < 'ac' – prefixový dotaz, ktorý vie použiť index na ľubovoľnej DB
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        queryset = queryset.filter(name_normalized__gte=prefix, name_normalized__lt=upper)
+
+    if not substrings:
+        return queryset
+    if connection.vendor == "sqlite":
+        trgm = f"{table}_name_trgm"
+        match = " AND ".join(f'"{token}"' for token in substrings)
+        return queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {trgm} WHERE {trgm} MATCH %s", [match]))
+    # PostgreSQL: LIKE '%x%' použije GIN index s gin_trgm_ops
+    for token in substrings:
+        queryset = queryset.filter(name_normalized__contains=token)
+    return queryset
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from .models import Product, Category, ProductVariant, ProductImage
+from .sparse import SparseFieldsetMixin
 
 User = get_user_model()
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'description']
@@ -19,14 +21,47 @@ class ProductVariantSerializer(serializers.ModelSerializer):
         model = ProductVariant
         fields = ['id', 'sku', 'price']
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     images = ProductImageSerializer(many=True, read_only=True)
     variants = ProductVariantSerializer(many=True, read_only=True)
     category_name = serializers.ReadOnlyField(source='category.name')
+    # Len cez ?expand=category / ?fields=...,thumbnail
+    category = CategorySerializer(read_only=True)
+    thumbnail = serializers.SerializerMethodField()
+
+    # Čo jednotlivé polia potrebujú z databázy (catalog.sparse)
+    sparse_columns = {
+        'category_name': ['category__name'],
+        'category': ['category__id', 'category__name', 'category__slug', 'category__description'],
+    }
+    sparse_prefetch = {
+        'images': Prefetch('images', queryset=ProductImage.objects.order_by('id')),
+        'variants': Prefetch('variants', queryset=ProductVariant.objects.order_by('id')),
+        'thumbnail': Product.main_image_prefetch(),
+    }
 
     class Meta:
         model = Product
-        fields = ['id', 'name', 'price', 'slug', 'description', 'category_name', 'images', 'variants']
+        fields = [
+            'id', 'name', 'price', 'slug', 'description', 'category_name', 'category',
+            'in_stock', 'thumbnail', 'images', 'variants',
+        ]
+        expandable = ['images', 'variants', 'category']
+        default_expand = ['images', 'variants']
+        optional_fields = ['thumbnail']
+
+    def get_thumbnail(self, obj):
+        image = obj.main_image
+        return self._image_url(image.image) if image else None
+
+    def fast_thumbnail(self, ids):
+        """Pre catalog.fast_serializers – {id produktu: URL hlavného obrázka} jedným dotazom."""
+        images = Product.main_image_prefetch().queryset.filter(product_id__in=ids)
+        return {image.product_id: self._image_url(image.image) for image in images.only('product', 'image')}
+
+    def _image_url(self, image):
+        request = self.context.get('request')
+        return request.build_absolute_uri(image.url) if request else image.url
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -0,0 +1,104 @@
+from django.db import connections
+from django.db.models.signals import post_save, post_delete, post_migrate, pre_delete
+from django.dispatch import receiver
+from .models import CATALOG_FIELDS, Category, Product, ProductImage, ProductVariant, Stock, Tombstone, VariantAttribute
+from .search import install_search_index
+from .versions import catalog_changed, catalog_touched
+
+
+@receiver(post_save, sender=Product)
+def refresh_product_summary(sender, instance, raw=False, **kwargs):
+    # Zmena ceny produktu mení aj rozsah cien variantov bez vlastnej ceny
+    if not raw:
+        instance.refresh_stock_summary()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_delete, sender=ProductVariant)
+def bump_catalog_version(sender, instance, update_fields=None, **kwargs):
+    # Návrhy a autocomplete sa pri ďalšom dotaze načítajú znova
+    if update_fields is None or CATALOG_FIELDS & set(update_fields) or "sku" in update_fields:
+        catalog_changed()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_delete, sender=ProductVariant)
+@receiver(post_save, sender=Stock)
+@receiver(post_delete, sender=Stock)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=VariantAttribute)
+@receiver(post_delete, sender=VariantAttribute)
+def touch_catalog(sender, **kwargs):
+    # Nová generácia = nové kľúče v cache API odpovedí
+    catalog_touched()
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=ProductVariant)
+@receiver(post_delete, sender=Stock)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_delete, sender=Category)
+def record_tombstone(sender, instance, **kwargs):
+    # Aj pri queryset.delete() a kaskáde – kolektor pri pripojených signáloch maže po objektoch
+    Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+@receiver(pre_delete, sender=Category)
+def touch_subcategories(sender, instance, **kwargs):
+    # SET_NULL na parent im zmení rodiča bez save() – delta sync ich musí poslať znova
+    Category.objects.filter(parent=instance).touch()
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def touch_product_on_image_change(sender, instance, raw=False, **kwargs):
+    # Obrázky sú súčasťou reprezentácie produktu – posunie sa jeho updated_at (ETag)
+    if not raw:
+        Product.objects.filter(pk=instance.product_id).touch()
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_products(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Názov kategórie je v reprezentácii produktu; pri mazaní ho SET_NULL zmení bez save()
+    if not raw and (update_fields is None or "name" in update_fields):
+        Product.objects.filter(category=instance).touch()
+
+
+@receiver(post_delete, sender=Category)
+def detach_subcategories(sender, instance, **kwargs):
+    # Podkategórie sa cez SET_NULL (bez save()) stali koreňmi – cesty prepočítame z parent_id
+    Category.objects.rebuild_paths()
+
+
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_delete, sender=ProductVariant)
+def refresh_summary_on_variant_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Product.objects.filter(pk=instance.product_id).refresh_stock_summary()
+
+
+@receiver(post_save, sender=Stock)
+@receiver(post_delete, sender=Stock)
+def refresh_summary_on_stock_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    product_id = ProductVariant.objects.filter(pk=instance.variant_id).values_list("product_id", flat=True).first()
+    if product_id:
+        Product.objects.filter(pk=product_id).refresh_stock_summary()
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using="default", **kwargs):
+    # Prestavba tabuľky v SQLite migrácii zahodí FTS triggery – obnovíme ich
+    if sender.name == "catalog":
+        install_search_index(connections[using])
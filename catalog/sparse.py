@@ -0,0 +1,101 @@
+"""
+Riedke výstupy API: ?fields=id,name,price vyberie polia, ?expand=images,variants
+určí, ktoré vnorené vzťahy sa rozbalia (bez ?expand= platí Meta.default_expand).
+
+Serializer opisuje, čo každé pole potrebuje z databázy (stĺpce pre only(),
+prefetch), a viewset podľa toho oreže dotaz – menší výstup znamená aj menej
+stĺpcov a vynechané prefetch dotazy, nie len kratší JSON.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+from .pagination import ordering_columns
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def parse_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Pre ModelSerializer. V Meta:
+      * fields – všetky polia v poradí výstupu
+      * expandable – vnorené polia, ktoré sa dajú rozbaliť cez ?expand=
+      * default_expand – rozbalené, keď ?expand= chýba
+      * optional_fields – mimo predvoleného výstupu, len na vyžiadanie cez ?fields=
+    a atribúty sparse_columns {pole: stĺpce pre only()} a sparse_prefetch
+    {pole: lookup alebo Prefetch}.
+    """
+    sparse_columns = {}
+    sparse_prefetch = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Len koreňový serializer – vnorené polia kontext pri vytvorení nemajú
+        request = self.context.get("request")
+        if request is not None and request.method in SAFE_METHODS:
+            selected = set(self.sparse_fields(request.query_params))
+            for name in list(self.fields):
+                if name not in selected:
+                    self.fields.pop(name)
+
+    @classmethod
+    def sparse_fields(cls, query_params):
+        """Mená polí vo výstupe podľa ?fields= a ?expand=; neznáme mená sú chyba 400."""
+        meta = cls.Meta
+        declared = list(meta.fields)
+        expandable = set(getattr(meta, "expandable", ()))
+        optional = set(getattr(meta, "optional_fields", ()))
+
+        errors = {}
+        if EXPAND_PARAM in query_params:
+            expand = set(parse_list(query_params[EXPAND_PARAM]))
+            if expand - expandable:
+                errors[EXPAND_PARAM] = [f"Nedá sa rozbaliť: {', '.join(sorted(expand - expandable))}."]
+        else:
+            expand = set(getattr(meta, "default_expand", ()))
+        requested = parse_list(query_params[FIELDS_PARAM]) if FIELDS_PARAM in query_params else None
+        if requested is not None and set(requested) - set(declared):
+            errors[FIELDS_PARAM] = [f"Neznáme polia: {', '.join(sorted(set(requested) - set(declared)))}."]
+        if errors:
+            raise ValidationError(errors)
+
+        if requested is None:
+            return [
+                name for name in declared
+                if name in expand or (name not in expandable and name not in optional)
+            ]
+        # Pole vymenované vo ?fields= sa zobrazí (a rozbalí) aj bez ?expand=
+        return [name for name in declared if name in requested]
+
+    @classmethod
+    def prepare_queryset(cls, queryset, fields, extra_columns=()):
+        """only() na stĺpce vybraných polí a prefetch len pre rozbalené vzťahy."""
+        # Anotácie (search_rank) only() neodkladá – stačia mu stĺpce modelu
+        columns = {"pk", *(column for column in extra_columns if column not in queryset.query.annotations)}
+        prefetches = []
+        for name in fields:
+            # Vnorené vzťahy stĺpce produktu nepotrebujú, len prefetch
+            columns.update(cls.sparse_columns.get(name, () if name in cls.sparse_prefetch else (name,)))
+            if name in cls.sparse_prefetch:
+                prefetches.append(cls.sparse_prefetch[name])
+        related = {column.split("__")[0] for column in columns if "__" in column}
+        # Cez select_related musí byť načítaný aj samotný cudzí kľúč
+        columns |= related
+        queryset = queryset.select_related(*related) if related else queryset
+        return queryset.prefetch_related(*prefetches).only(*columns)
+
+
+class SparseFieldsetViewMixin:
+    """Pre viewsety so SparseFieldsetMixin serializerom – oreže queryset podľa ?fields= a ?expand=."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if self.request.method not in SAFE_METHODS or not hasattr(serializer_class, "sparse_fields"):
+            return queryset
+        fields = serializer_class.sparse_fields(self.request.query_params)
+        return serializer_class.prepare_queryset(queryset, fields, ordering_columns(queryset))
@@ -0,0 +1,75 @@
+"""
+Streamovaný výstup zoznamov v API – ?stream=json (jedno JSON pole) alebo
+?stream=ndjson (objekt na riadok), bez stránkovania.
+
+Queryset sa číta cez .iterator(chunk_size=…) a každá dávka sa serializuje
+a pošle klientovi samostatne (StreamingHttpResponse), takže v pamäti je naraz
+len jedna dávka riadkov bez ohľadu na to, koľko ich je spolu. Dávky idú cez
+rýchlu cestu z .values() (catalog.fast_serializers), ak ju serializer
+podporuje, inak cez serializer nad modelovými inštanciami.
+"""
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+from .fast_json import FastJSONRenderer
+from .fast_serializers import ValuesSerializer
+
+STREAM_PARAM = "stream"
+CHUNK_SIZE = 500
+CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode(batches, fmt):
+    """Dávky slovníkov -> kúsky bajtov JSON poľa alebo NDJSON (kúsok na dávku)."""
+    render = FastJSONRenderer().render
+    if fmt == "ndjson":
+        for batch in batches:
+            yield b"".join(render(item) + b"\n" for item in batch)
+        return
+    separator = b"["
+    for batch in batches:
+        yield separator + b",".join(render(item) for item in batch)
+        separator = b","
+    # Prázdny zoznam – "[" sa ešte neposlalo
+    yield b"]" if separator == b"," else b"[]"
+
+
+class StreamingListMixin:
+    """Pre viewsety: list() s ?stream=json|ndjson vráti StreamingHttpResponse, inak pôvodný list()."""
+    stream_chunk_size = CHUNK_SIZE
+
+    def list(self, request, *args, **kwargs):
+        fmt = request.query_params.get(STREAM_PARAM)
+        if fmt is None:
+            return super().list(request, *args, **kwargs)
+        if fmt not in CONTENT_TYPES:
+            raise ValidationError({STREAM_PARAM: [f"Podporované formáty: {', '.join(CONTENT_TYPES)}."]})
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(encode(self.stream_batches(queryset), fmt), content_type=CONTENT_TYPES[fmt])
+        # Proxy (nginx) by inak celú odpoveď zbufferoval
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def stream_batches(self, queryset):
+        fast = ValuesSerializer(self.get_serializer())
+        if fast.supported:
+            for rows in batched(fast.values(queryset).iterator(chunk_size=self.stream_chunk_size), self.stream_chunk_size):
+                yield fast.serialize(rows)
+            return
+        # Prefetch sa pri iterator(chunk_size) robí po dávkach
+        for objects in batched(queryset.iterator(chunk_size=self.stream_chunk_size), self.stream_chunk_size):
+            yield self.get_serializer(objects, many=True).data
@@ -0,0 +1,177 @@
+"""
+"Mysleli ste…?" – návrhy opráv preklepov pre vyhľadávanie, ktoré nič nenašlo.
+
+Slovník slov z názvov produktov a kategórií drží každý proces v pamäti ako
+SymSpell index (vopred vygenerované mazania znakov), takže vyhľadanie je len
+pár dict lookupov. Zdrojom slovníka sú aktívne produkty v databáze (na SQLite
+fts5vocab nad fulltextovým indexom, ktorý udržiavajú triggery), spoločná pre
+všetky procesy – navrhnuté slovo teda vždy niečo nájde.
+Po zmene verzie katalógu (catalog.versions) proces načíta slovník znova
+a do indexu premietne len zmenené slová.
+"""
+import re
+from collections import Counter
+
+from django.db import connection
+
+from .models import Category, Product
+from .search import FTS_VOCAB_TABLE, tokenize
+from .versions import ProcessIndex
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+
+def edit_distance(a, b, limit):
+    """Damerau-Levenshtein (OSA); vráti limit + 1, ak je vzdialenosť väčšia než limit."""
+    # Spoločný začiatok a koniec vzdialenosť nemení – DP beží len nad zvyškom
+    while a and b and a[0] == b[0]:
+        a, b = a[1:], b[1:]
+    while a and b and a[-1] == b[-1]:
+        a, b = a[:-1], b[:-1]
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a or not b:
+        return max(len(a), len(b))
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SuggestionIndex:
+    """SymSpell: každé slovo je uložené pod všetkými svojimi mazaniami (do MAX_DISTANCE znakov)."""
+
+    def __init__(self, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.frequencies = {}
+        self.deletes = {}
+
+    def __len__(self):
+        return len(self.frequencies)
+
+    def _variants(self, word):
+        # Mazania len z prefixu – podstatne menší index, presnosť overí edit_distance
+        frontier = {word[:self.prefix_length]}
+        variants = set(frontier)
+        for _ in range(self.max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def add(self, word, frequency=1):
+        if word not in self.frequencies:
+            for variant in self._variants(word):
+                self.deletes.setdefault(variant, []).append(word)
+        self.frequencies[word] = frequency
+
+    def remove(self, word):
+        if self.frequencies.pop(word, None) is None:
+            return
+        for variant in self._variants(word):
+            words = self.deletes.get(variant)
+            if words is not None:
+                self.deletes[variant] = [w for w in words if w != word]
+                if not self.deletes[variant]:
+                    del self.deletes[variant]
+
+    def update(self, vocabulary):
+        """Zosúladí index so slovníkom {slovo: frekvencia}; mazania počíta len pre zmenené slová."""
+        for word in self.frequencies.keys() - vocabulary.keys():
+            self.remove(word)
+        for word, frequency in vocabulary.items():
+            self.add(word, frequency)
+
+    def lookup(self, token, limit=3):
+        """Najbližšie slová zoradené podľa (vzdialenosť, -frekvencia)."""
+        candidates = set()
+        for variant in self._variants(token):
+            candidates.update(self.deletes.get(variant, ()))
+        scored = []
+        for word in candidates:
+            distance = edit_distance(token, word, self.max_distance)
+            if distance <= self.max_distance:
+                scored.append((distance, -self.frequencies.get(word, 0), word))
+        scored.sort()
+        return [word for _, _, word in scored[:limit]]
+
+
+def load_vocabulary():
+    """Slová z názvov aktívnych produktov a kategórií s počtom produktov, v ktorých sa vyskytujú."""
+    vocabulary = Counter()
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            # Index obsahuje aj neaktívne produkty – výskyty sa filtrujú cez ich id
+            cursor.execute(
+                f"SELECT v.term, COUNT(DISTINCT v.doc) FROM {FTS_VOCAB_TABLE} v "
+                "JOIN catalog_product p ON p.id = v.doc "
+                "WHERE v.col = 'name' AND p.is_active GROUP BY v.term"
+            )
+            rows = cursor.fetchall()
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT word, ndoc FROM ts_stat("
+                "'SELECT to_tsvector(''simple'', name_normalized) FROM catalog_product WHERE is_active')"
+            )
+            rows = cursor.fetchall()
+        else:
+            rows = Counter(
+                word
+                for name in Product.objects.filter(is_active=True).values_list("name_normalized", flat=True).iterator()
+                for word in set(tokenize(name))
+            ).items()
+    for word, count in rows:
+        # Čísla (modely, rozmery) neopravujeme
+        if re.fullmatch(r"\D\w*", word):
+            vocabulary[word] += count
+    for name in Category.objects.filter(is_active=True).values_list("name_normalized", flat=True):
+        for word in tokenize(name):
+            vocabulary[word] += 1
+    return vocabulary
+
+
+def refresh_index(index):
+    index = index or SuggestionIndex()
+    index.update(load_vocabulary())
+    return index
+
+
+suggestions = ProcessIndex(refresh_index)
+
+
+def suggest(query, limit=3):
+    """
+    Návrhy celého dotazu: najprv najlepšia oprava každého slova, potom varianty
+    s inou opravou jedného slova. Dotaz bez zmeny sa nikdy nenavrhne.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    index = suggestions.get()
+    # Slovo, ktoré v katalógu existuje, nie je preklep
+    options = [
+        [token] if token in index.frequencies else index.lookup(token, limit) or [token]
+        for token in tokens
+    ]
+    best = [words[0] for words in options]
+    phrases = [best]
+    for position, words in enumerate(options):
+        for word in words[1:]:
+            phrases.append(best[:position] + [word] + best[position + 1:])
+
+    results = []
+    for phrase in phrases:
+        text = " ".join(phrase)
+        if phrase != tokens and text not in results:
+            results.append(text)
+    return results[:limit]
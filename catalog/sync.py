@@ -0,0 +1,77 @@
+"""
+Delta sync katalógu pre mobilnú appku.
+
+Klient pošle watermark z predchádzajúcej synchronizácie a dostane len riadky
+zmenené od neho (updated_at > watermark, index) a id zmazaných (Tombstone,
+index na deleted_at) – cena je úmerná počtu zmien, nie veľkosti katalógu.
+Neaktívne produkty a kategórie sa posielajú ako zmazané, rovnako varianty,
+sklad a obrázky neaktívnych produktov. Pri skrytí produktu za jeho riadky
+vzniknú tombstony a pri zverejnení sa im posunie updated_at
+(ProductQuerySet.visibility_changed), takže ich delta nájde.
+
+Časová značka vzniká pri zápise, viditeľná je až po commite, preto nový
+watermark je o WATERMARK_OVERLAP starší než začiatok synchronizácie: pomalšia
+transakcia sa tak nestratí, klient len niektoré riadky dostane dvakrát
+(zmeny aj mazania sú idempotentné).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Category, Product, ProductImage, ProductVariant, Stock, Tombstone
+
+WATERMARK_OVERLAP = timedelta(seconds=60)
+# Staršie tombstony sa môžu mazať; klient so starším watermarkom dostane celý katalóg
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+# (kľúč v odpovedi, model, stĺpce, príznak viditeľnosti); skryté riadky sú pre klienta zmazané
+RESOURCES = [
+    ("categories", Category, ("id", "name", "slug", "parent_id", "description"), "is_active"),
+    ("products", Product, (
+        "id", "name", "slug", "description", "price", "category_id", "in_stock",
+        "available_units", "min_variant_price", "max_variant_price",
+    ), "is_active"),
+    ("variants", ProductVariant, ("id", "product_id", "sku", "price"), "product__is_active"),
+    ("stock", Stock, ("id", "variant_id", "quantity", "reserved"), "variant__product__is_active"),
+    ("images", ProductImage, ("id", "product_id", "image", "is_main"), "product__is_active"),
+]
+
+
+def changes_since(since=None):
+    """
+    Zmeny od watermarku (aware datetime) alebo celý katalóg (since=None).
+    Vráti {"watermark", "full", <zdroj>: {"changed": [...], "deleted": [id, ...]}}.
+    """
+    started = timezone.now()
+    full = since is None or since < started - TOMBSTONE_RETENTION
+    result = {"watermark": started - WATERMARK_OVERLAP, "full": full}
+
+    tombstones = {}
+    if not full:
+        for model, object_id in Tombstone.objects.filter(deleted_at__gt=since).values_list("model", "object_id"):
+            tombstones.setdefault(model, set()).add(object_id)
+
+    storage = ProductImage._meta.get_field("image").storage
+    for key, model, fields, visible in RESOURCES:
+        queryset = model.objects.order_by("pk")
+        if not full:
+            queryset = queryset.filter(updated_at__gt=since)
+        deleted = tombstones.get(model._meta.model_name, set())
+        changed = []
+        for row in queryset.values(*fields, visible=F(visible)):
+            if not row.pop("visible"):
+                # Pri plnej sync skrytý riadok jednoducho vynecháme
+                if not full:
+                    deleted.add(row["id"])
+                continue
+            if "image" in row:
+                row["image"] = storage.url(row["image"]) if row["image"] else None
+            # Ceny ako reťazce, rovnako ako v ostatnom API
+            changed.append({k: str(v) if isinstance(v, Decimal) else v for k, v in row.items()})
+        # Tombstone zo skrytia neplatí pre riadok, ktorý je znova viditeľný
+        deleted -= {row["id"] for row in changed}
+        result[key] = {"changed": changed, "deleted": sorted(deleted)}
+    return result
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .versions import publish_popularity
+
+
+@shared_task
+def publish_popularity_task():
+    """Zverejní zmeny popularity pre autocomplete (CELERY_BEAT_SCHEDULE, každých 10 minút)."""
+    return publish_popularity()
@@ -1,6 +1,8 @@
 import pytest
+from decimal import Decimal
 from django.contrib.auth import get_user_model
-from catalog.models import Category, Product, ProductVariant
+from django.utils.text import slugify
+from catalog.models import Category, Product, ProductImage, ProductVariant, Stock
 
 User = get_user_model()
 
@@ -115,3 +117,53 @@ def product(db, category):
     )
     ProductVariant.objects.create(product=p, sku="TEST-001", stock_quantity=10)
     return p
+
+
+# ----------------------
+# Produkt podľa názvu – testy vyhľadávania, návrhov, autocomplete a stromu
+# ----------------------
+def create_product(name, **fields):
+    """Produkt za 10 € so slugom z názvu."""
+    return Product.objects.create(name=name, slug=slugify(name), price=Decimal("10.00"), **fields)
+
+
+def names(products):
+    return [p.name for p in products]
+
+
+# ----------------------
+# Kávovary – malý katalóg pre testy API, cache a synchronizácie
+# ----------------------
+def create_coffee_makers(category, count=3, price=Decimal("100.00"), price_step=0, stock=5, reserved=0,
+                         variant_price=None, image=False, **fields):
+    """
+    Produkty "Kávovar {i}" (slug kavovar-{i}) s jedným variantom KAV-{i} a skladom;
+    stock=None = variant bez skladu, image=True = hlavný obrázok products/{i}.jpg.
+    """
+    products = []
+    for i in range(count):
+        p = Product.objects.create(
+            name=f"Kávovar {i}", slug=f"kavovar-{i}", price=price + price_step * i, category=category, **fields,
+        )
+        variant = ProductVariant.objects.create(product=p, sku=f"KAV-{i}", price=variant_price)
+        if stock is not None:
+            Stock.objects.create(variant=variant, quantity=stock, reserved=reserved)
+        if image:
+            ProductImage.objects.create(product=p, image=f"products/{i}.jpg", is_main=True)
+        products.append(p)
+    return products
+
+
+@pytest.fixture
+def coffee_category(db):
+    return Category.objects.create(name="Kávovary", slug="kavovary", description="Všetko na kávu")
+
+
+@pytest.fixture
+def coffee_makers(coffee_category):
+    return create_coffee_makers(coffee_category)
+
+
+@pytest.fixture
+def coffee_maker(coffee_category):
+    return create_coffee_makers(coffee_category, count=1)[0]
@@ -0,0 +1,61 @@
+# catalog/tests/test_attributes.py
+import pytest
+from decimal import Decimal
+
+from catalog.facets import product_facets
+from catalog.models import Product, ProductVariant, VariantAttribute
+
+
+@pytest.fixture
+def products(db):
+    result = {}
+    for slug, variants in [
+        ("tricko", [{"color": "black", "size": "M"}, {"color": "white", "size": "L"}]),
+        ("mikina", [{"color": "black", "size": "L"}]),
+        ("hrnek", [{}]),
+    ]:
+        p = Product.objects.create(name=slug.capitalize(), slug=slug, price=Decimal("20.00"))
+        for i, attributes in enumerate(variants):
+            ProductVariant.objects.create(product=p, sku=f"{slug}-{i}").set_attributes(attributes)
+        result[slug] = p
+    return result
+
+
+def slugs(response):
+    return sorted(p["slug"] for p in response.json()["results"])
+
+
+def test_all_attributes_must_match_one_variant(client, products):
+    assert slugs(client.get("/api/products/", {"attr.color": "black", "attr.size": "M"})) == ["tricko"]
+    # Čierna aj L má tričko, ale na rôznych variantoch
+    assert slugs(client.get("/api/products/", {"attr.color": "black", "attr.size": "L"})) == ["mikina"]
+    assert slugs(client.get("/api/products/", {"attr.size": "M,L"})) == ["mikina", "tricko"]
+    assert slugs(client.get("/api/products/", {"attr.color": "red"})) == []
+    # Neplatný názov atribútu sa ignoruje
+    assert len(slugs(client.get("/api/products/", {"attr.c o": "x"}))) == 3
+
+
+def test_filter_runs_in_sql_on_the_lookup_index(products):
+    queryset = Product.objects.with_attributes({"color": ["black"], "size": ["M"]})
+    sql = str(queryset.query)
+    assert "EXISTS" in sql and sql.count('"catalog_variantattribute"') == 2
+    assert "catalog_variantattr_lookup" in queryset.explain()
+    assert list(queryset.values_list("slug", flat=True)) == ["tricko"]
+
+
+def test_set_attributes_replaces_values(products):
+    variant = ProductVariant.objects.get(sku="tricko-0")
+    variant.set_attributes({"color": "red", "fit": "slim"})
+    assert dict(variant.attributes.values_list("name", "value")) == {"color": "red", "fit": "slim"}
+    assert VariantAttribute.objects.count() == 6
+
+
+def test_html_filter_and_attribute_facets(client, products):
+    response = client.get("/catalog/", {"attr.color": "black"})
+    assert sorted(p.slug for p in response.context["products"]) == ["mikina", "tricko"]
+    names = dict(response.context["attribute_facets"])
+    assert [(value, count) for value, count, _ in names["size"]] == [("L", 2), ("M", 1)]
+    assert "attr.color=black&amp;attr.size=M" in response.content.decode()
+
+    facets = product_facets(Product.objects.all())
+    assert facets["attributes"]["color"] == [{"value": "black", "count": 2}, {"value": "white", "count": 1}]
@@ -0,0 +1,122 @@
+# catalog/tests/test_autocomplete.py
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.autocomplete import AutocompleteIndex, Suggestion, autocomplete, word_keys
+from catalog.models import Category, Product, ProductVariant
+from catalog.tasks import publish_popularity_task
+from catalog.tests.conftest import create_product
+from catalog.text import normalize_text
+from catalog.versions import REFRESH_INTERVAL
+from orders.models import Order, OrderItem
+
+
+def labels(results):
+    return [s.label for s in results]
+
+
+def test_index_matches_any_word_and_ranks_by_popularity():
+    index = AutocompleteIndex([
+        (1, Suggestion("product", 1, "Kávovar EspressoPro", "a"), word_keys(normalize_text("Kávovar EspressoPro"))),
+        (5, Suggestion("product", 2, "Espresso šálky", "b"), word_keys(normalize_text("Espresso šálky"))),
+        (0, Suggestion("product", 3, "Pánske tričko", "c"), word_keys(normalize_text("Pánske tričko"))),
+    ])
+
+    assert labels(index.complete("ESPR")) == ["Espresso šálky", "Kávovar EspressoPro"]
+    assert labels(index.complete("kávovar esp")) == ["Kávovar EspressoPro"]
+    assert labels(index.complete("espresso s", limit=1)) == ["Espresso šálky"]
+    assert index.complete("x") == []
+
+
+@pytest.mark.django_db
+def test_autocomplete_covers_products_categories_and_skus():
+    category = Category.objects.create(name="Kávovary", slug="kavovary")
+    quiet = create_product("Kávovar Basic", category=category)
+    popular = create_product("Kávovar EspressoPro", category=category)
+    create_product("Kávovar skrytý", is_active=False)
+    ProductVariant.objects.create(product=popular, sku="KAV-PRO-1")
+    order = Order.objects.create(status="paid")
+    OrderItem.objects.create(order=order, product=popular, quantity=3, price=Decimal("10.00"))
+
+    results = autocomplete("kav")
+
+    assert [(s.type, s.label) for s in results] == [
+        ("category", "Kávovary"),
+        ("product", "Kávovar EspressoPro"),
+        ("sku", "KAV-PRO-1"),
+        ("product", "Kávovar Basic"),
+    ]
+
+    # Premenovanie zvýši verziu katalógu a index sa načíta znova
+    quiet.name = "Mlynček Basic"
+    quiet.save()
+    assert labels(autocomplete("basic")) == ["Mlynček Basic"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        autocomplete("kav")
+        autocomplete("kavo")
+    assert len(ctx) == 0
+
+
+@pytest.mark.django_db
+def test_autocomplete_api(client):
+    create_product("Kávovar EspressoPro")
+
+    response = client.get("/api/autocomplete/", {"q": "esp", "limit": 5})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "query": "esp",
+        "results": [{"type": "product", "id": Product.objects.get().pk, "label": "Kávovar EspressoPro",
+                     "slug": "kavovar-espressopro"}],
+    }
+    assert client.get("/api/autocomplete/", {"q": "esp", "limit": "x"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_index_reloads_only_on_catalog_or_popularity_change(monkeypatch, django_capture_on_commit_callbacks):
+    create_product("Kávovar Basic")
+    popular = create_product("Kávovar EspressoPro")
+    # So zdieľanou cache (Redis) čas nehrá rolu – bez zmeny verzie ani jeden dotaz
+    monkeypatch.setattr("catalog.versions.cache_is_shared", lambda: True)
+    autocomplete("kav")
+    monkeypatch.setattr("time.monotonic", lambda: 10 ** 9)
+    with CaptureQueriesContext(connection) as ctx:
+        autocomplete("kav")
+    assert len(ctx) == 0
+
+    # Objednávka index neobnoví hneď, až periodická úloha zverejní popularitu
+    with django_capture_on_commit_callbacks(execute=True):
+        order = Order.objects.create(status="paid")
+        OrderItem.objects.create(order=order, product=popular, quantity=3, price=Decimal("10.00"))
+    with CaptureQueriesContext(connection) as ctx:
+        assert labels(autocomplete("kav")) == ["Kávovar Basic", "Kávovar EspressoPro"]
+    assert len(ctx) == 0
+    assert publish_popularity_task() is True
+    assert publish_popularity_task() is False
+    assert labels(autocomplete("kav")) == ["Kávovar EspressoPro", "Kávovar Basic"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        order.status = "cancelled"
+        order.save()
+    publish_popularity_task()
+    assert labels(autocomplete("kav")) == ["Kávovar Basic", "Kávovar EspressoPro"]
+
+
+@pytest.mark.django_db
+def test_index_reloads_periodically_without_shared_cache(monkeypatch):
+    popular = create_product("Kávovar EspressoPro")
+    create_product("Kávovar Basic")
+    now = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    assert labels(autocomplete("kav")) == ["Kávovar Basic", "Kávovar EspressoPro"]
+
+    # Objednávka v inom procese: verzia sa sem nedostane a beat nebeží
+    order = Order.objects.create(status="paid")
+    OrderItem.objects.create(order=order, product=popular, quantity=3, price=Decimal("10.00"))
+    assert labels(autocomplete("kav")) == ["Kávovar Basic", "Kávovar EspressoPro"]
+
+    now[0] += REFRESH_INTERVAL
+    assert labels(autocomplete("kav")) == ["Kávovar EspressoPro", "Kávovar Basic"]
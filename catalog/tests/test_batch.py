@@ -0,0 +1,103 @@
+# catalog/tests/test_batch.py
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.batch import MAX_BATCH
+from catalog.models import Product, ProductImage, ProductVariant, Stock
+
+BATCH_URL = "/catalog/api/products-api/batch/"
+AVAILABILITY_URL = "/catalog/api/products-api/availability/"
+
+
+@pytest.fixture
+def products(coffee_category):
+    result = []
+    for i in range(6):
+        p = Product.objects.create(name=f"Kávovar {i}", slug=f"kavovar-{i}", price=Decimal("100.00"), category=coffee_category)
+        for j in range(2):
+            v = ProductVariant.objects.create(product=p, sku=f"KAV-{i}-{j}")
+            Stock.objects.create(variant=v, quantity=5 + j, reserved=2 * j)
+        ProductImage.objects.create(product=p, image=f"products/{i}.jpg", is_main=True)
+        result.append(p)
+    Product.objects.filter(slug="kavovar-5").update(is_active=False)
+    return result
+
+
+def get(client, url, params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params)
+    assert response.status_code == 200, response.content
+    return response.json(), len(ctx)
+
+
+def test_batch_by_slugs_keeps_order_and_reports_missing(client, products):
+    data, _ = get(client, BATCH_URL, {"slugs": "kavovar-3,neexistuje,kavovar-0,kavovar-5"})
+    assert [p["slug"] for p in data["results"]] == ["kavovar-3", "kavovar-0"]
+    assert data["results"][0]["variants"][0]["sku"] == "KAV-3-0"
+    # Neaktívny produkt sa správa ako neexistujúci
+    assert data["missing"] == ["neexistuje", "kavovar-5"]
+
+
+def test_batch_query_count_does_not_grow(client, products):
+    _, two = get(client, BATCH_URL, {"ids": f"{products[0].pk},{products[1].pk}"})
+    _, five = get(client, BATCH_URL, {"ids": ",".join(str(p.pk) for p in products[:5])})
+    assert two == five
+
+
+def test_batch_by_skus_and_post_body(client, products):
+    response = client.post(
+        BATCH_URL, {"skus": ["KAV-2-1", "KAV-2-0", "KAV-1-0", "NIC"]}, content_type="application/json",
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["slug"] for p in data["results"]] == ["kavovar-2", "kavovar-1"]
+    assert data["missing"] == ["NIC"]
+
+    data, _ = get(client, BATCH_URL, {"skus": "KAV-0-0", "fields": "id,name"})
+    assert data["results"] == [{"id": products[0].pk, "name": "Kávovar 0"}]
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"ids": "1", "slugs": "a"},
+    {"ids": "1,x"},
+    {"slugs": ",".join(f"s{i}" for i in range(MAX_BATCH + 1))},
+])
+def test_batch_rejects_bad_input(client, products, params):
+    assert client.get(BATCH_URL, params).status_code == 400
+
+
+def test_availability_records_and_hot_cache(client, products):
+    data, queries = get(client, AVAILABILITY_URL, {"skus": "KAV-0-0,KAV-0-1,KAV-5-0,NIC"})
+    variant = ProductVariant.objects.get(sku="KAV-0-1")
+    assert data["results"] == [
+        {"id": variant.pk - 1, "sku": "KAV-0-0", "product_id": products[0].pk, "available": 5},
+        {"id": variant.pk, "sku": "KAV-0-1", "product_id": products[0].pk, "available": 4},
+    ]
+    assert data["missing"] == ["KAV-5-0", "NIC"]
+    assert queries == 1
+
+    # Iná kombinácia kľúčov – záznamy z cache, bez dotazu do DB
+    data, queries = get(client, AVAILABILITY_URL, {"skus": "NIC,KAV-0-1"})
+    assert queries == 0
+    assert data["results"][0]["available"] == 4
+
+    data, _ = get(client, AVAILABILITY_URL, {"products": f"{products[1].pk}"})
+    assert [r["sku"] for r in data["results"]] == ["KAV-1-0", "KAV-1-1"]
+
+
+def test_availability_cache_follows_stock_changes(client, products):
+    get(client, AVAILABILITY_URL, {"skus": "KAV-0-1"})
+
+    stock = Stock.objects.get(variant__sku="KAV-0-1")
+    stock.reserved = 6
+    stock.save()
+    data, _ = get(client, AVAILABILITY_URL, {"skus": "KAV-0-1"})
+    assert data["results"][0]["available"] == 0
+
+    # Hromadný zápis bez signálov
+    Stock.objects.filter(variant__sku="KAV-0-1").update(quantity=20)
+    data, _ = get(client, AVAILABILITY_URL, {"skus": "KAV-0-1"})
+    assert data["results"][0]["available"] == 14
@@ -0,0 +1,72 @@
+# catalog/tests/test_bundle.py
+import gzip
+import json
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+
+from catalog.bundle import build_bundle, load_manifest
+from catalog.models import ProductImage, Stock
+from catalog.tests.conftest import create_coffee_makers
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def coffee_makers(coffee_category):
+    # Jeden kus rezervovaný, prvý produkt s hlavným obrázkom
+    products = create_coffee_makers(coffee_category, reserved=1)
+    ProductImage.objects.create(product=products[0], image="products/a.jpg", is_main=True)
+    return products
+
+
+def download(client, manifest):
+    response = client.get(f"/api/catalog-bundle/{manifest['version']}/")
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+    return response, [json.loads(line) for line in lines]
+
+
+def test_command_builds_bundle_served_with_long_cache(client, coffee_makers):
+    call_command("build_catalog_bundle")
+    meta = client.get("/api/catalog-bundle/").json()
+
+    response, records = download(client, meta)
+    assert [r["id"] for r in records] == [p.pk for p in coffee_makers]
+    assert records[0]["images"] == ["/media/products/a.jpg"]
+    assert records[0]["variants"] == [{"id": coffee_makers[0].variants.get().pk, "sku": "KAV-0", "price": None, "available": 4}]
+    assert records[0]["price"] == "100.00"
+    assert "immutable" in response["Cache-Control"]
+
+    again = client.get(f"/api/catalog-bundle/{meta['version']}/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert again.status_code == 304
+
+
+def test_incremental_rebuild_touches_only_changed_products(client, coffee_makers, monkeypatch):
+    monkeypatch.setattr("catalog.bundle.WATERMARK_OVERLAP", timedelta(0))
+    first, _ = build_bundle()
+    unchanged, rebuilt = build_bundle()
+    assert (unchanged["version"], rebuilt) == (first["version"], 0)
+
+    Stock.objects.filter(variant__product=coffee_makers[1]).update(quantity=0)
+    coffee_makers[2].delete()
+    manifest, rebuilt = build_bundle()
+
+    assert (rebuilt, manifest["count"]) == (1, 2)
+    assert manifest["version"] != first["version"]
+    _, records = download(client, manifest)
+    assert [r["id"] for r in records] == [coffee_makers[0].pk, coffee_makers[1].pk]
+    assert records[1]["available"] == 0 and records[1]["in_stock"] is False
+
+    full, _ = build_bundle(full=True)
+    assert full["version"] == manifest["version"]
+    assert load_manifest()["version"] == full["version"]
+
+
+def test_missing_bundle(client, db):
+    assert client.get("/api/catalog-bundle/").status_code == 404
+    assert client.get("/api/catalog-bundle/abc/").status_code == 404
@@ -0,0 +1,114 @@
+# catalog/tests/test_category_tree.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.text import slugify
+
+from catalog.models import Category
+from catalog.tests.conftest import create_product, names
+from catalog.tree import build_category_tree
+
+
+def cat(name, parent=None, **kwargs):
+    return Category.objects.create(name=name, slug=slugify(name), parent=parent, **kwargs)
+
+
+@pytest.fixture
+def tree(db):
+    root = cat("Elektronika")
+    phones = cat("Mobily", root)
+    android = cat("Android", phones)
+    return root, phones, android
+
+
+def paths():
+    return dict(Category.objects.values_list("name", "path"))
+
+
+def test_paths_follow_moves_deletes_and_bulk_writes(tree):
+    root, phones, android = tree
+    assert android.path == f"{root.pk}/{phones.pk}/{android.pk}/"
+    assert android.ancestor_ids == [root.pk, phones.pk]
+
+    other = cat("Výpredaj")
+    phones.parent = other
+    phones.save()
+    assert paths()["Android"] == f"{other.pk}/{phones.pk}/{android.pk}/"
+
+    other.parent = android
+    with pytest.raises(ValueError):
+        other.save()
+
+    Category.objects.filter(pk=phones.pk).update(parent=root)
+    assert paths()["Android"] == f"{root.pk}/{phones.pk}/{android.pk}/"
+
+    [tablets] = Category.objects.bulk_create([Category(name="Tablety", slug="tablety", parent=root)])
+    assert tablets.path == paths()["Tablety"] == f"{root.pk}/{tablets.pk}/"
+
+    phones.delete()
+    assert paths()["Android"] == f"{android.pk}/"
+
+
+def test_subtree_filter_and_category_page(client, tree):
+    root, phones, android = tree
+    create_product("Pixel", category=android)
+    create_product("Nokia", category=phones)
+    create_product("Práčka", category=cat("Domácnosť"))
+
+    response = client.get("/api/products/", {"category": phones.pk})
+    assert sorted(p["name"] for p in response.json()["results"]) == ["Nokia", "Pixel"]
+
+    create_product("Skrytý", category=android, is_active=False)
+
+    response = client.get("/catalog/", {"category": root.pk})
+    assert sorted(names(response.context["products"])) == ["Nokia", "Pixel"]
+
+    response = client.get(f"/catalog/category/{phones.slug}/")
+    assert names(response.context["products"]) == ["Pixel", "Nokia"]
+    assert [c.name for c in response.context["breadcrumbs"]] == ["Elektronika", "Mobily"]
+    assert [(c.name, c.product_count) for c in response.context["subcategories"]] == [("Android", 1)]
+
+
+def test_subtree_under_inactive_category_is_hidden_everywhere(client, tree):
+    root, phones, android = tree
+    create_product("Pixel", category=android)
+    create_product("Nokia", category=phones)
+    Category.objects.filter(pk=phones.pk).update(is_active=False)
+
+    response = client.get(f"/catalog/category/{root.slug}/")
+    assert names(response.context["products"]) == []
+    assert client.get(f"/catalog/category/{android.slug}/").status_code == 404
+
+    assert list(client.get("/catalog/", {"category": root.pk}).context["products"]) == []
+    # Produkty sú aktívne, v zozname sú, no do počtu žiadnej kategórie sa nerátajú
+    response = client.get("/catalog/")
+    assert response.context["facets"]["total"] == 2
+    assert response.context["facets"]["categories"] == []
+
+
+def test_tree_is_built_with_one_query(tree):
+    root, phones, android = tree
+    create_product("Pixel", category=android)
+    create_product("Nokia", category=phones)
+    cat("Skryté", root, is_active=False)
+
+    with CaptureQueriesContext(connection) as ctx:
+        built = build_category_tree()
+    assert len(ctx) == 1
+
+    assert [(n.name, n.depth, n.product_count) for n in built.walk()] == [
+        ("Elektronika", 0, 2), ("Mobily", 1, 2), ("Android", 2, 1),
+    ]
+
+
+def test_tree_api_and_cache_invalidation(client, tree):
+    root, phones, android = tree
+    create_product("Pixel", category=android)
+
+    data = client.get("/catalog/api/categories-api/tree/").json()
+    assert data[0]["product_count"] == 1
+    assert data[0]["children"][0]["children"][0]["name"] == "Android"
+
+    create_product("Nokia", category=phones)
+    data = client.get("/catalog/api/categories-api/tree/").json()
+    assert data[0]["product_count"] == 2
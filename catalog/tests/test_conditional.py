@@ -0,0 +1,102 @@
+# catalog/tests/test_conditional.py
+import pytest
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Category, Product, ProductImage, ProductVariant, Stock
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+@pytest.mark.parametrize("url", [
+    "/api/products/",
+    "/catalog/api/products-api/kavovar-0/",
+    "/catalog/api/categories-api/",
+    "/catalog/",
+    "/catalog/product/kavovar-0/",
+])
+def test_unchanged_resource_returns_304(client, coffee_maker, url):
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first["ETag"].startswith('"')
+    assert "Last-Modified" in first
+
+    second = revalidate(client, url, first)
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second["ETag"] == first["ETag"]
+
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code == 304
+
+
+def test_304_is_computed_without_serializing(client, coffee_maker):
+    url = "/catalog/api/products-api/kavovar-0/"
+    first = client.get(url)
+
+    # Bez uloženej odpovede: len lookup (pk, updated_at), žiadne varianty ani obrázky
+    cache.clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = revalidate(client, url, first)
+    assert response.status_code == 304
+    assert len(ctx) == 1
+
+    # S uloženou odpoveďou bez jediného dotazu
+    client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        response = revalidate(client, url, first)
+    assert (response.status_code, response["X-Cache"], len(ctx)) == (304, "HIT", 0)
+
+
+@pytest.mark.parametrize("write", [
+    lambda p: Stock.objects.filter(variant__product=p).update(quantity=0),
+    lambda p: ProductVariant.objects.filter(product=p).update(price=Decimal("80.00")),
+    lambda p: ProductImage.objects.create(product=p, image="products/a.jpg"),
+    lambda p: Category.objects.filter(pk=p.category_id).update(name="Espresso"),
+    lambda p: p.save(update_fields=["description"]),
+])
+def test_related_changes_move_product_etag(client, coffee_maker, write):
+    url = "/catalog/api/products-api/kavovar-0/"
+    first = client.get(url)
+
+    write(coffee_maker)
+
+    assert revalidate(client, url, first).status_code == 200
+
+
+def test_deleted_product_changes_list_etag(client, coffee_maker):
+    other = Product.objects.create(name="Mlynček", slug="mlyncek", price=Decimal("30.00"))
+    first = client.get("/api/products/")
+
+    other.delete()
+
+    response = revalidate(client, "/api/products/", first)
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+
+
+def test_logged_in_pages_are_not_conditional(client, coffee_maker, regular_user):
+    client.force_login(regular_user)
+    response = client.get("/catalog/")
+    assert response.status_code == 200
+    assert not response.has_header("ETag")
+
+
+def test_anonymous_cart_disables_conditional_pages(client, coffee_maker):
+    first = client.get("/catalog/")
+    variant = coffee_maker.variants.first()
+
+    # Presmerovanie po pridaní spotrebuje flash správu
+    client.post(
+        reverse("cart:add_to_cart", kwargs={"product_id": coffee_maker.pk}),
+        {"variant_id": variant.pk, "quantity": 1},
+        follow=True,
+    )
+
+    response = revalidate(client, "/catalog/", first)
+    assert response.status_code == 200
+    assert not response.has_header("ETag")
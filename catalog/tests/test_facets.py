@@ -0,0 +1,101 @@
+# catalog/tests/test_facets.py
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.facets import product_facets
+from catalog.models import Category, Product, ProductVariant, Stock
+from catalog.tree import get_category_tree
+
+
+@pytest.fixture
+def catalog(db):
+    root = Category.objects.create(name="Elektronika", slug="elektronika")
+    phones = Category.objects.create(name="Telefóny", slug="telefony", parent=root)
+    Category.objects.create(name="Prázdna", slug="prazdna", parent=root)
+    for name, slug, price, category, stock in [
+        ("Telefón A", "telefon-a", "9.90", phones, 3),
+        ("Telefón B", "telefon-b", "199.00", phones, 0),
+        ("Rádio", "radio", "45.00", root, 1),
+        ("Kábel", "kabel", "5.00", None, 2),
+    ]:
+        p = Product.objects.create(name=name, slug=slug, price=Decimal(price), category=category)
+        Stock.objects.create(variant=ProductVariant.objects.create(product=p, sku=f"SKU-{p.pk}"), quantity=stock)
+    return root, phones
+
+
+def test_counts_are_subtree_aware(catalog):
+    root, phones = catalog
+    facets = product_facets(Product.objects.filter(is_active=True))
+
+    assert facets["total"] == 4
+    assert [(c["name"], c["count"], c["depth"]) for c in facets["categories"]] == [
+        ("Elektronika", 3, 0), ("Telefóny", 2, 1),
+    ]
+    assert facets["price"] == [
+        {"min": None, "max": "10", "count": 2},
+        {"min": "25", "max": "50", "count": 1},
+        {"min": "100", "max": "250", "count": 1},
+    ]
+    assert facets["in_stock"] == {"in_stock": 3, "out_of_stock": 1}
+
+
+def test_counts_follow_filters(catalog):
+    root, phones = catalog
+    facets = product_facets(Product.objects.filter(category=phones, in_stock=True))
+    assert facets["total"] == 1
+    assert [(c["name"], c["count"]) for c in facets["categories"]] == [("Elektronika", 1), ("Telefóny", 1)]
+
+
+def test_one_aggregate_query_then_cache(catalog):
+    get_category_tree()
+    queryset = Product.objects.filter(is_active=True).search_name("telefon")
+    with CaptureQueriesContext(connection) as ctx:
+        facets = product_facets(queryset)
+    # Kategórie/ceny/sklad a atribúty variantov
+    assert len(ctx) == 2 and all("GROUP BY" in q["sql"] for q in ctx.captured_queries)
+    assert facets["total"] == 2
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert product_facets(queryset.order_by("-price")) == facets
+    assert len(ctx) == 0
+
+    # Zápis do katalógu = nová generácia, staré počty sa nepoužijú
+    Product.objects.filter(name="Telefón B").update(is_active=False)
+    assert product_facets(Product.objects.filter(is_active=True))["total"] == 3
+
+
+def test_html_and_api(client, catalog):
+    root, phones = catalog
+    response = client.get("/catalog/", {"category": root.pk})
+    assert response.context["facets"]["total"] == 3
+    html = response.content.decode()
+    assert f"category={phones.pk}" in html and "(2)" in html
+
+    data = client.get("/api/products/", {"facets": "1", "min_price": "40"}).json()
+    assert data["facets"]["total"] == 2
+    assert "facets" not in client.get("/api/products/").json()
+    # Fulltext s anotáciou relevancie – GROUP BY ju nesmie zahrnúť
+    data = client.get("/api/products/", {"facets": "1", "search": "telefon"}).json()
+    assert data["facets"]["total"] == 2 and data["facets"]["in_stock"]["in_stock"] == 1
+
+
+def test_bucket_counts_match_linked_results(client, catalog):
+    root, phones = catalog
+    edge = Product.objects.create(name="Presne 25", slug="presne-25", price=Decimal("25.00"), category=root)
+    ProductVariant.objects.create(product=edge, sku="EDGE-25", price=Decimal("25.00"))
+    wide = Product.objects.create(name="Široký rozsah", slug="siroky", price=Decimal("5.00"), category=root)
+    for sku, price in (("WIDE-5", "5.00"), ("WIDE-300", "300.00")):
+        ProductVariant.objects.create(product=wide, sku=sku, price=Decimal(price))
+
+    buckets = client.get("/api/products/", {"facets": "1"}).json()["facets"]["price"]
+    assert sum(b["count"] for b in buckets) == 6
+    for bucket in buckets:
+        params = {key: bucket[name] for key, name in (("price_from", "min"), ("price_below", "max")) if bucket[name]}
+        assert client.get("/api/products/", params).json()["count"] == bucket["count"], bucket
+
+    html = client.get("/catalog/").content.decode()
+    assert "price_from=25&amp;price_below=50" in html
+    response = client.get("/catalog/", {"price_from": "25", "price_below": "50"})
+    assert {p.slug for p in response.context["products"]} == {"radio", "presne-25"}
@@ -0,0 +1,71 @@
+# catalog/tests/test_fast_json.py
+import io
+import uuid
+import pytest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from catalog import fast_json
+from catalog.fast_json import FastJSONParser, FastJSONRenderer
+from catalog.models import Product
+
+PAYLOAD = ReturnDict({
+    "id": 7,
+    "name": "Kávovar „Deluxe“   riadok ",
+    "price": "1299.90",
+    "raw_price": Decimal("12.30"),
+    "discount": Decimal("0.05"),
+    "created": datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    "day": date(2025, 3, 1),
+    "token": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Objednávka"),
+    "stock": {1: 5, 2: None},
+    "variants": [{"sku": "KAV-1", "available": True, "weight": 0.5}],
+}, serializer=None)
+
+
+@pytest.mark.parametrize("data", [
+    PAYLOAD,
+    [PAYLOAD, PAYLOAD],
+    {"big": Decimal("1E+16"), "huge": 2 ** 70},
+    {},
+])
+def test_renderer_matches_drf(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_renderer_falls_back(monkeypatch):
+    expected = JSONRenderer().render(PAYLOAD)
+    assert FastJSONRenderer().render(PAYLOAD, "application/json; indent=4") == (
+        JSONRenderer().render(PAYLOAD, "application/json; indent=4")
+    )
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert FastJSONRenderer().render(PAYLOAD) == expected
+
+
+@pytest.mark.django_db
+def test_api_uses_fast_renderer(client):
+    Product.objects.create(name="Mlynček", slug="mlynek", price=Decimal("49.90"))
+    response = client.get("/api/products/")
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert response.content == JSONRenderer().render(response.data)
+    assert response.json()["results"][0]["price"] == "49.90"
+
+
+def test_parser_matches_drf():
+    body = '{"name": "Šálka", "qty": 2, "price": 1.5, "tags": [null, true]}'.encode()
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+    assert FastJSONParser().parse(io.BytesIO(b'{"n": 123456789012345678901234567890}')) == {
+        "n": 123456789012345678901234567890,
+    }
+
+    with pytest.raises(ParseError) as fast_error:
+        FastJSONParser().parse(io.BytesIO(b'{"name": '))
+    with pytest.raises(ParseError) as drf_error:
+        JSONParser().parse(io.BytesIO(b'{"name": '))
+    assert str(fast_error.value) == str(drf_error.value)
@@ -0,0 +1,66 @@
+# catalog/tests/test_fast_serializers.py
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.views import ProductViewSet
+from catalog import api_views
+from catalog.models import Product, ProductImage, ProductVariant, Stock
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def catalog(coffee_category):
+    # Nepravidelný katalóg: 0–2 varianty, produkty bez kategórie a s viacerými obrázkami
+    root = coffee_category
+    for i in range(6):
+        p = Product.objects.create(
+            name=f"Kávovar {i}", slug=f"kavovar-{i}", price=Decimal("99.90") + i,
+            category=root if i % 3 else None, description=f"Popis „{i}“",
+        )
+        for j in range(i % 3):
+            v = ProductVariant.objects.create(product=p, sku=f"KAV-{i}-{j}", price=Decimal("1.5") * j or None)
+            Stock.objects.create(variant=v, quantity=i)
+        if i % 2:
+            ProductImage.objects.create(product=p, image=f"products/{i}-b.jpg")
+            ProductImage.objects.create(product=p, image=f"products/{i}-a.jpg", is_main=True)
+    user = get_user_model().objects.create_user(username="joe", password="pass")
+    for i in range(3):
+        order = Order.objects.create(user=user, billing_name="Joe", status="paid" if i else "draft")
+        OrderItem.objects.create(order=order, product=Product.objects.first(), quantity=i + 1, price=Decimal("10.00"))
+        OrderItem.objects.create(order=order, product=None, quantity=1, price=Decimal("0.50"))
+    return user
+
+
+def render(viewset, path, params, user, fast):
+    cls = viewset if fast else type("Slow", (viewset,), {"list": ListModelMixin.list})
+    request = APIRequestFactory().get(path, params)
+    if user is not None:
+        force_authenticate(request, user)
+    cache.clear()
+    response = cls.as_view({"get": "list"})(request)
+    assert response.status_code == 200, response.data
+    return response.render().content
+
+
+@pytest.mark.parametrize("viewset, path, params, auth", [
+    (ProductViewSet, "/api/products/", {}, False),
+    (ProductViewSet, "/api/products/", {"ordering": "price", "page_size": 4}, False),
+    (ProductViewSet, "/api/products/", {"cursor": "", "page_size": 2, "ordering": "-price"}, False),
+    (ProductViewSet, "/api/products/", {"fields": "id,name,price,thumbnail"}, False),
+    (ProductViewSet, "/api/products/", {"expand": "category,variants"}, False),
+    (ProductViewSet, "/api/products/", {"search": "kavovar"}, False),
+    (api_views.ProductViewSet, "/catalog/api/products-api/", {}, False),
+    (api_views.CategoryViewSet, "/catalog/api/categories-api/", {}, False),
+    (api_views.OrderViewSet, "/catalog/api/orders-api/", {}, True),
+    (api_views.OrderViewSet, "/catalog/api/orders-api/", {"fields": "id,status_display,items"}, True),
+])
+def test_fast_path_is_byte_identical(catalog, viewset, path, params, auth):
+    user = catalog if auth else None
+    slow = render(viewset, path, params, user, fast=False)
+    fast = render(viewset, path, params, user, fast=True)
+    assert fast == slow
+    assert len(fast) > 50
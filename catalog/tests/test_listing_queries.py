@@ -0,0 +1,69 @@
+# catalog/tests/test_listing_queries.py
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Product, ProductVariant, ProductImage, Stock
+
+
+def make_products(category, start, count):
+    for i in range(start, start + count):
+        p = Product.objects.create(
+            name=f"Produkt {i}", slug=f"produkt-{i}", price=Decimal("100.00"), category=category
+        )
+        ProductImage.objects.create(product=p, image=f"products/p{i}-b.jpg")
+        ProductImage.objects.create(product=p, image=f"products/p{i}-a.jpg", is_main=True)
+        for j, price in enumerate([Decimal("90.00"), None]):
+            v = ProductVariant.objects.create(product=p, sku=f"SKU-{i}-{j}", price=price)
+            Stock.objects.create(variant=v, quantity=j * 5)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx)
+
+
+@pytest.mark.django_db
+def test_product_list_query_count_is_flat(client, category):
+    make_products(category, 0, 2)
+    small = count_queries(client, "/catalog/")
+
+    make_products(category, 2, 20)
+    large = count_queries(client, "/catalog/")
+
+    assert large == small
+
+
+@pytest.mark.django_db
+def test_category_detail_query_count_is_flat(client, category):
+    make_products(category, 0, 2)
+    small = count_queries(client, f"/catalog/category/{category.slug}/")
+
+    make_products(category, 2, 10)
+    large = count_queries(client, f"/catalog/category/{category.slug}/")
+
+    assert large == small
+
+
+@pytest.mark.django_db
+def test_for_listing_main_image(category):
+    make_products(category, 0, 1)
+    bare = Product.objects.create(name="Bez variantov", slug="bez-variantov", price=Decimal("10.00"))
+
+    products = {p.pk: p for p in Product.objects.for_listing()}
+    listed = products[Product.objects.get(slug="produkt-0").pk]
+
+    assert listed.main_image.image.name == "products/p0-a.jpg"
+    assert products[bare.pk].main_image is None
+
+
+@pytest.mark.django_db
+def test_listing_does_not_load_variants(client, category):
+    make_products(category, 0, 3)
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get("/catalog/").status_code == 200
+    # Cena "od" a dostupnosť sú stĺpce produktu (varianty spája len agregácia fazety atribútov)
+    assert not any('FROM "catalog_productvariant"' in q["sql"] or 'FROM "catalog_stock"' in q["sql"] for q in ctx)
@@ -0,0 +1,70 @@
+# catalog/tests/test_normalized_names.py
+import pytest
+from decimal import Decimal
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+
+from catalog.models import Category, Product
+from catalog.tests.conftest import create_product, names
+from catalog.text import normalize_text
+
+
+def test_normalize_text():
+    assert normalize_text("  Kávovar\tĽADOVÝ  ") == "kavovar ladovy"
+    assert normalize_text(None) == ""
+
+
+@pytest.mark.django_db
+def test_name_normalized_follows_saves_and_bulk_writes():
+    product = create_product("Kávovar EspressoPro")
+    assert product.name_normalized == "kavovar espressopro"
+
+    product.name = "Čajník"
+    product.save(update_fields=["name"])
+    product.refresh_from_db()
+    assert product.name_normalized == "cajnik"
+
+    Product.objects.bulk_create([Product(name="Šálka", slug="salka", price=Decimal("1.00"))])
+    assert Product.objects.get(slug="salka").name_normalized == "salka"
+
+    product.name = "Mlynček"
+    Product.objects.bulk_update([product], ["name"])
+    assert Product.objects.get(pk=product.pk).name_normalized == "mlyncek"
+
+    Product.objects.filter(pk=product.pk).update(name="Džbán")
+    assert Product.objects.get(pk=product.pk).name_normalized == "dzban"
+
+    Product.objects.filter(pk=product.pk).update(name=Concat(F("name"), Value(" Veľký")))
+    assert Product.objects.get(pk=product.pk).name_normalized == "dzban velky"
+
+
+@pytest.mark.django_db
+def test_search_name_substring_and_prefix():
+    create_product("Kávovar EspressoPro")
+    create_product("Espresso šálky")
+    create_product("Pánske tričko")
+
+    assert sorted(names(Product.objects.search_name("kavovar"))) == ["Kávovar EspressoPro"]
+    assert sorted(names(Product.objects.search_name("PRESSO"))) == ["Espresso šálky", "Kávovar EspressoPro"]
+    assert sorted(names(Product.objects.search_name("pá"))) == ["Pánske tričko"]
+    assert sorted(names(Product.objects.search_name("espresso šál"))) == ["Espresso šálky"]
+
+
+@pytest.mark.django_db
+def test_name_filters_in_html_and_api(client):
+    category = Category.objects.create(name="Kávovary", slug="kavovary")
+    create_product("Kávovar EspressoPro", category=category)
+    create_product("Espresso šálky", description="Pre kávovar")
+    create_product("Skrytý kávovar", is_active=False)
+
+    # HTML katalóg hľadá fulltextom podľa relevancie, časť slova v názve až potom
+    response = client.get("/catalog/", {"name": "kavovar"})
+    assert names(response.context["products"]) == ["Kávovar EspressoPro", "Espresso šálky"]
+    response = client.get("/catalog/", {"name": "PRESSO"})
+    assert sorted(names(response.context["products"])) == ["Espresso šálky", "Kávovar EspressoPro"]
+
+    response = client.get("/api/products/", {"name": "KÁVOVAR"})
+    assert [p["name"] for p in response.json()["results"]] == ["Skrytý kávovar", "Kávovar EspressoPro"]
+
+    response = client.get("/catalog/api/categories-api/", {"name": "kavov"})
+    assert [c["name"] for c in response.json()] == ["Kávovary"]
@@ -0,0 +1,84 @@
+# catalog/tests/test_pagination.py
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Product
+from orders.models import Order
+
+
+@pytest.fixture
+def products(db):
+    # Rovnaké ceny naschvál – kurzor musí rozlíšiť remízy podľa id
+    return Product.objects.bulk_create([
+        Product(name=f"Produkt {i}", slug=f"produkt-{i}", price=Decimal(10 + i % 3))
+        for i in range(7)
+    ])
+
+
+def walk(client, url, params):
+    pages, seen = 0, []
+    data = client.get(url, params).json()
+    while True:
+        pages += 1
+        seen += [p["id"] for p in data["results"]]
+        if not data["next"]:
+            return pages, seen
+        data = client.get(data["next"]).json()
+
+
+@pytest.mark.parametrize("ordering", ["-id", "price", "-price"])
+def test_cursor_walks_every_product_once(client, products, ordering):
+    pages, seen = walk(client, "/api/products/", {"cursor": "", "page_size": 3, "ordering": ordering})
+
+    key = {"-id": lambda p: -p.pk, "price": lambda p: (p.price, p.pk), "-price": lambda p: (-p.price, -p.pk)}
+    assert pages == 3
+    assert seen == [p.pk for p in sorted(products, key=key[ordering])]
+
+
+def test_cursor_pages_skip_count_and_offset(client, products):
+    first = client.get("/api/products/", {"cursor": "", "page_size": 3}).json()
+    assert "count" not in first
+
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(first["next"])
+    product_queries = [q["sql"] for q in ctx if 'FROM "catalog_product"' in q["sql"]]
+    assert not any("COUNT(" in sql or "OFFSET" in sql for sql in product_queries)
+
+    # Bez ?cursor= zostáva pôvodné stránkovanie s count
+    assert client.get("/api/products/").json()["count"] == 7
+
+
+def test_invalid_or_foreign_cursor(client, products):
+    assert client.get("/api/products/", {"cursor": "nezmysel"}).status_code == 404
+
+    by_price = client.get("/api/products/", {"cursor": "", "page_size": 3, "ordering": "price"}).json()
+    cursor = by_price["next"].split("cursor=")[1].split("&")[0]
+    assert client.get("/api/products/", {"cursor": cursor, "ordering": "-price"}).status_code == 404
+
+
+def test_catalog_product_and_order_apis(client, products):
+    pages, seen = walk(client, "/catalog/api/products-api/", {"cursor": "", "page_size": 5})
+    assert (pages, seen) == (2, [p.pk for p in products])
+
+    user = get_user_model().objects.create_user(username="joe", password="pass")
+    orders = [Order.objects.create(user=user) for _ in range(3)]
+    Order.objects.create()
+    client.force_login(user)
+
+    pages, seen = walk(client, "/catalog/api/orders-api/", {"cursor": "", "page_size": 2})
+    assert (pages, seen) == (2, [o.pk for o in orders])
+
+
+@pytest.mark.parametrize("params", [{}, {"fields": "id,name"}])
+def test_cursor_over_search_ranking(client, db, params):
+    for i in range(5):
+        Product.objects.create(name=f"Kávovar {i}", slug=f"kavovar-{i}", price=Decimal("10"))
+    Product.objects.create(name="Mlynček", slug="mlyncek", price=Decimal("10"))
+
+    # Zoradenie podľa anotácie search_rank – rýchla cesta aj only() ju musia načítať
+    pages, seen = walk(client, "/api/products/", {"cursor": "", "page_size": 2, "search": "kávovar", **params})
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 5
@@ -0,0 +1,74 @@
+# catalog/tests/test_response_cache.py
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Category, Product, ProductImage, ProductVariant, Stock
+from catalog.response_cache import response_cache_stats
+
+
+def test_repeated_get_is_served_from_cache(client, coffee_maker):
+    first = client.get("/api/products/", {"page_size": 5, "ordering": "price"})
+    assert first["X-Cache"] == "MISS"
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get("/api/products/", {"ordering": "price", "page_size": 5})
+    assert second["X-Cache"] == "HIT"
+    assert len(ctx) == 0
+    assert second.json() == first.json()
+
+    assert client.get("/api/products/", {"page_size": 6})["X-Cache"] == "MISS"
+    assert response_cache_stats()["hits"] == 1
+    assert response_cache_stats()["misses"] == 2
+
+
+@pytest.mark.parametrize("write", [
+    lambda p: Product.objects.filter(pk=p.pk).update(price=Decimal("90.00")),
+    lambda p: p.save(),
+    lambda p: Stock.objects.filter(variant__product=p).update(quantity=0),
+    lambda p: ProductVariant.objects.bulk_create([ProductVariant(product=p, sku="KAV-2")]),
+    lambda p: ProductImage.objects.create(product=p, image="products/a.jpg"),
+    lambda p: Category.objects.filter(pk=p.category_id).update(description="Nové"),
+])
+def test_catalog_writes_invalidate(client, coffee_maker, write):
+    urls = ["/api/products/", f"/catalog/api/products-api/{coffee_maker.slug}/", "/catalog/api/categories-api/"]
+    for url in urls:
+        client.get(url)
+        assert client.get(url)["X-Cache"] == "HIT"
+
+    write(coffee_maker)
+
+    for url in urls:
+        assert client.get(url)["X-Cache"] == "MISS"
+
+
+def test_fresh_data_after_write_and_stats_endpoint(client, coffee_maker):
+    client.get(f"/catalog/api/products-api/{coffee_maker.slug}/")
+    coffee_maker.name = "Mlynček"
+    coffee_maker.save()
+    assert client.get(f"/catalog/api/products-api/{coffee_maker.slug}/").json()["name"] == "Mlynček"
+
+    assert client.get("/api/cache-stats/").status_code in (401, 403)
+    admin = get_user_model().objects.create_user(username="admin", password="pass", is_staff=True)
+    client.force_login(admin)
+    stats = client.get("/api/cache-stats/").json()
+    assert (stats["hits"], stats["misses"]) == (0, 2)
+
+
+def test_authenticated_and_html_responses_are_not_shared(client, coffee_maker):
+    get_user_model().objects.create_user(username="alice_secret", password="pass")
+    alice = Client()
+    alice.login(username="alice_secret", password="pass")
+    html = alice.get("/api/products/", HTTP_ACCEPT="text/html")
+    assert "alice_secret" in html.content.decode() and not html.has_header("X-Cache")
+    assert not client.get("/api/products/", HTTP_AUTHORIZATION="Bearer token").has_header("X-Cache")
+
+    anonymous = client.get("/api/products/", HTTP_ACCEPT="text/html")
+    assert anonymous["X-Cache"] == "MISS" and "alice_secret" not in anonymous.content.decode()
+    # Anonymné HTML sa neuloží, anonymný JSON áno
+    assert client.get("/api/products/", HTTP_ACCEPT="text/html")["X-Cache"] == "MISS"
+    client.get("/api/products/", HTTP_ACCEPT="application/json")
+    assert client.get("/api/products/", HTTP_ACCEPT="application/json")["X-Cache"] == "HIT"
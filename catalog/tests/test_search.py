@@ -0,0 +1,60 @@
+# catalog/tests/test_search.py
+import pytest
+from django.core.management import call_command
+
+from catalog.models import Product
+from catalog.search import search_products
+from catalog.tests.conftest import create_product, names
+
+
+@pytest.mark.django_db
+def test_prefix_search_ranks_name_matches_first():
+    create_product("Mlynček na kávu", description="Ku každému kávovaru")
+    create_product("Kávovar EspressoPro", description="Pákový kávovar")
+    create_product("Pánske tričko")
+
+    results = names(search_products(Product.objects.all(), "kávov"))
+
+    assert results == ["Kávovar EspressoPro", "Mlynček na kávu"]
+
+
+@pytest.mark.django_db
+def test_all_words_must_match():
+    create_product("Bluetooth slúchadlá")
+    create_product("Bluetooth reproduktor")
+
+    assert names(search_products(Product.objects.all(), "bluetooth slúch")) == ["Bluetooth slúchadlá"]
+    assert names(search_products(Product.objects.all(), "\"*()")) == names(Product.objects.all())
+
+
+@pytest.mark.django_db
+def test_index_follows_saves_bulk_updates_and_deletes():
+    product = create_product("Smartfón Galaxy X")
+
+    product.name = "Smartfón Pixel"
+    product.save()
+    assert names(search_products(Product.objects.all(), "galaxy")) == []
+    assert names(search_products(Product.objects.all(), "pixel")) == ["Smartfón Pixel"]
+
+    Product.objects.filter(pk=product.pk).update(description="Obsahuje nabíjačku")
+    assert names(search_products(Product.objects.all(), "nabíjačku")) == ["Smartfón Pixel"]
+
+    product.delete()
+    assert names(search_products(Product.objects.all(), "pixel")) == []
+
+
+@pytest.mark.django_db
+def test_rebuild_command_keeps_results():
+    create_product("Dámske šaty")
+    call_command("rebuild_search_index")
+    assert names(search_products(Product.objects.all(), "šaty")) == ["Dámske šaty"]
+
+
+@pytest.mark.django_db
+def test_api_search_uses_fulltext(client):
+    create_product("Kávovar EspressoPro")
+    create_product("Espresso šálky", description="Pre kávovar")
+
+    response = client.get("/api/products/", {"search": "kávovar"})
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()["results"]] == ["Kávovar EspressoPro", "Espresso šálky"]
@@ -0,0 +1,75 @@
+# catalog/tests/test_sparse.py
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.tests.conftest import create_coffee_makers
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def products(coffee_category):
+    # Bez skladu, s dlhým popisom a hlavným obrázkom
+    return create_coffee_makers(coffee_category, stock=None, image=True, description="Dlhý popis " * 50)
+
+
+def get(client, url, params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params)
+    assert response.status_code == 200, response.content
+    return response.json(), [q["sql"] for q in ctx]
+
+
+def test_default_output_is_unchanged(client, products):
+    data, _ = get(client, "/api/products/", {})
+    assert list(data["results"][0]) == [
+        "id", "name", "price", "slug", "description", "category_name", "in_stock", "images", "variants",
+    ]
+
+
+def test_list_fields_prune_columns_and_prefetches(client, products):
+    full, full_sql = get(client, "/api/products/", {"page_size": 3})
+    data, sql = get(client, "/api/products/", {"page_size": 3, "fields": "id,name,price,thumbnail"})
+
+    assert list(data["results"][0]) == ["id", "name", "price", "thumbnail"]
+    assert data["results"][0]["thumbnail"].endswith("/media/products/2.jpg")
+    product_sql = [q for q in sql if 'FROM "catalog_product"' in q and "COUNT" not in q]
+    assert product_sql and all('"description"' not in q for q in product_sql)
+    # Varianty sa nenačítajú vôbec, obrázky jedným dotazom pre hlavný obrázok
+    assert not any('FROM "catalog_productvariant"' in q for q in sql)
+    assert len(sql) < len(full_sql)
+
+
+def test_expand_category_and_drop_nested(client, products):
+    product = products[0]
+    data, sql = get(client, f"/catalog/api/products-api/{product.slug}/", {"expand": "category"})
+
+    assert "images" not in data and "variants" not in data
+    assert data["category"] == {
+        "id": product.category_id, "name": "Kávovary", "slug": "kavovary", "description": "Všetko na kávu",
+    }
+    assert not any('FROM "catalog_productimage"' in q for q in sql)
+
+
+def test_unknown_fields_are_rejected(client, products):
+    assert client.get("/api/products/", {"fields": "id,heslo"}).status_code == 400
+    assert client.get("/api/products/", {"expand": "name"}).status_code == 400
+
+
+def test_category_and_order_fields(client, products):
+    data, _ = get(client, "/catalog/api/categories-api/", {"fields": "id,name"})
+    assert data == [{"id": products[0].category_id, "name": "Kávovary"}]
+
+    user = get_user_model().objects.create_user(username="joe", password="pass")
+    order = Order.objects.create(user=user, billing_name="Joe")
+    OrderItem.objects.create(order=order, product=products[0], quantity=2, price=Decimal("100.00"))
+    client.force_login(user)
+
+    data, sql = get(client, "/catalog/api/orders-api/", {"fields": "id,status_display"})
+    assert data == [{"id": order.pk, "status_display": order.get_status_display()}]
+    assert not any('FROM "orders_orderitem"' in q for q in sql)
+
+    data, _ = get(client, "/catalog/api/orders-api/", {})
+    assert data[0]["items"][0]["product_name"] == "Kávovar 0"
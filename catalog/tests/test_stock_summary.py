@@ -0,0 +1,109 @@
+# catalog/tests/test_stock_summary.py
+import pytest
+from decimal import Decimal
+from django.core.management import call_command
+
+from catalog import versions
+from catalog.models import Product, ProductVariant, Stock
+
+
+@pytest.fixture
+def product(db):
+    return Product.objects.create(name="Kávovar", slug="kavovar", price=Decimal("100.00"))
+
+
+def summary(product):
+    product.refresh_from_db()
+    return product.available_units, product.in_stock, product.min_variant_price, product.max_variant_price
+
+
+@pytest.mark.django_db
+def test_product_without_variants_uses_own_price(product):
+    assert summary(product) == (0, False, Decimal("100.00"), Decimal("100.00"))
+
+
+@pytest.mark.django_db
+def test_summary_follows_variant_and_stock_saves(product):
+    cheap = ProductVariant.objects.create(product=product, sku="K-1", price=Decimal("80.00"))
+    ProductVariant.objects.create(product=product, sku="K-2")  # bez ceny → cena produktu
+    stock = Stock.objects.create(variant=cheap, quantity=5, reserved=2)
+    assert summary(product) == (3, True, Decimal("80.00"), Decimal("100.00"))
+
+    stock.reserved = 5
+    stock.save()
+    assert summary(product)[:2] == (0, False)
+
+    product.price = Decimal("150.00")
+    product.save()
+    assert summary(product)[2:] == (Decimal("80.00"), Decimal("150.00"))
+
+    cheap.delete()
+    assert summary(product) == (0, False, Decimal("150.00"), Decimal("150.00"))
+
+
+@pytest.mark.django_db
+def test_summary_follows_bulk_writes(product):
+    variants = ProductVariant.objects.bulk_create([
+        ProductVariant(product=product, sku=f"K-{i}", price=Decimal(10 + i)) for i in range(3)
+    ])
+    assert summary(product)[2:] == (Decimal("10.00"), Decimal("12.00"))
+
+    Stock.objects.bulk_create([Stock(variant=v, quantity=4) for v in variants])
+    assert summary(product)[:2] == (12, True)
+
+    Stock.objects.filter(variant__product=product).update(quantity=0)
+    assert summary(product)[:2] == (0, False)
+
+    ProductVariant.objects.filter(product=product).update(price=Decimal("20.00"))
+    assert summary(product)[2:] == (Decimal("20.00"), Decimal("20.00"))
+
+    Product.objects.filter(pk=product.pk).update(price=Decimal("5.00"))
+    ProductVariant.objects.filter(product=product).delete()
+    assert summary(product) == (0, False, Decimal("5.00"), Decimal("5.00"))
+
+
+@pytest.mark.django_db
+def test_rebuild_command_recomputes_from_scratch(product):
+    variant = ProductVariant.objects.create(product=product, sku="K-1", price=Decimal("70.00"))
+    Stock.objects.create(variant=variant, quantity=9)
+    # Obídeme údržbu (napr. priamy zápis z inej aplikácie)
+    Product.objects.filter(pk=product.pk).update(available_units=0, in_stock=False, min_variant_price=None)
+
+    call_command("rebuild_stock_summary", batch_size=1)
+
+    assert summary(product) == (9, True, Decimal("70.00"), Decimal("70.00"))
+
+
+@pytest.mark.django_db
+def test_filters_use_summary_columns(client, product):
+    variant = ProductVariant.objects.create(product=product, sku="K-1", price=Decimal("250.00"))
+    Stock.objects.create(variant=variant, quantity=1)
+    empty = Product.objects.create(name="Mlynček", slug="mlyncek", price=Decimal("30.00"))
+
+    products = client.get("/catalog/", {"in_stock": "on"}).context["products"]
+    assert product in products and empty not in products
+
+    products = client.get("/catalog/", {"min_price": "200"}).context["products"]
+    assert product in products and empty not in products
+
+    products = client.get("/catalog/", {"max_price": "120"}).context["products"]
+    assert empty in products and product not in products
+
+
+@pytest.mark.django_db
+def test_stock_generation_moves_after_summary_update(product, monkeypatch, django_capture_on_commit_callbacks):
+    variant = ProductVariant.objects.create(product=product, sku="K-1")
+    seen = []
+    # Pri zvýšení generácie už musí byť súhrn zapísaný
+    increment = versions.increment
+
+    def record(key):
+        if key == versions.STOCK_GENERATION_KEY:
+            seen.append(Product.objects.get(pk=product.pk).available_units)
+        return increment(key)
+
+    monkeypatch.setattr(versions, "increment", record)
+    with django_capture_on_commit_callbacks(execute=True):
+        Stock.objects.create(variant=variant, quantity=4)
+    # Hneď po UPDATE aj po commite
+    assert seen == [4, 4]
@@ -0,0 +1,80 @@
+# catalog/tests/test_streaming.py
+import json
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+
+from catalog import streaming
+from catalog.models import Product
+from catalog.tests.conftest import create_coffee_makers
+from catalog.streaming import StreamingListMixin
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def products(coffee_category, monkeypatch):
+    # Malé dávky – 7 produktov prejde cez tri
+    monkeypatch.setattr(StreamingListMixin, "stream_chunk_size", 3)
+    create_coffee_makers(
+        coffee_category, count=7, price=Decimal("10.00"), price_step=1, stock=None,
+        variant_price=Decimal("1.50"), image=True,
+    )
+
+
+def streamed(response):
+    assert response.status_code == 200
+    assert response.streaming
+    return b"".join(response.streaming_content)
+
+
+def test_ndjson_and_array_match_paginated_list(client, products):
+    expected = client.get("/api/products/", {"page_size": 100}).json()["results"]
+
+    response = client.get("/api/products/", {"stream": "ndjson"})
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = streamed(response).splitlines()
+    assert [json.loads(line) for line in lines] == expected
+
+    response = client.get("/api/products/", {"stream": "json", "fields": "id,name"})
+    assert response["Content-Type"] == "application/json"
+    assert json.loads(streamed(response)) == [{"id": p["id"], "name": p["name"]} for p in expected]
+
+
+def test_empty_stream_and_bad_format(client, products):
+    assert streamed(client.get("/api/products/", {"stream": "json", "search": "mlynček"})) == b"[]"
+    assert streamed(client.get("/api/products/", {"stream": "ndjson", "search": "mlynček"})) == b""
+    assert client.get("/api/products/", {"stream": "xml"}).status_code == 400
+
+
+def test_stream_is_not_cached_but_conditional(client, products):
+    first = client.get("/catalog/api/products-api/", {"stream": "ndjson"})
+    body = streamed(first)
+    second = client.get("/catalog/api/products-api/", {"stream": "ndjson"})
+    assert second["X-Cache"] == "MISS"
+    assert streamed(second) == body
+    assert client.get(
+        "/catalog/api/products-api/", {"stream": "ndjson"}, HTTP_IF_NONE_MATCH=first["ETag"]
+    ).status_code == 304
+
+
+def test_model_serializer_fallback(client, products, monkeypatch):
+    expected = streamed(client.get("/catalog/api/products-api/", {"stream": "json"}))
+
+    class Unsupported(streaming.ValuesSerializer):
+        def __init__(self, template):
+            super().__init__(template)
+            self.supported = False
+
+    monkeypatch.setattr(streaming, "ValuesSerializer", Unsupported)
+    assert streamed(client.get("/catalog/api/products-api/", {"stream": "json"})) == expected
+
+
+def test_order_export(client, products):
+    user = get_user_model().objects.create_user(username="joe", password="pass")
+    for i in range(4):
+        order = Order.objects.create(user=user, billing_name="Joe")
+        OrderItem.objects.create(order=order, product=Product.objects.first(), quantity=i + 1, price=Decimal("10.00"))
+    client.force_login(user)
+
+    lines = streamed(client.get("/catalog/api/orders-api/", {"stream": "ndjson"})).splitlines()
+    assert sorted(json.loads(line)["items"][0]["quantity"] for line in lines) == [1, 2, 3, 4]
@@ -0,0 +1,66 @@
+# catalog/tests/test_suggest.py
+import pytest
+
+from catalog.models import Category, Product
+from catalog.suggest import SuggestionIndex, edit_distance, suggest
+from catalog.tests.conftest import create_product
+
+
+def test_edit_distance():
+    assert edit_distance("kavovar", "kavovar", 2) == 0
+    assert edit_distance("kavoavr", "kavovar", 2) == 1  # prehodené písmená
+    assert edit_distance("kvr", "kavovar", 2) == 3
+
+
+def test_index_update_adds_and_removes_words():
+    index = SuggestionIndex()
+    index.update({"kavovar": 5, "kavoar": 1})
+    assert index.lookup("kavovr") == ["kavovar", "kavoar"]
+
+    index.update({"kavoar": 1, "mlyncek": 2})
+    assert index.lookup("kavovr") == ["kavoar"]
+    assert index.lookup("mlyncke") == ["mlyncek"]
+    assert len(index) == 2
+
+
+@pytest.mark.django_db
+def test_suggest_corrects_typos_and_follows_renames():
+    Category.objects.create(name="Slúchadlá", slug="sluchadla")
+    product = create_product("Kávovar EspressoPro")
+    create_product("Pánske tričko")
+
+    assert suggest("kavovr") == ["kavovar"]
+    assert suggest("pansek tricko") == ["panske tricko"]
+    assert suggest("sluchadal") == ["sluchadla"]
+    assert suggest("kavovar") == []
+
+    product.name = "Mlynček EspressoPro"
+    product.save()
+    assert suggest("kavovr") == []
+    assert suggest("mlyncke") == ["mlyncek"]
+
+    Product.objects.filter(pk=product.pk).update(name="Čajník")
+    assert suggest("cajnk") == ["cajnik"]
+
+
+@pytest.mark.django_db
+def test_suggestions_come_only_from_active_products():
+    hidden = create_product("Mlynček Basic", is_active=False)
+    create_product("Kávovar EspressoPro")
+
+    assert suggest("mlyncke") == []
+    assert suggest("kavovr") == ["kavovar"]
+
+    hidden.is_active = True
+    hidden.save()
+    assert suggest("mlyncke") == ["mlyncek"]
+
+
+@pytest.mark.django_db
+def test_api_returns_suggestions_for_empty_results(client):
+    create_product("Kávovar EspressoPro")
+
+    data = client.get("/api/products/", {"search": "kavovr"}).json()
+
+    assert data["results"] == []
+    assert data["suggestions"] == ["kavovar"]
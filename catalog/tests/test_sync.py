@@ -0,0 +1,96 @@
+# catalog/tests/test_sync.py
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Product, ProductImage, Stock
+from catalog.sync import WATERMARK_OVERLAP
+
+
+def sync(client, since=None):
+    response = client.get("/api/sync/", {"since": since} if since else {})
+    assert response.status_code == 200
+    return response.json()
+
+
+def ids(payload, key):
+    return sorted(row["id"] for row in payload[key]["changed"])
+
+
+def test_full_sync_returns_visible_catalog(client, coffee_makers):
+    Product.objects.create(name="Skrytý", slug="skryty", price=Decimal("1.00"), is_active=False)
+
+    payload = sync(client)
+
+    assert payload["full"] is True
+    assert ids(payload, "products") == [p.pk for p in coffee_makers]
+    assert len(payload["variants"]["changed"]) == len(payload["stock"]["changed"]) == 3
+    assert payload["products"]["changed"][0]["price"] == "100.00"
+    assert "is_active" not in payload["products"]["changed"][0]
+
+
+def test_delta_contains_only_changes_and_deletions(client, coffee_makers, monkeypatch):
+    # Bez prekryvu, aby boli v delte len zmeny po prvej synchronizácii
+    monkeypatch.setattr("catalog.sync.WATERMARK_OVERLAP", WATERMARK_OVERLAP * 0)
+    watermark = sync(client)["watermark"]
+
+    first, second, third = coffee_makers
+    removed, hidden = second.variants.get(), third.variants.get()
+    removed_ids = (removed.pk, removed.stock.pk)
+    Stock.objects.filter(variant__product=first).update(quantity=0)
+    removed.delete()
+    third.is_active = False
+    third.save()
+    image = ProductImage.objects.create(product=first, image="products/a.jpg")
+
+    payload = sync(client, watermark)
+
+    assert payload["full"] is False
+    assert ids(payload, "stock") == [first.variants.get().stock.pk]
+    assert payload["variants"]["changed"] == []
+    # Zmazaný variant aj varianty a sklad skrytého produktu
+    assert payload["variants"]["deleted"] == [removed_ids[0], hidden.pk]
+    assert payload["stock"]["deleted"] == [removed_ids[1], hidden.stock.pk]
+    assert payload["products"]["deleted"] == [third.pk]
+    assert payload["images"]["changed"][0]["image"] == "/media/products/a.jpg"
+    assert ids(payload, "images") == [image.pk]
+    assert ids(payload, "categories") == []
+
+    assert sync(client, payload["watermark"])["products"] == {"changed": [], "deleted": []}
+
+
+def test_warm_sync_uses_change_index(client, coffee_makers):
+    watermark = sync(client)["watermark"]
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/api/sync/", {"since": watermark})
+    # Tombstony + jeden dotaz na tabuľku, každý obmedzený na updated_at
+    assert len(ctx) == 6
+    assert all("updated_at" in q["sql"] or "deleted_at" in q["sql"] for q in ctx)
+
+
+def test_invalid_watermark(client, db):
+    assert client.get("/api/sync/", {"since": "včera"}).status_code == 400
+    assert client.get("/api/sync/", {"since": "2026-01-01T10:00:00"}).status_code == 400
+
+
+def test_children_follow_product_visibility(client, coffee_makers, monkeypatch):
+    monkeypatch.setattr("catalog.sync.WATERMARK_OVERLAP", WATERMARK_OVERLAP * 0)
+    hidden = coffee_makers[0]
+    variant = hidden.variants.get()
+    Product.objects.filter(pk=hidden.pk).update(is_active=False)
+
+    payload = sync(client)
+    assert len(payload["variants"]["changed"]) == len(payload["stock"]["changed"]) == 2
+    assert variant.pk not in ids(payload, "variants")
+
+    # Zmena skladu skrytého produktu ide klientovi ako zmazanie, nie ako riadok
+    watermark = payload["watermark"]
+    Stock.objects.filter(variant=variant).update(quantity=1)
+    payload = sync(client, watermark)
+    assert payload["stock"] == {"changed": [], "deleted": [variant.stock.pk]}
+
+    hidden.is_active = True
+    hidden.save()
+    payload = sync(client, watermark)
+    assert ids(payload, "variants") == [variant.pk] and payload["variants"]["deleted"] == []
+    assert ids(payload, "stock") == [variant.stock.pk] and payload["stock"]["deleted"] == []
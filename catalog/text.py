@@ -0,0 +1,14 @@
+import re
+import unicodedata
+
+
+def normalize_text(value):
+    """
+    Normalizovaný tvar textu na vyhľadávanie: bez diakritiky, casefold, jedna medzera.
+    "Kávovar  ĽADOVÝ" -> "kavovar ladovy"
+    """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", stripped.casefold()).strip()
@@ -0,0 +1,97 @@
+"""
+Navigačný strom kategórií s počtom aktívnych produktov v každom podstrome.
+
+Celý strom vznikne z jedného dotazu (kategórie + GROUP BY počet produktov) a do
+cache sa ukladá ako jeden objekt. Kľúč obsahuje verziu katalógu, takže zmena
+názvu, presun kategórie či produktu vytvorí nový strom bez explicitného mazania.
+"""
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Category
+from .versions import catalog_version
+
+CACHE_TIMEOUT = 60 * 60
+
+
+@dataclass
+class CategoryNode:
+    id: int
+    name: str
+    slug: str
+    path: str
+    parent_id: int | None
+    # Aktívne produkty priamo v kategórii a v celom podstrome
+    direct_count: int = 0
+    product_count: int = 0
+    children: list = field(default_factory=list)
+
+    @property
+    def depth(self):
+        return self.path.count("/") - 1
+
+
+class CategoryTree:
+    def __init__(self, rows):
+        nodes = {row[0]: CategoryNode(*row) for row in rows}
+        # Pod neaktívnou kategóriou je skrytý celý podstrom – v navigácii, v počtoch
+        # aj na stránke kategórie (subtree_ids), aby sa čísla zhodovali s výpisom
+        self.nodes = {
+            pk: node for pk, node in nodes.items()
+            if all(int(ancestor) in nodes for ancestor in node.path.split("/") if ancestor)
+        }
+        for node in self.nodes.values():
+            node.product_count = node.direct_count
+        # Od najhlbších uzlov nahor – každý pripočíta svoj súčet rodičovi
+        for node in sorted(self.nodes.values(), key=lambda n: n.depth, reverse=True):
+            parent = self.nodes.get(node.parent_id)
+            if parent is not None:
+                parent.product_count += node.product_count
+        # Súrodenci v poradí podľa názvu (tak prišli z dotazu)
+        for node in self.nodes.values():
+            parent = self.nodes.get(node.parent_id)
+            if parent is not None:
+                parent.children.append(node)
+        self.roots = [node for node in self.nodes.values() if node.parent_id is None]
+
+    def __getitem__(self, pk):
+        return self.nodes[pk]
+
+    def get(self, pk):
+        return self.nodes.get(pk)
+
+    def breadcrumbs(self, category):
+        """Predkovia od koreňa po kategóriu (vrátane nej) – z path, bez dotazu."""
+        ids = [int(pk) for pk in category.path.split("/") if pk]
+        return [self.nodes[pk] for pk in ids if pk in self.nodes]
+
+    def children(self, category):
+        node = self.nodes.get(category.pk)
+        return node.children if node else []
+
+    def subtree_ids(self, pk):
+        """Id viditeľných kategórií podstromu vrátane nej; skrytá kategória → []."""
+        node = self.nodes.get(pk)
+        return [n.id for n in self.walk([node])] if node else []
+
+    def walk(self, nodes=None):
+        """Všetky uzly do hĺbky (predok pred potomkami)."""
+        for node in self.roots if nodes is None else nodes:
+            yield node
+            yield from self.walk(node.children)
+
+
+def build_category_tree():
+    rows = (
+        Category.objects.filter(is_active=True)
+        .annotate(direct_count=Count("products", filter=Q(products__is_active=True)))
+        .order_by("name", "pk")
+        .values_list("id", "name", "slug", "path", "parent_id", "direct_count")
+    )
+    return CategoryTree(rows)
+
+
+def get_category_tree():
+    return cache.get_or_set(f"catalog:category-tree:{catalog_version()}", build_category_tree, CACHE_TIMEOUT)
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
-from .api_views import ProductViewSet, CategoryViewSet
+from .api_views import ProductViewSet, CategoryViewSet, CartViewSet, OrderViewSet
 
 # Namespace pre aplikáciu
 app_name = 'catalog'
@@ -9,6 +9,8 @@ app_name = 'catalog'
 router = DefaultRouter()
 router.register(r'products-api', ProductViewSet, basename='product-api')
 router.register(r'categories-api', CategoryViewSet, basename='category-api')
+router.register(r'cart-api', CartViewSet, basename='cart-api')
+router.register(r'orders-api', OrderViewSet, basename='order-api')
 
 urlpatterns = [
     # Klasické Views
@@ -0,0 +1,130 @@
+"""
+Počítadlá zmien katalógu v zdieľanej cache.
+
+  * verzia (catalog_changed) – názvy produktov/kategórií, SKU a strom kategórií;
+    podľa nej sa obnovujú indexy v pamäti procesu (návrhy, autocomplete, strom)
+  * generácia (catalog_touched) – akýkoľvek zápis do katalógu vrátane skladu
+    a obrázkov; je súčasťou kľúča cache API odpovedí (catalog.response_cache)
+  * popularita (popularity_changed) – položky a stav objednávok; poradie
+    v autocomplete (catalog.autocomplete). Objednávka verziu priamo neposúva,
+    len označí zmenu – verziu zvýši publish_popularity() z periodickej úlohy,
+    takže počas nákupov sa autocomplete neobnovuje pri každej položke
+"""
+import threading
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = "catalog:version"
+CATALOG_GENERATION_KEY = "catalog:generation"
+STOCK_GENERATION_KEY = "catalog:stock-generation"
+POPULARITY_VERSION_KEY = "catalog:popularity-version"
+POPULARITY_DIRTY_KEY = "catalog:popularity-dirty"
+# Bez zdieľanej cache (locmem – každý proces má vlastnú) sa zmena verzie do iných
+# procesov nedostane a beat s publish_popularity_task nebeží – indexy v pamäti
+# procesu sa preto obnovia aspoň takto často
+REFRESH_INTERVAL = 10 * 60
+
+
+def increment(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        return cache.incr(key)
+
+
+def bump(key):
+    # Hneď aj po commite: súbežný request by inak medzi zvýšením a commitom
+    # načítal staré dáta a uložil ich pod novú verziu
+    increment(key)
+    transaction.on_commit(lambda: increment(key))
+
+
+def catalog_version():
+    return cache.get(CATALOG_VERSION_KEY, 0)
+
+
+def catalog_generation():
+    return cache.get(CATALOG_GENERATION_KEY, 0)
+
+
+def stock_generation():
+    return cache.get(STOCK_GENERATION_KEY, 0)
+
+
+def popularity_version():
+    return cache.get(POPULARITY_VERSION_KEY, 0)
+
+
+def catalog_changed():
+    """Volá sa po zmene názvov produktov, kategórií, SKU alebo stromu."""
+    bump(CATALOG_VERSION_KEY)
+    bump(CATALOG_GENERATION_KEY)
+
+
+def catalog_touched():
+    """Volá sa po akomkoľvek zápise do katalógu (produkty, varianty, sklad, obrázky, kategórie)."""
+    bump(CATALOG_GENERATION_KEY)
+
+
+def stock_changed():
+    """Volá sa pri prepočte súhrnu skladu produktov (sklad, rezervácie, varianty, ceny)."""
+    bump(STOCK_GENERATION_KEY)
+
+
+def popularity_changed():
+    """Volá sa po zmene položiek alebo stavu objednávok (orders.signals) – len označí zmenu."""
+    # Až po commite – úloha by inak mohla zverejniť verziu ešte bez tejto objednávky
+    transaction.on_commit(lambda: cache.set(POPULARITY_DIRTY_KEY, True, None))
+
+
+def publish_popularity():
+    """Zvýši verziu popularity, ak sa od posledného volania zmenila (catalog.tasks). Vráti, či ju zvýšil."""
+    # delete() vráti True len jednému z prípadných súbežných volaní
+    if not cache.delete(POPULARITY_DIRTY_KEY):
+        return False
+    increment(POPULARITY_VERSION_KEY)
+    return True
+
+
+def cache_is_shared():
+    """Zdieľajú procesy cache (Redis)? Locmem má každý proces vlastnú."""
+    return not isinstance(caches["default"], LocMemCache)
+
+
+class ProcessIndex:
+    """
+    Objekt v pamäti procesu. load(previous) vráti nový (alebo aktualizovaný) index;
+    previous je None pri prvom načítaní. So zdieľanou cache sa načíta znova len
+    pri zmene version() – bez zmeny katalógu žiadny dotaz do databázy. Bez nej
+    aj po REFRESH_INTERVAL sekundách.
+    """
+
+    def __init__(self, load, version=catalog_version, refresh_interval=REFRESH_INTERVAL):
+        self.load = load
+        self.current_version = version
+        self.refresh_interval = refresh_interval
+        self.value = None
+        self.version = None
+        self.loaded_at = None
+        self.lock = threading.Lock()
+
+    def is_stale(self, version):
+        if self.version != version:
+            return True
+        return not cache_is_shared() and time.monotonic() - self.loaded_at >= self.refresh_interval
+
+    def get(self):
+        version = self.current_version()
+        # Obnovu robí jedno vlákno, ostatné medzitým čítajú doterajší index
+        if self.is_stale(version) and self.lock.acquire(blocking=self.value is None):
+            try:
+                self.value = self.load(self.value)
+                self.version = version
+                self.loaded_at = time.monotonic()
+            finally:
+                self.lock.release()
+        return self.value
@@ -1,15 +1,19 @@
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 
+from .conditional import ConditionalPageMixin
+from .facets import product_facets
 from .models import Product, Category
+from .tree import get_category_tree
 from .forms import ProductForm, ProductImageFormSet
 # Predpokladám, že máš ProductFilter v filters.py, ak nie, treba ho vytvoriť alebo filter odstrániť
 try:
-    from .filters import ProductFilter
+    from .filters import ATTRIBUTE_PREFIX, ProductFilter
 except ImportError:
-    ProductFilter = None
+    ATTRIBUTE_PREFIX, ProductFilter = "attr.", None
 
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
@@ -22,17 +26,19 @@ class StaffRequiredMixin(UserPassesTestMixin):
     def test_func(self):
         return self.request.user.is_authenticated and self.request.user.is_staff
 
-class ProductListView(ListView):
+class ProductListView(ConditionalPageMixin, ListView):
     model = Product
     template_name = "catalog/product_list.html"
     context_object_name = "products"
     paginate_by = 24
 
     def get_queryset(self):
-        queryset = Product.objects.filter(is_active=True).select_related("category")
+        queryset = Product.objects.filter(is_active=True).for_listing()
         if ProductFilter:
             self.filter = ProductFilter(self.request.GET, queryset=queryset)
-            return self.filter.qs.distinct().order_by("id")
+            queryset = self.filter.qs
+            # Pri vyhľadávaní ponecháme poradie podľa relevancie
+            return queryset if queryset.ordered else queryset.order_by("id")
         return queryset.order_by("id")
 
     def get_context_data(self, **kwargs):
@@ -41,11 +47,28 @@ class ProductListView(ListView):
             context["filter"] = self.filter
             cat_id = self.filter.form['category'].value()
             context["current_category"] = Category.objects.filter(id=cat_id).first() if cat_id else None
-        
-        context["categories"] = Category.objects.filter(is_active=True)
+
+        # Počty pre filtre (kategórie, ceny, sklad, atribúty) – dva agregačné dotazy, v cache podľa filtra
+        context["facets"] = product_facets(self.object_list)
+        context["attribute_facets"] = self.attribute_links(context["facets"]["attributes"])
+        # Navigačný strom s počtami produktov – jeden objekt z cache
+        context["categories"] = get_category_tree().roots
         return context
 
-class ProductDetailView(DetailView):
+    def attribute_links(self, attributes):
+        """[(názov, [(hodnota, počet, URL s ?attr.<názov>=hodnota)])] – tag querystring bodku v mene nevie."""
+        result = []
+        for name, values in attributes.items():
+            links = []
+            for item in values:
+                query = self.request.GET.copy()
+                query[f"{ATTRIBUTE_PREFIX}{name}"] = item["value"]
+                query.pop("page", None)
+                links.append((item["value"], item["count"], f"?{query.urlencode()}"))
+            result.append((name, links))
+        return result
+
+class ProductDetailView(ConditionalPageMixin, DetailView):
     model = Product
     template_name = "catalog/product_detail.html"
     context_object_name = "product"
@@ -55,24 +78,38 @@ class ProductDetailView(DetailView):
     def get_queryset(self):
         return Product.objects.filter(is_active=True).select_related("category")
 
+    def get_validators(self):
+        updated_at = self.get_queryset().filter(slug=self.kwargs["slug"]).values_list("updated_at", flat=True).first()
+        # Neexistujúci produkt – 404 štandardnou cestou
+        return ((updated_at,), updated_at) if updated_at else None
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["variants"] = self.object.variants.all()
         return context
 
-class CategoryDetailView(ListView):
+class CategoryDetailView(ConditionalPageMixin, ListView):
     model = Product
     template_name = "catalog/category_detail.html"
     context_object_name = "products"
 
     def get_queryset(self):
         self.category = get_object_or_404(Category, slug=self.kwargs["slug"], is_active=True)
-        return Product.objects.filter(category=self.category, is_active=True).select_related("category")
+        self.tree = get_category_tree()
+        if self.tree.get(self.category.pk) is None:
+            # Aktívna kategória pod neaktívnym predkom
+            raise Http404
+        # Produkty celého viditeľného podstromu, nie len priamo zaradené – rovnako ako počty v strome
+        return Product.objects.filter(
+            category_id__in=self.tree.subtree_ids(self.category.pk), is_active=True
+        ).for_listing().order_by("id")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        # Podkategórie aj omrvinky zo stromu v cache – bez ďalších dotazov
         context["category"] = self.category
-        context["subcategories"] = Category.objects.filter(parent=self.category, is_active=True)
+        context["subcategories"] = self.tree.children(self.category)
+        context["breadcrumbs"] = self.tree.breadcrumbs(self.category)
         return context
 
 class ProductCreateView(LoginRequiredMixin, StaffRequiredMixin, CreateView):
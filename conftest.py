@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Rollback DB po teste nevráti počítadlá a odpovede v cache – každý test začína s prázdnou
+    cache.clear()
+    yield
+    cache.clear()
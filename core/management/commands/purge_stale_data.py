@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.purge import BATCH_SIZE, CART_RETENTION, purge_stale_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Zmaže po dávkach opustené košíky, expirované session, API tokeny neaktívnych "
+        "používateľov a tombstony (core.purge). Bezpečné spustiť kedykoľvek aj "
+        "opakovane – prerušený beh ďalší dokončí."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cart-days", type=int, default=CART_RETENTION.days,
+                            help="Anonymný alebo prázdny košík bez zmeny dlhšie ako toľko dní")
+        parser.add_argument("--token-days", type=int, default=None,
+                            help="Zmazať aj API tokeny staršie ako toľko dní (používateľov odhlási)")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Počet riadkov v jednej transakcii")
+        parser.add_argument("--max-seconds", type=float, default=None,
+                            help="Po tomto čase skončí po rozpracovanej dávke")
+        parser.add_argument("--pause", type=float, default=0, help="Pauza medzi dávkami v sekundách")
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+
+        def progress(label, counts):
+            if verbosity:
+                self.stdout.write(f"  {label}: zmazaných {counts.get(label, 0)}")
+
+        result = purge_stale_data(
+            batch_size=options["batch_size"],
+            max_seconds=options["max_seconds"],
+            pause=options["pause"],
+            progress=progress,
+            cart_retention=timedelta(days=options["cart_days"]),
+            token_retention=timedelta(days=options["token_days"]) if options["token_days"] else None,
+        )
+
+        for label, count in sorted(result["deleted"].items()):
+            self.stdout.write(f"{label}: {count}")
+        if result["finished"]:
+            self.stdout.write(self.style.SUCCESS(f"✅ Hotovo, zmazaných {sum(result['deleted'].values())} riadkov."))
+        else:
+            self.stdout.write(self.style.WARNING("⚠️ Časový limit vypršal – zvyšok zmaže ďalší beh."))
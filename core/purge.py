@@ -0,0 +1,89 @@
+"""
+Mazanie nepotrebných riadkov po dávkach: opustené košíky, expirované session,
+API tokeny neaktívnych používateľov a tombstony delta syncu (catalog.sync) po uplynutí retencie.
+
+Každá dávka je krátka samostatná transakcia – najviac batch_size riadkov
+vybraných podľa pk a zmazaných s tou istou podmienkou (riadok, ktorý medzitým
+ožil, sa nezmaže). Tabuľka tak nie je zamknutá na dlho a súbežné zápisy
+prejdú medzi dávkami. Mazanie je idempotentné: prerušený beh alebo beh
+zastavený časovým limitom nasledujúci pokračuje tam, kde skončil.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from cart.models import Cart
+from catalog.models import Tombstone
+from catalog.sync import TOMBSTONE_RETENTION
+
+BATCH_SIZE = 1000
+# Anonymné a prázdne košíky bez zmeny dlhšie ako toto sú opustené
+CART_RETENTION = timedelta(days=30)
+DB_SESSION_ENGINES = {"django.contrib.sessions.backends.db", "django.contrib.sessions.backends.cached_db"}
+
+
+def stale_querysets(now=None, cart_retention=CART_RETENTION, token_retention=None):
+    """
+    Querysety riadkov na zmazanie, v poradí mazania. API tokeny (CustomAuthToken
+    ich používa donekonečna) sa podľa veku mažú len s token_retention – inak by
+    čistenie odhlásilo aktívnych používateľov appky.
+    """
+    now = now or timezone.now()
+    targets = [Cart.objects.filter(Q(user__isnull=True) | Q(item_count=0), updated_at__lt=now - cart_retention)]
+    # Session v cache/súboroch expirujú samy, v DB ich treba mazať
+    if settings.SESSION_ENGINE in DB_SESSION_ENGINES:
+        targets.append(Session.objects.filter(expire_date__lt=now))
+    stale_tokens = Q(user__is_active=False)
+    if token_retention is not None:
+        stale_tokens |= Q(created__lt=now - token_retention)
+    targets += [
+        Token.objects.filter(stale_tokens),
+        Tombstone.objects.filter(deleted_at__lt=now - TOMBSTONE_RETENTION),
+    ]
+    return targets
+
+
+def purge_queryset(queryset, batch_size=BATCH_SIZE, deadline=None, pause=0, progress=None):
+    """
+    Zmaže riadky querysetu po dávkach. Vráti ({model: počet zmazaných riadkov
+    vrátane kaskády}, dokončené); pri prekročení deadline (time.monotonic) skončí skôr.
+    """
+    counts = {}
+    while True:
+        pks = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return counts, True
+        with transaction.atomic():
+            _, deleted = queryset.filter(pk__in=pks).delete()
+        for label, count in deleted.items():
+            counts[label] = counts.get(label, 0) + count
+        if progress:
+            progress(queryset.model._meta.label, counts)
+        if deadline is not None and time.monotonic() >= deadline:
+            return counts, False
+        if pause:
+            time.sleep(pause)
+
+
+def purge_stale_data(batch_size=BATCH_SIZE, max_seconds=None, pause=0, progress=None, **retention):
+    """
+    Vyčistí všetky ciele (stale_querysets). Vráti {"deleted": {model: počet},
+    "finished": bool} – finished=False znamená, že časový limit nestačil a
+    zvyšok zmaže ďalší beh.
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    result = {"deleted": {}, "finished": True}
+    for queryset in stale_querysets(**retention):
+        counts, finished = purge_queryset(queryset, batch_size, deadline, pause, progress)
+        for label, count in counts.items():
+            result["deleted"][label] = result["deleted"].get(label, 0) + count
+        if not finished:
+            result["finished"] = False
+            break
+    return result
@@ -0,0 +1,15 @@
+import logging
+
+from celery import shared_task
+
+from .purge import purge_stale_data
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_stale_data_task(max_seconds=600):
+    """Denné čistenie (CELERY_BEAT_SCHEDULE); časový limit drží beh krátky, zvyšok dorobí ďalší."""
+    result = purge_stale_data(max_seconds=max_seconds)
+    logger.info("purge_stale_data: %s (dokončené: %s)", result["deleted"], result["finished"])
+    return result
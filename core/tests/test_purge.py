@@ -0,0 +1,109 @@
+# core/tests/test_purge.py
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from cart.models import Cart, CartItem
+from catalog.models import Product, ProductVariant, Tombstone
+from core import purge
+from core.tasks import purge_stale_data_task
+
+OLD = timezone.now() - timedelta(days=60)
+
+
+@pytest.fixture
+def user(db):
+    return get_user_model().objects.create_user(username="kupujuci", password="pass123")
+
+
+@pytest.fixture
+def variant(db):
+    product = Product.objects.create(name="Hrnček", slug="hrncek", price=5)
+    return ProductVariant.objects.create(product=product, sku="HRN-1", price=5)
+
+
+def make_cart(variant, user=None, items=1, updated_at=OLD):
+    cart = Cart.objects.create(user=user)
+    if items:
+        CartItem.objects.create(cart=cart, variant=variant, quantity=items, price=5)
+    Cart.objects.filter(pk=cart.pk).update(updated_at=updated_at)
+    return cart
+
+
+@pytest.fixture
+def stale(user, variant):
+    """Po jednom starom aj čerstvom riadku z každého cieľa."""
+    other = get_user_model().objects.create_user(username="iny", password="pass123")
+    rows = {
+        "anonymous": make_cart(variant),
+        "empty": make_cart(variant, user=other, items=0),
+        "fresh_anonymous": make_cart(variant, updated_at=timezone.now()),
+        "user_cart": make_cart(variant, user=user),
+    }
+    Session.objects.create(session_key="stara", session_data="", expire_date=timezone.now() - timedelta(days=1))
+    Session.objects.create(session_key="platna", session_data="", expire_date=timezone.now() + timedelta(days=1))
+    old_token = Token.objects.create(user=other)
+    Token.objects.filter(pk=old_token.pk).update(created=timezone.now() - timedelta(days=365))
+    Token.objects.create(user=user)
+    Token.objects.create(user=get_user_model().objects.create_user(username="zruseny", is_active=False))
+    Tombstone.objects.create(model="product", object_id=1, deleted_at=timezone.now() - timedelta(days=31))
+    Tombstone.objects.create(model="product", object_id=2)
+    return rows
+
+
+def test_purges_only_stale_rows(stale):
+    result = purge.purge_stale_data()
+
+    assert result["finished"]
+    assert result["deleted"] == {
+        "cart.Cart": 2, "cart.CartItem": 1, "sessions.Session": 1, "authtoken.Token": 1, "catalog.Tombstone": 1,
+    }
+    assert set(Cart.objects.values_list("pk", flat=True)) == {stale["fresh_anonymous"].pk, stale["user_cart"].pk}
+    assert list(Session.objects.values_list("session_key", flat=True)) == ["platna"]
+    # Starý token aktívneho používateľa ostáva – vek sa bez --token-days neposudzuje
+    assert set(Token.objects.values_list("user__username", flat=True)) == {"iny", "kupujuci"}
+    assert list(Tombstone.objects.values_list("object_id", flat=True)) == [2]
+
+    assert purge.purge_stale_data()["deleted"] == {}
+
+
+def test_batches_and_resumes_after_deadline(variant):
+    for _ in range(5):
+        make_cart(variant)
+    batches = []
+
+    counts, finished = purge.purge_queryset(
+        purge.stale_querysets()[0], batch_size=2, deadline=0,
+        progress=lambda label, counts: batches.append(counts[label]),
+    )
+    assert (counts, finished, batches) == ({"cart.Cart": 2, "cart.CartItem": 2}, False, [2])
+    assert Cart.objects.count() == 3
+
+    counts, finished = purge.purge_queryset(
+        purge.stale_querysets()[0], batch_size=2, progress=lambda label, counts: batches.append(counts[label]),
+    )
+    assert finished and counts["cart.Cart"] == 3 and batches == [2, 2, 3]
+    assert not Cart.objects.exists() and not CartItem.objects.exists()
+
+
+def test_command_reports_counts(stale):
+    out = StringIO()
+    call_command("purge_stale_data", "--batch-size", "1", "--cart-days", "90", "--token-days", "180", stdout=out)
+    output = out.getvalue()
+
+    assert "cart.Cart" not in output  # 60 dní staré košíky sú pri 90-dňovej retencii ešte v poriadku
+    assert "sessions.Session: 1" in output and "authtoken.Token: 2" in output
+    assert "Hotovo, zmazaných 4 riadkov" in output
+    assert list(Token.objects.values_list("user__username", flat=True)) == ["kupujuci"]
+    assert Cart.objects.count() == 4
+
+
+def test_task_runs_purge(stale):
+    result = purge_stale_data_task.delay().get()
+    assert result["finished"] and result["deleted"]["cart.Cart"] == 2
@@ -2,6 +2,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+from celery.schedules import crontab
+
 # BASE_DIR
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -69,6 +71,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "django.template.context_processors.media", # Pridané pre obrázky v šablónach
+                "cart.context_processors.cart_summary",
             ]
         },
     }
@@ -84,6 +87,40 @@ DATABASES = {
     }
 }
 
+# CACHE – Redis z docker-compose (REDIS_URL=redis://redis:6379/1), inak locmem (lokálne, testy)
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# CELERY – broker v Redise z docker-compose; bez neho (lokálne, testy) sa úlohy vykonajú hneď.
+# Periodické úlohy (CELERY_BEAT_SCHEDULE) potrebujú Redis a bežiaci beat; bez neho
+# sa poradie v autocomplete a indexy v pamäti procesu obnovujú len podľa
+# catalog.versions.REFRESH_INTERVAL (locmem cache procesy nezdieľajú)
+CELERY_BROKER_URL = REDIS_URL or "memory://"
+CELERY_TASK_ALWAYS_EAGER = not REDIS_URL
+CELERY_BEAT_SCHEDULE = {
+    "purge-stale-data": {
+        "task": "core.tasks.purge_stale_data_task",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Poradie v autocomplete podľa predajov – najviac jedna obnova indexu za 10 minút
+    "publish-popularity": {
+        "task": "catalog.tasks.publish_popularity_task",
+        "schedule": timedelta(minutes=10),
+    },
+}
+
 # AUTH USER MODEL
 AUTH_USER_MODEL = "accounts.User"
 
@@ -105,9 +142,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny', # Teraz povolené pre všetkých (testovanie)
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'catalog.fast_json.FastJSONRenderer',  # orjson, bez neho pôvodný JSONRenderer
         'rest_framework.renderers.BrowsableAPIRenderer',
     ),
+    'DEFAULT_PARSER_CLASSES': (
+        'catalog.fast_json.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 # STATIC & MEDIA - OPRAVENÉ PRE MAC
@@ -20,6 +20,9 @@ urlpatterns = [
     # 2. Auth API (pre SwiftUI prihlásenie)
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+
+    # 3. REST API pre mobilnú appku (produkty, profil, checkout)
+    path('api/', include('api.urls')),
 ]
 
 # Servovanie obrázkov a statických súborov
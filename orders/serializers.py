@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.db.models import Prefetch
+from catalog.sparse import SparseFieldsetMixin
 from .models import Order, OrderItem
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -8,11 +10,22 @@ class OrderItemSerializer(serializers.ModelSerializer):
         model = OrderItem
         fields = ['id', 'product', 'product_name', 'quantity', 'price']
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
 
+    sparse_columns = {'status_display': ['status']}
+    # Rýchla cesta zoznamu (catalog.fast_serializers) – popis stavu zo stĺpca status
+    fast_columns = {'status_display': ('status', lambda status: str(dict(Order.STATUS_CHOICES).get(status, status)))}
+    sparse_prefetch = {
+        'items': Prefetch('items', queryset=OrderItem.objects.select_related('product').only(
+            'id', 'order', 'product', 'product__name', 'quantity', 'price',
+        )),
+    }
+
     class Meta:
         model = Order
         fields = ['id', 'created_at', 'status', 'status_display', 'total', 'billing_name', 'billing_email', 'items']
-        read_only_fields = ['total', 'status', 'created_at']
\ No newline at end of file
+        read_only_fields = ['total', 'status', 'created_at']
+        expandable = ['items']
+        default_expand = ['items']
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from catalog.versions import popularity_changed
+from .models import Order, OrderItem
+
+
+# Predané kusy určujú poradie v autocomplete (catalog.autocomplete) – index sa obnoví
+# najneskôr po ďalšom behu catalog.tasks.publish_popularity_task
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+@receiver(post_delete, sender=Order)
+def order_items_changed(sender, **kwargs):
+    popularity_changed()
+
+
+@receiver(post_save, sender=Order)
+def order_status_changed(sender, created, update_fields=None, **kwargs):
+    # Zrušené objednávky a koncepty sa do popularity nerátajú
+    if not created and (update_fields is None or "status" in update_fields):
+        popularity_changed()
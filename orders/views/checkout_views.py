@@ -7,37 +7,38 @@ from orders.models import Order, OrderItem, Coupon
 from cart.models import Cart
 from orders.forms import CheckoutForm
 from accounts.models import Profile
-from .cart_views import get_or_create_cart
+from .cart_views import get_cart_store, persist_cart
 
 class CheckoutView(View):
     template_name = "cart/checkout.html"
 
     def get(self, request):
-        cart = get_or_create_cart(request)
-        if not cart.items.exists():
+        store = get_cart_store(request)
+        items = store.items()
+        if not items:
             messages.warning(request, "Váš košík je prázdny.")
             return redirect("cart:cart_detail")
 
         form = CheckoutForm(user=request.user)
-        total = sum(item.line_total() for item in cart.items.all())
-        return render(request, self.template_name, {"cart": cart, "form": form, "total": total})
+        total = store.summary()["subtotal"]
+        return render(request, self.template_name, {"items": items, "form": form, "total": total})
 
 @transaction.atomic
 def post(self, request):
-    cart = get_or_create_cart(request)
-    if not cart.items.exists():
+    cart = persist_cart(request)
+    if cart is None or not cart.items.exists():
         messages.warning(request, "Váš košík je prázdny.")
         return redirect("cart:cart_detail")
 
     # Celková suma košíka
-    total = sum(item.line_total() for item in cart.items.all())
+    total = cart.total_price
     
     # Inicializácia formulára s user a cart_total
     form = CheckoutForm(request.POST, user=request.user)
     
     if not form.is_valid():
         messages.error(request, "Prosím vyplňte všetky povinné polia.")
-        return render(request, self.template_name, {"cart": cart, "form": form, "total": total})
+        return render(request, self.template_name, {"items": list(cart.items.all()), "form": form, "total": total})
 
     discount_amount = Decimal("0.00")
     coupon = None
@@ -50,14 +51,14 @@ def post(self, request):
             success, usage_or_reason = coupon.use_by(request.user)
             if not success:
                 messages.error(request, f"Neplatný kupón: {usage_or_reason}")
-                return render(request, self.template_name, {"cart": cart, "form": form, "total": total})
+                return render(request, self.template_name, {"items": list(cart.items.all()), "form": form, "total": total})
             # vypočítanie zľavy z kupónu
             discount_amount = (total * Decimal(coupon.discount_percentage) / Decimal("100")).quantize(Decimal("0.01"))
             total -= discount_amount
             messages.success(request, f"🎟️ Zľava {coupon.discount_percentage}% (-{discount_amount} €) aplikovaná.")
         except Coupon.DoesNotExist:
             messages.error(request, "Neplatný alebo neaktívny kupón.")
-            return render(request, self.template_name, {"cart": cart, "form": form, "total": total})
+            return render(request, self.template_name, {"items": list(cart.items.all()), "form": form, "total": total})
 
     # Spracovanie vernostných bodov
     loyalty_discount_amount = Decimal("0.00")